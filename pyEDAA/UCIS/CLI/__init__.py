@@ -47,18 +47,94 @@ At next use this layer's service program to convert from UCDB to Cobertura forma
 .. code-block::
 
    pyedaa-ucis export --ucdb ucdb.xml --cobertura cobertura.xml
+
+Besides Cobertura, LCOV tracefiles and JSON documents can be written. Multiple formats are written from a single parse:
+
+.. code-block::
+
+   pyedaa-ucis export --ucdb ucdb.xml --cobertura cobertura.xml --lcov coverage.info --json coverage.json
+
+Multiple UCDB files (e.g. one per test) can be converted and merged in parallel by passing several files or a glob
+pattern. The number of worker processes is set with ``--jobs``.
+
+.. code-block::
+
+   pyedaa-ucis export --ucdb "regression/*.xml" --cobertura cobertura.xml --jobs 8
+
+A single large (uncompressed) UCDB file can be split into shards at scope boundaries, which are parsed in parallel:
+
+.. code-block::
+
+   pyedaa-ucis export --ucdb merged.xml --cobertura cobertura.xml --sharded --jobs 32
+
+UCDB files compressed with gzip, xz, bzip2 or Zstandard are decompressed on-the-fly. The UCDB file can also be read from
+standard input:
+
+.. code-block::
+
+   ssh buildhost cat ucdb.xml.gz | pyedaa-ucis export --ucdb - --cobertura cobertura.xml
+
+The statement coverage of many tests can be accumulated in an SQLite database. Each test's UCDB file is ingested once
+(files are identified by their content), afterwards reports are exported from the database:
+
+.. code-block::
+
+   pyedaa-ucis ingest --ucdb test42.xml --database coverage.db
+   pyedaa-ucis export --database coverage.db --cobertura cobertura.xml
+
+The coverage of single instances can be queried without parsing the whole UCDB file. A sidecar index file with the
+byte ranges of all instances is created at the first query or explicitly with the ``index`` command:
+
+.. code-block::
+
+   pyedaa-ucis index --ucdb ucdb.xml
+   pyedaa-ucis query --ucdb ucdb.xml --instance top.dut.u_core
+
+Cobertura files of earlier runs can be merged without the original UCDB files. Hit counts of the same line are combined
+by the maximum, the sum or a logical or:
+
+.. code-block::
+
+   pyedaa-ucis merge --input "history/*.xml.gz" --cobertura merged.xml --policy sum
+
+Line coverage of two runs (UCDB or Cobertura files) can be compared:
+
+.. code-block::
+
+   pyedaa-ucis diff --old nightly-41.xml.gz --new nightly-42.xml.gz
+
+Bins can be excluded by a rule file with file, instance and line rules (see :mod:`pyEDAA.UCIS.Exclusion`). The number of
+bins excluded by each rule is reported:
+
+.. code-block::
+
+   pyedaa-ucis export --ucdb ucdb.xml --cobertura cobertura.xml --exclusions waivers.txt
+
+Tests can be ranked by the number of bins they cover per CPU time to find a reduced test suite with the same coverage:
+
+.. code-block::
+
+   pyedaa-ucis rank --ucdb "regression/*.xml" --cost cpu
 """
+import sys
+from contextlib import ExitStack, nullcontext
 from argparse import RawDescriptionHelpFormatter
+from glob     import glob
 from pathlib  import Path
 from textwrap import dedent
+from typing   import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Tuple, cast
 
 from pyAttributes.ArgParseAttributes import ArgParseMixin, DefaultAttribute, CommandAttribute, ArgumentAttribute, SwitchArgumentAttribute
 
 from pyTooling.Decorators import export
 
 from pyEDAA.UCIS      import __version__, __copyright__, __license__
-from pyEDAA.UCIS.UCDB import Parser
-from pyEDAA.UCIS.Cobertura import CoberturaException
+
+# Modules doing the actual work (and their dependencies like lxml and sqlite3) are imported by the command handlers, so
+# trivial commands like 'help' and 'version' start fast.
+if TYPE_CHECKING: # pragma: no cover
+	from pyEDAA.UCIS.Exclusion import ExclusionRules
+	from pyEDAA.UCIS.Filter import PathFilter
 
 
 @export
@@ -93,7 +169,7 @@ class Program(ProgramBase, ArgParseMixin):
 				'''),
 		  epilog=dedent("""\
 		    Currently the following output formats are supported:
-		     * Cobertura (statement coverage - Java oriented format)
+		     * Cobertura (statement and branch coverage - Java oriented format)
 		  """),
 		  formatter_class=RawDescriptionHelpFormatter,
 		  add_help=False
@@ -125,18 +201,49 @@ class Program(ProgramBase, ArgParseMixin):
 		self._PrintVersion()
 
 	@CommandAttribute("export", help="Export data from UCDB.", description="Export data from UCDB.")
-	@ArgumentAttribute("--ucdb",      metavar='UCDBFile',      dest="ucdb",      type=str, help="UCDB file in UCIS format (XML).")
+	@ArgumentAttribute("--ucdb",      metavar='UCDBFile',      dest="ucdb",      type=str, nargs="+", help="UCDB file(s) in UCIS format (XML), optionally compressed. Glob patterns are expanded, '-' reads from stdin.")
+	@ArgumentAttribute("--database",  metavar='DatabaseFile',  dest="database",  type=str, help="Export from a coverage database (SQLite) instead of UCDB files.")
 	@ArgumentAttribute("--cobertura", metavar='CoberturaFile', dest="cobertura", type=str, help="Cobertura code coverage file (XML).")
+	@ArgumentAttribute("--lcov",      metavar='LCOVFile',      dest="lcov",      type=str, help="LCOV tracefile, e.g. for genhtml.")
+	@ArgumentAttribute("--json",      metavar='JSONFile',      dest="json",      type=str, help="Coverage data as JSON document.")
+	@ArgumentAttribute("--jobs",      metavar='Jobs',          dest="jobs",      type=int, help="Number of worker processes for multiple UCDB files or shards (default: number of CPUs).")
+	@ArgumentAttribute("--cache",     metavar='CacheDirectory', dest="cache",    type=str, help="Directory to cache extracted statement data of UCDB files.")
+	@ArgumentAttribute("--cache-size", metavar='MiB',          dest="cacheSize", type=int, default=1024, help="Maximum size of the cache directory in MiB (default: 1024).")
+	@ArgumentAttribute("--profile-json", metavar='JSONFile',   dest="profileJson", type=str, help="Write the profile (see --profile) as JSON.")
+	@ArgumentAttribute("--include-file",     metavar='Pattern', dest="includeFiles",     type=str, action="append", default=[], help="Only extract coverage of source files matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclude-file",     metavar='Pattern', dest="excludeFiles",     type=str, action="append", default=[], help="Don't extract coverage of source files matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--include-instance", metavar='Pattern', dest="includeInstances", type=str, action="append", default=[], help="Only extract coverage of instances (and their subtrees) matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclude-instance", metavar='Pattern', dest="excludeInstances", type=str, action="append", default=[], help="Skip instances (and their subtrees) matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclusions",       metavar='RuleFile', dest="exclusions",      type=str, help="Exclude bins matching the file, instance and line rules of this rule file.")
 	@SwitchArgumentAttribute("--merge-instances", dest="mergeInstances", help="Merge statement coverage data for all instances of the same design unit.")
+	@SwitchArgumentAttribute("--streaming",       dest="streaming",      help="Parse the UCDB file incrementally with bounded memory usage.")
+	@SwitchArgumentAttribute("--hit-counts",      dest="hitCounts",      help="Write the minimum hit count of the line's statements (summed over merged instances) per line instead of 0/1.")
+	@SwitchArgumentAttribute("--skip-covered-units", dest="skipCoveredUnits", help="With --merge-instances, skip further instances of fully covered design units.")
+	@SwitchArgumentAttribute("--sharded",         dest="sharded",        help="Split a single UCDB file into shards at scope boundaries and parse them with --jobs workers.")
+	@SwitchArgumentAttribute("--gzip",            dest="gzip",           help="Write the Cobertura file gzip compressed.")
+	@SwitchArgumentAttribute("--profile",         dest="profile",        help="Report wall time, CPU time and maximum RSS per processing phase.")
+	@SwitchArgumentAttribute("--profile-memory",  dest="profileMemory",  help="Trace peak memory per processing phase in the profile (inflates times).")
 	def HandleExport(self, args) -> None:
 		"""Handle program calls with command ``export``."""
 		self._PrintHeadline()
 
 		returnCode = 0
-		if args.ucdb is None:
+		if args.ucdb is None and args.database is None:
 			print(f"Option '--ucdb <UCDBFile' is missing.")
 			returnCode = 3
-		if args.cobertura is None:
+		elif args.ucdb is not None and args.database is not None:
+			print(f"Options '--ucdb' and '--database' can't be combined.")
+			returnCode = 3
+		elif args.ucdb is not None and "-" in args.ucdb and len(args.ucdb) > 1:
+			print(f"Standard input '--ucdb -' can't be combined with other UCDB files.")
+			returnCode = 3
+		elif args.sharded and (args.ucdb is None or args.ucdb == ["-"]):
+			print(f"Option '--sharded' requires a UCDB file.")
+			returnCode = 3
+		elif args.skipCoveredUnits and (args.sharded or args.database is not None):
+			print(f"Option '--skip-covered-units' can't be combined with '--sharded' or '--database'.")
+			returnCode = 3
+		if args.cobertura is None and args.lcov is None and args.json is None:
 			print(f"Option '--cobertura <CoberturaFile' is missing.")
 			returnCode = 3
 
@@ -145,20 +252,73 @@ class Program(ProgramBase, ArgParseMixin):
 
 		print(f"Exporting code coverage information from UCDB file to Cobertura format ...")
 
-		ucdbPath = Path(args.ucdb)
-		if not ucdbPath.exists():
-			raise FileNotFoundError(f"UCDB databse file '{ucdbPath}' not found.")
+		from gzip import GzipFile
+		from pyEDAA.UCIS.Cache import StatementCache
+		from pyEDAA.UCIS.Database import CoverageDatabase, DatabaseParser
+		from pyEDAA.UCIS.Profiling import Profiler
+		from pyEDAA.UCIS.Sharding import ShardedParser
+		from pyEDAA.UCIS.UCDB import Parser, MultiFileParser
+		from pyEDAA.UCIS.Writers import WRITERS, writeCoverage
+
+		outputs = [(format, Path(path)) for format, path in (("cobertura", args.cobertura), ("lcov", args.lcov), ("json", args.json)) if path is not None]
+		cache = None if args.cache is None else StatementCache(Path(args.cache), args.cacheSize * 1024 ** 2)
+		profiler = Profiler(args.profileMemory) if args.profile or args.profileMemory or args.profileJson is not None else None
+		pathFilter = self._GetPathFilter(args)
+		exclusions = self._GetExclusions(args)
+
+		parser: Parser
+		if args.database is not None:
+			if pathFilter is not None or exclusions is not None:
+				print(f"Filter and exclusion options can't be applied to a coverage database.")
+				exit(3)
+
+			databasePath = Path(args.database)
+			if not databasePath.exists():
+				raise FileNotFoundError(f"Coverage database file '{databasePath}' not found.")
+
+			print(f"  IN  -> Database:        {databasePath}")
+			self._PrintOutputs(outputs)
+
+			with CoverageDatabase(databasePath) as database:
+				parser = DatabaseParser(database, args.mergeInstances, hitCounts=args.hitCounts, profiler=profiler)
+				model = parser.getCoberturaModel()
+		elif args.ucdb == ["-"]:
+			print(f"  IN  -> UCIS (XML):      <stdin>")
+			self._PrintOutputs(outputs)
+
+			parser = Parser(sys.stdin.buffer, args.mergeInstances, args.streaming, hitCounts=args.hitCounts, skipCoveredUnits=args.skipCoveredUnits, profiler=profiler, pathFilter=pathFilter, exclusions=exclusions)
+			model = parser.getCoberturaModel()
+		else:
+			ucdbPaths = self._ExpandUcdbPaths(args.ucdb)
 
-		coberturaPath = Path(args.cobertura)
+			if args.skipCoveredUnits and len(ucdbPaths) > 1:
+				print(f"Option '--skip-covered-units' can't be applied to multiple UCDB files.")
+				exit(3)
 
-		print(f"  IN  -> UCIS (XML):      {ucdbPath}")
-		print(f"  OUT <- Cobertura (XML): {coberturaPath}")
+			for ucdbPath in ucdbPaths:
+				print(f"  IN  -> UCIS (XML):      {ucdbPath}")
+			self._PrintOutputs(outputs)
+
+			if args.sharded:
+				if len(ucdbPaths) > 1:
+					print(f"Option '--sharded' can't be applied to multiple UCDB files.")
+					exit(3)
 
-		parser = Parser(ucdbPath, args.mergeInstances)
-		model = parser.getCoberturaModel()
+				parser = ShardedParser(ucdbPaths[0], args.mergeInstances, args.jobs, hitCounts=args.hitCounts, profiler=profiler, pathFilter=pathFilter, exclusions=exclusions)
+			elif len(ucdbPaths) == 1:
+				parser = Parser(ucdbPaths[0], args.mergeInstances, args.streaming, hitCounts=args.hitCounts, skipCoveredUnits=args.skipCoveredUnits, cache=cache, profiler=profiler, pathFilter=pathFilter, exclusions=exclusions)
+			else:
+				parser = MultiFileParser(ucdbPaths, args.mergeInstances, args.streaming, args.jobs, hitCounts=args.hitCounts, cache=cache, profiler=profiler, pathFilter=pathFilter, exclusions=exclusions)
+			model = parser.getCoberturaModel()
 
-		with coberturaPath.open('w') as file:
-			file.write(model.getXml().decode("utf-8"))
+		# All formats are written in a single traversal over the coverage model.
+		with nullcontext() if profiler is None else profiler.phase("serialize"), ExitStack() as stack:
+			writers = []
+			for format, path in outputs:
+				file = stack.enter_context(GzipFile(path, "wb") if format == "cobertura" and args.gzip else path.open("wb"))
+				writers.append(WRITERS[format](cast(BinaryIO, file)))
+
+			writeCoverage(model, writers)
 
 		print()
 
@@ -172,13 +332,413 @@ class Program(ProgramBase, ArgParseMixin):
 		except ZeroDivisionError:
 			statementCoverage = 100
 
+		try:
+			branchCoverage = model.branchesCovered / model.branchesValid * 100
+		except ZeroDivisionError:
+			branchCoverage = 100
+
 		print(dedent(f"""\
 			[DONE] Export and conversion complete.
 			  Line coverage: {lineCoverage} %
 			  Statement coverage: {statementCoverage} %
+			  Branch coverage: {branchCoverage} %
+			""")
+		)
+
+		if exclusions is not None:
+			self._PrintExclusions(exclusions)
+
+		if profiler is not None:
+			if args.profile or args.profileMemory:
+				print("Profile:")
+				print(profiler.getReport())
+			if args.profileJson is not None:
+				with Path(args.profileJson).open("w", encoding="utf-8") as jsonFile:
+					profiler.writeJson(jsonFile)
+
+	@CommandAttribute("ingest", help="Add UCDB files to a coverage database.", description="Add the statement coverage of UCDB files to a coverage database (SQLite).")
+	@ArgumentAttribute("--ucdb",      metavar='UCDBFile',      dest="ucdb",      type=str, nargs="+", help="UCDB file(s) in UCIS format (XML), optionally compressed. Glob patterns are expanded.")
+	@ArgumentAttribute("--database",  metavar='DatabaseFile',  dest="database",  type=str, help="Coverage database file (SQLite). It's created, if it doesn't exist.")
+	@ArgumentAttribute("--jobs",      metavar='Jobs',          dest="jobs",      type=int, help="Number of worker processes for multiple UCDB files (default: number of CPUs).")
+	@ArgumentAttribute("--include-file",     metavar='Pattern', dest="includeFiles",     type=str, action="append", default=[], help="Only extract coverage of source files matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclude-file",     metavar='Pattern', dest="excludeFiles",     type=str, action="append", default=[], help="Don't extract coverage of source files matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--include-instance", metavar='Pattern', dest="includeInstances", type=str, action="append", default=[], help="Only extract coverage of instances (and their subtrees) matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclude-instance", metavar='Pattern', dest="excludeInstances", type=str, action="append", default=[], help="Skip instances (and their subtrees) matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclusions",       metavar='RuleFile', dest="exclusions",      type=str, help="Exclude bins matching the file, instance and line rules of this rule file.")
+	@SwitchArgumentAttribute("--streaming",       dest="streaming",      help="Parse the UCDB file incrementally with bounded memory usage.")
+	def HandleIngest(self, args) -> None:
+		"""Handle program calls with command ``ingest``."""
+		self._PrintHeadline()
+
+		returnCode = 0
+		if args.ucdb is None:
+			print(f"Option '--ucdb <UCDBFile' is missing.")
+			returnCode = 3
+		if args.database is None:
+			print(f"Option '--database <DatabaseFile' is missing.")
+			returnCode = 3
+
+		if returnCode != 0:
+			exit(returnCode)
+
+		print(f"Ingesting code coverage information from UCDB files into database ...")
+
+		from pyEDAA.UCIS.Cache import getContentHash
+		from pyEDAA.UCIS.Database import CoverageDatabase
+		from pyEDAA.UCIS.UCDB import extractStatements
+
+		ucdbPaths = self._ExpandUcdbPaths(args.ucdb)
+		databasePath = Path(args.database)
+		print(f"  OUT <- Database:        {databasePath}")
+
+		exclusions = self._GetExclusions(args)
+
+		with CoverageDatabase(databasePath) as database:
+			# Hits of a test ingested again would be added twice, thus files of already ingested content are skipped. Tests
+			# are identified by content, as the same file can be given by different paths and a path can be reused by a
+			# regenerated file.
+			newPaths = []
+			contentHashes: Dict[Path, str] = {}
+			names: Dict[str, Path] = {}
+			for ucdbPath in ucdbPaths:
+				contentHash = getContentHash(ucdbPath)
+				ingestedName = database.findTest(contentHash)
+				if ingestedName is not None:
+					print(f"  SKIP -> Same content was already ingested as '{ingestedName}': {ucdbPath}")
+				elif contentHash in names:
+					print(f"  SKIP -> Same content as '{names[contentHash]}': {ucdbPath}")
+				else:
+					names[contentHash] = ucdbPath
+					contentHashes[ucdbPath] = contentHash
+					newPaths.append(ucdbPath)
+
+			for ucdbPath, sources, statements in extractStatements(newPaths, args.streaming, args.jobs, pathFilter=self._GetPathFilter(args), exclusions=exclusions):
+				print(f"  IN  -> UCIS (XML):      {ucdbPath}")
+				database.ingest(str(ucdbPath.resolve()), contentHashes[ucdbPath], sources, statements)
+
+			testCount = len(database.getTests())
+
+		print()
+		print(dedent(f"""\
+			[DONE] Ingestion complete.
+			  Ingested files: {len(newPaths)}
+			  Tests in database: {testCount}
+			""")
+		)
+
+		if exclusions is not None:
+			self._PrintExclusions(exclusions)
+
+	@CommandAttribute("index", help="Create scope indexes of UCDB files.", description="Create sidecar files indexing the byte ranges of all instances in UCDB files.")
+	@ArgumentAttribute("--ucdb",      metavar='UCDBFile',      dest="ucdb",      type=str, nargs="+", help="Uncompressed UCDB file(s) in UCIS format (XML). Glob patterns are expanded.")
+	def HandleIndex(self, args) -> None:
+		"""Handle program calls with command ``index``."""
+		self._PrintHeadline()
+
+		if args.ucdb is None:
+			print(f"Option '--ucdb <UCDBFile' is missing.")
+			exit(3)
+
+		from pyEDAA.UCIS.Index import ScopeIndex
+
+		for ucdbPath in self._ExpandUcdbPaths(args.ucdb):
+			index = ScopeIndex.build(ucdbPath)
+			index.write()
+
+			print(f"  IN  -> UCIS (XML):      {ucdbPath}")
+			print(f"  OUT <- Index:           {ScopeIndex.getIndexPath(ucdbPath)} ({len(index.getInstances())} instances)")
+
+		print()
+		print(f"[DONE] Indexing complete.")
+
+	@CommandAttribute("query", help="Query the coverage of single instances.", description="Query the coverage of single instances using a scope index. The index is created, if it's missing or outdated.")
+	@ArgumentAttribute("--ucdb",      metavar='UCDBFile',      dest="ucdb",      type=str, help="Uncompressed UCDB file in UCIS format (XML).")
+	@ArgumentAttribute("--instance",  metavar='InstancePath',  dest="instances", type=str, action="append", default=[], help="Hierarchical path of an instance, e.g. 'top.dut.u_core'. Can be repeated.")
+	@ArgumentAttribute("--cobertura", metavar='CoberturaFile', dest="cobertura", type=str, help="Write the coverage of the (first) instance as Cobertura code coverage file (XML).")
+	@SwitchArgumentAttribute("--list",            dest="list",           help="List all indexed instances.")
+	@SwitchArgumentAttribute("--merge-instances", dest="mergeInstances", help="Merge statement coverage data for all instances of the same design unit.")
+	def HandleQuery(self, args) -> None:
+		"""Handle program calls with command ``query``."""
+		self._PrintHeadline()
+
+		returnCode = 0
+		if args.ucdb is None:
+			print(f"Option '--ucdb <UCDBFile' is missing.")
+			returnCode = 3
+		if len(args.instances) == 0 and not args.list:
+			print(f"Option '--instance <InstancePath' is missing.")
+			returnCode = 3
+
+		if returnCode != 0:
+			exit(returnCode)
+
+		ucdbPath = Path(args.ucdb)
+		if not ucdbPath.exists():
+			raise FileNotFoundError(f"UCDB databse file '{ucdbPath}' not found.")
+
+		from pyEDAA.UCIS.Index import ScopeIndex
+		from pyEDAA.UCIS.UCDB import Parser
+
+		index = ScopeIndex.load(ucdbPath)
+
+		if args.list:
+			for instance in index.getInstances():
+				print(f"  {instance}")
+
+		for position, instance in enumerate(args.instances):
+			parser = Parser(index.openFragment(instance), args.mergeInstances)
+			model = parser.getCoberturaModel()
+			model.refreshStatistics()
+
+			if position == 0 and args.cobertura is not None:
+				with Path(args.cobertura).open("wb") as file:
+					model.writeXml(file)
+
+			try:
+				statementCoverage = parser.statementsCovered / parser.statementsCount * 100
+			except ZeroDivisionError:
+				statementCoverage = 100
+
+			try:
+				branchCoverage = model.branchesCovered / model.branchesValid * 100
+			except ZeroDivisionError:
+				branchCoverage = 100
+
+			print(dedent(f"""\
+				Instance: {instance}
+				  Statement coverage: {statementCoverage} % ({parser.statementsCovered}/{parser.statementsCount})
+				  Branch coverage: {branchCoverage} % ({model.branchesCovered}/{model.branchesValid})
+				""")
+			)
+
+	@CommandAttribute("rank", help="Rank tests by coverage per cost.", description="Rank tests (one UCDB file per test) by a greedy set cover of their statement and branch bins weighted by cost.")
+	@ArgumentAttribute("--ucdb",      metavar='UCDBFile',      dest="ucdb",      type=str, nargs="+", help="UCDB file(s) in UCIS format (XML) of single tests, optionally compressed. Glob patterns are expanded.")
+	@ArgumentAttribute("--cost",      metavar='Cost',          dest="cost",      type=str, choices=["cpu", "sim", "none"], default="cpu", help="Cost of a test: CPU time, simulation time of its history nodes or 1 (default: cpu).")
+	@ArgumentAttribute("--jobs",      metavar='Jobs',          dest="jobs",      type=int, help="Number of worker processes for multiple UCDB files (default: number of CPUs).")
+	@ArgumentAttribute("--include-file",     metavar='Pattern', dest="includeFiles",     type=str, action="append", default=[], help="Only extract coverage of source files matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclude-file",     metavar='Pattern', dest="excludeFiles",     type=str, action="append", default=[], help="Don't extract coverage of source files matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--include-instance", metavar='Pattern', dest="includeInstances", type=str, action="append", default=[], help="Only extract coverage of instances (and their subtrees) matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclude-instance", metavar='Pattern', dest="excludeInstances", type=str, action="append", default=[], help="Skip instances (and their subtrees) matching this glob pattern. Can be repeated.")
+	@ArgumentAttribute("--exclusions",       metavar='RuleFile', dest="exclusions",      type=str, help="Exclude bins matching the file, instance and line rules of this rule file.")
+	@SwitchArgumentAttribute("--streaming",       dest="streaming",      help="Parse the UCDB file incrementally with bounded memory usage.")
+	def HandleRank(self, args) -> None:
+		"""Handle program calls with command ``rank``."""
+		self._PrintHeadline()
+
+		if args.ucdb is None:
+			print(f"Option '--ucdb <UCDBFile' is missing.")
+			exit(3)
+
+		from pyEDAA.UCIS.Ranking import CoverageVectors, readTestRecords
+		from pyEDAA.UCIS.UCDB import extractStatements
+
+		exclusions = self._GetExclusions(args)
+
+		vectors = CoverageVectors()
+		for ucdbPath, _, statements in extractStatements(self._ExpandUcdbPaths(args.ucdb), args.streaming, args.jobs, pathFilter=self._GetPathFilter(args), exclusions=exclusions):
+			print(f"  IN  -> UCIS (XML):      {ucdbPath}")
+			if args.cost == "none":
+				cost = 1.0
+			else:
+				records = readTestRecords(ucdbPath)
+				cost = sum(record.cpuTime if args.cost == "cpu" else record.simTime for record in records)
+			vectors.add(str(ucdbPath), statements, cost)
+
+		binCount = len(vectors.universe)
+		totalCost = sum(test.cost for test in vectors.tests)
+		ranking = vectors.rank()
+
+		print()
+		print(f"  Rank  New bins  Coverage  {'Cost':>12}  Test")
+		for rank, rankedTest in enumerate(ranking, start=1):
+			coverage = rankedTest.coveredBins / binCount * 100
+			print(f"  {rank:>4}  {rankedTest.newBins:>8}  {coverage:6.2f} %  {rankedTest.cumulativeCost:>12.6g}  {rankedTest.test.name}")
+
+		coveredBins = ranking[-1].coveredBins if len(ranking) > 0 else 0
+		selectedCost = ranking[-1].cumulativeCost if len(ranking) > 0 else 0.0
+
+		print()
+		print(dedent(f"""\
+			[DONE] Ranking complete.
+			  Selected tests: {len(ranking)} of {len(vectors.tests)}
+			  Covered bins: {coveredBins} of {binCount}
+			  Cost: {selectedCost:.6g} of {totalCost:.6g}
 			""")
 		)
 
+		if exclusions is not None:
+			self._PrintExclusions(exclusions)
+
+	@CommandAttribute("diff", help="Compare the coverage of two runs.", description="Compare the line coverage of two runs given as UCDB or Cobertura files and print gained and lost lines.")
+	@ArgumentAttribute("--old",       metavar='File',          dest="old",       type=str, help="UCDB or Cobertura file of the old run, optionally compressed.")
+	@ArgumentAttribute("--new",       metavar='File',          dest="new",       type=str, help="UCDB or Cobertura file of the new run, optionally compressed.")
+	@SwitchArgumentAttribute("--merge-instances", dest="mergeInstances", help="Merge statement coverage data for all instances of the same design unit.")
+	@SwitchArgumentAttribute("--summary",         dest="summary",        help="Only print the coverage of changed files.")
+	def HandleDiff(self, args) -> None:
+		"""Handle program calls with command ``diff``."""
+		self._PrintHeadline()
+
+		returnCode = 0
+		if args.old is None:
+			print(f"Option '--old <File' is missing.")
+			returnCode = 3
+		if args.new is None:
+			print(f"Option '--new <File' is missing.")
+			returnCode = 3
+
+		if returnCode != 0:
+			exit(returnCode)
+
+		from pyEDAA.UCIS.Diff import CoverageDiff, readCoverage
+
+		oldPath, newPath = self._ExpandUcdbPaths([args.old, args.new], "Coverage file")
+		print(f"  OLD -> {oldPath}")
+		print(f"  NEW -> {newPath}")
+
+		diff = CoverageDiff(readCoverage(oldPath, args.mergeInstances), readCoverage(newPath, args.mergeInstances))
+
+		if not args.summary:
+			print()
+			print(f"Gained lines: {len(diff.gained)}")
+			for change in diff.gained:
+				print(f"  + {change.file}:{change.line}")
+			print(f"Lost lines: {len(diff.lost)}")
+			for change in diff.lost:
+				print(f"  - {change.file}:{change.line}")
+
+		print()
+		print(f"Changed files:")
+		for delta in diff.files:
+			if not delta.IsChanged:
+				continue
+
+			# Files missing in one run have no coverage rate.
+			oldRate = f"{delta.OldRate * 100:6.2f} %" if delta.oldValid > 0 else "     - "
+			newRate = f"{delta.NewRate * 100:6.2f} %" if delta.newValid > 0 else "     - "
+			rateChange = f" ({(delta.NewRate - delta.OldRate) * 100:+.2f} %)" if delta.oldValid > 0 and delta.newValid > 0 else ""
+			print(f"  {oldRate} -> {newRate}{rateChange}  {delta.file}")
+
+		print()
+		print(dedent(f"""\
+			[DONE] Comparison complete.
+			  Gained lines: {len(diff.gained)}
+			  Lost lines: {len(diff.lost)}
+			""")
+		)
+
+	@CommandAttribute("merge", help="Merge Cobertura files.", description="Merge Cobertura code coverage files (XML), e.g. reports of earlier runs.")
+	@ArgumentAttribute("--input",     metavar='CoberturaFile', dest="inputs",    type=str, nargs="+", help="Cobertura file(s) to merge, optionally compressed. Glob patterns are expanded.")
+	@ArgumentAttribute("--cobertura", metavar='CoberturaFile', dest="cobertura", type=str, help="Merged Cobertura code coverage file (XML).")
+	@ArgumentAttribute("--policy",    metavar='Policy',        dest="policy",    type=str, choices=["max", "sum", "or"], default="max", help="Combination of hit counts of the same line: max, sum or or (default: max).")
+	@SwitchArgumentAttribute("--gzip",            dest="gzip",           help="Write the Cobertura file gzip compressed.")
+	def HandleMerge(self, args) -> None:
+		"""Handle program calls with command ``merge``."""
+		self._PrintHeadline()
+
+		returnCode = 0
+		if args.inputs is None:
+			print(f"Option '--input <CoberturaFile' is missing.")
+			returnCode = 3
+		if args.cobertura is None:
+			print(f"Option '--cobertura <CoberturaFile' is missing.")
+			returnCode = 3
+
+		if returnCode != 0:
+			exit(returnCode)
+
+		print(f"Merging Cobertura files ...")
+
+		from gzip import GzipFile
+		from pyEDAA.UCIS.Cobertura import Coverage, MergePolicy, mergeCoverages
+		from pyEDAA.UCIS.UCDB import openUcdbFile
+
+		models = []
+		for inputPath in self._ExpandUcdbPaths(args.inputs, "Cobertura file"):
+			print(f"  IN  -> Cobertura (XML): {inputPath}")
+			with openUcdbFile(inputPath) as file:
+				models.append(Coverage.read(file))
+
+		coberturaPath = Path(args.cobertura)
+		print(f"  OUT <- Cobertura (XML): {coberturaPath}")
+
+		model = mergeCoverages(models, MergePolicy(args.policy))
+
+		with GzipFile(coberturaPath, "wb") if args.gzip else coberturaPath.open("wb") as file:
+			model.writeXml(cast(BinaryIO, file))
+
+		try:
+			lineCoverage = model.linesCovered / model.linesValid * 100
+		except ZeroDivisionError:
+			lineCoverage = 100
+
+		try:
+			branchCoverage = model.branchesCovered / model.branchesValid * 100
+		except ZeroDivisionError:
+			branchCoverage = 100
+
+		print()
+		print(dedent(f"""\
+			[DONE] Merge complete.
+			  Merged files: {len(models)}
+			  Line coverage: {lineCoverage} %
+			  Branch coverage: {branchCoverage} %
+			""")
+		)
+
+	def _PrintOutputs(self, outputs: List[Tuple[str, Path]]) -> None:
+		"""Helper function to print the output files of the export command."""
+		labels = {"cobertura": "Cobertura (XML)", "lcov": "LCOV", "json": "JSON"}
+		for format, path in outputs:
+			print(f"  OUT <- {labels[format] + ':':<17}{path}")
+
+	def _GetPathFilter(self, args) -> Optional["PathFilter"]:
+		"""Helper function to create a path filter from the filter options, if any filter option is given."""
+		if len(args.includeFiles) == len(args.excludeFiles) == len(args.includeInstances) == len(args.excludeInstances) == 0:
+			return None
+
+		from pyEDAA.UCIS.Filter import PathFilter
+
+		return PathFilter(args.includeFiles, args.excludeFiles, args.includeInstances, args.excludeInstances)
+
+	def _GetExclusions(self, args) -> Optional["ExclusionRules"]:
+		"""Helper function to read the exclusion rules, if a rule file is given."""
+		if args.exclusions is None:
+			return None
+
+		from pyEDAA.UCIS.Exclusion import ExclusionRules
+
+		rulePath = Path(args.exclusions)
+		if not rulePath.exists():
+			raise FileNotFoundError(f"Exclusion rule file '{rulePath}' not found.")
+
+		return ExclusionRules.read(rulePath)
+
+	def _PrintExclusions(self, exclusions: "ExclusionRules") -> None:
+		"""Helper function to print the number of bins excluded per exclusion rule."""
+		print("Exclusions:")
+		for rule in exclusions.rules:
+			print(f"  {rule.count:>10}  line {rule.lineNumber}: {rule}")
+		print(f"  {exclusions.ExcludedCount:>10}  total")
+
+	def _ExpandUcdbPaths(self, patterns: List[str], kind: str = "UCDB database file") -> List[Path]:
+		"""Helper function to expand glob patterns of UCDB (or other input) files and to check for their existence."""
+		ucdbPaths: List[Path] = []
+		for pattern in patterns:
+			if any(c in pattern for c in "*?["):
+				matches = sorted(glob(pattern, recursive=True))
+				if len(matches) == 0:
+					raise FileNotFoundError(f"No {kind} matches '{pattern}'.")
+
+				ucdbPaths.extend(Path(match) for match in matches)
+			else:
+				ucdbPath = Path(pattern)
+				if not ucdbPath.exists():
+					raise FileNotFoundError(f"{kind} '{ucdbPath}' not found.")
+
+				ucdbPaths.append(ucdbPath)
+
+		return ucdbPaths
+
 	def _PrintVersion(self):
 		"""Helper function to print the version information."""
 		print(dedent(f"""\
@@ -220,10 +780,24 @@ def main():
 		print()
 		print(f"[ERROR] {ex}")
 		exit(1)
-	except CoberturaException as ex:
-		print()
-		print(f"[INTERNAL ERROR] {ex}")
-		exit(1)
+	except Exception as ex:
+		# Modules are imported lazily by the command handlers, thus their exception classes are resolved only on errors.
+		from pyEDAA.UCIS.Cobertura import CoberturaException
+		from pyEDAA.UCIS.Database import DatabaseException
+		from pyEDAA.UCIS.Exclusion import ExclusionException
+		from pyEDAA.UCIS.Index import IndexException
+		from pyEDAA.UCIS.UCDB import UcdbParserException, UnsupportedCompression
+
+		if isinstance(ex, (UnsupportedCompression, DatabaseException, ExclusionException, IndexException)):
+			print()
+			print(f"[ERROR] {ex}")
+			exit(1)
+		elif isinstance(ex, (CoberturaException, UcdbParserException)):
+			print()
+			print(f"[INTERNAL ERROR] {ex}")
+			exit(1)
+
+		raise
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Persistent on-disk cache of statement data extracted from UCDB files.
+
+Repeated conversions of the same UCDB file load the extracted :class:`~pyEDAA.UCIS.Store.StatementStore` from the cache
+instead of parsing the XML document again.
+"""
+import json
+import os
+from hashlib import blake2b, sha1
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import time
+from typing import BinaryIO, Iterable, Optional, Set, Tuple, cast
+
+from pyTooling.Decorators import export
+
+from pyEDAA.UCIS.Store import StatementStore, StoreException
+
+
+CACHE_MAGIC = b"UCISCACH"
+GRACE_PERIOD = 60 * 60  #: Age in seconds, after which metadata files without an entry and temporary files are removed.
+
+
+def _remove(path: Path) -> bool:
+	"""Removes a file, which might have been removed concurrently. Returns whether it was removed."""
+	try:
+		path.unlink()
+	except OSError:
+		return False
+
+	return True
+
+
+@export  # type: ignore[type-var]
+def getContentHash(path: Path) -> str:
+	"""
+	Returns the content hash of a file.
+
+	:param path: Path to the file.
+	:returns:    Hexadecimal content hash.
+	"""
+	contentHash = blake2b(digest_size=20)
+	with path.open("rb") as file:
+		for chunk in iter(lambda: file.read(1024 ** 2), b""):
+			contentHash.update(chunk)
+
+	return contentHash.hexdigest()
+
+
+@export
+class StatementCache:
+	"""
+	Caches extracted statement stores in a directory.
+
+	Entries are keyed by the content hash of a UCDB file. For each cached path, a small metadata file records the file's
+	size, modification time and content hash, so an unchanged file is found without hashing its content again. The total
+	size of all entries is capped. If the cap is exceeded, the least recently used entries are evicted.
+	"""
+
+	directory: Path
+	maxSize: int
+
+	def __init__(self, directory: Path, maxSize: int = 1024 ** 3):
+		"""
+		Initializes a statement cache.
+
+		:param directory: Cache directory. It's created if it doesn't exist.
+		:param maxSize:   Maximum size of all cache entries in bytes.
+		"""
+		self.directory = directory
+		self.maxSize = maxSize
+
+		directory.mkdir(parents=True, exist_ok=True)
+
+	def _getMetadataPath(self, ucdbFile: Path) -> Path:
+		return self.directory / f"{sha1(str(ucdbFile.resolve()).encode('utf-8')).hexdigest()}.meta"
+
+	def _getEntryPath(self, contentHash: str) -> Path:
+		return self.directory / f"{contentHash}.stmts"
+
+	def getContentHash(self, ucdbFile: Path) -> str:
+		"""
+		Returns the content hash of a UCDB file.
+
+		If size and modification time of the file match the recorded metadata, the recorded hash is returned. Otherwise,
+		the file's content is hashed and the metadata is updated.
+
+		:param ucdbFile: Path to the UCDB file.
+		:returns:        Hexadecimal content hash.
+		"""
+		stat = ucdbFile.stat()
+		metadataPath = self._getMetadataPath(ucdbFile)
+
+		try:
+			metadata = json.loads(metadataPath.read_text(encoding="utf-8"))
+			if metadata["size"] == stat.st_size and metadata["mtime"] == stat.st_mtime_ns:
+				return metadata["hash"]
+		except (OSError, ValueError, KeyError):
+			pass
+
+		metadata = {"path": str(ucdbFile), "size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": getContentHash(ucdbFile)}
+		self._writeAtomically(metadataPath, json.dumps(metadata).encode("utf-8"))
+
+		return metadata["hash"]
+
+	def load(self, ucdbFile: Path) -> Optional[Tuple[Set[str], StatementStore]]:
+		"""
+		Loads the cached statement data of a UCDB file.
+
+		:param ucdbFile: Path to the UCDB file.
+		:returns:        Tuple of source directories and statement store, or ``None`` if the file isn't cached.
+		"""
+		entryPath = self._getEntryPath(self.getContentHash(ucdbFile))
+
+		try:
+			with entryPath.open("rb") as file:
+				if file.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+					return None
+
+				header = json.loads(file.read(int.from_bytes(file.read(4), "little")).decode("utf-8"))
+				statements = StatementStore.read(file)
+		except (OSError, ValueError, StoreException):
+			return None
+
+		# Update the modification time, which is used as access time for LRU eviction.
+		os.utime(entryPath)
+
+		return set(header["sources"]), statements
+
+	def save(self, ucdbFile: Path, sources: Iterable[str], statements: StatementStore) -> None:
+		"""
+		Stores the statement data of a UCDB file and evicts least recently used entries, if the cache exceeds its size cap.
+
+		:param ucdbFile:   Path to the UCDB file.
+		:param sources:    Source directories referenced by the UCDB file.
+		:param statements: Statement store extracted from the UCDB file.
+		"""
+		entryPath = self._getEntryPath(self.getContentHash(ucdbFile))
+		header = json.dumps({"sources": sorted(sources)}).encode("utf-8")
+
+		with NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as file:
+			file.write(CACHE_MAGIC)
+			file.write(len(header).to_bytes(4, "little"))
+			file.write(header)
+			statements.write(cast(BinaryIO, file))
+
+		os.replace(file.name, entryPath)
+
+		self.evict()
+
+	def evict(self) -> None:
+		"""
+		Removes least recently used entries until all entries fit into the size cap.
+
+		Metadata files are removed together with the entries evicted by this call. Metadata files without an entry and
+		temporary files of interrupted saves are only removed after :data:`GRACE_PERIOD`, as workers sharing the cache
+		directory might still be about to save the corresponding entry.
+		"""
+		entries = []
+		for entryPath in self.directory.glob("*.stmts"):
+			try:
+				stat = entryPath.stat()
+			except OSError:
+				continue
+			entries.append((stat.st_mtime_ns, stat.st_size, entryPath))
+
+		totalSize = sum(size for _, size, _ in entries)
+		evictedHashes: Set[str] = set()
+		for _, size, entryPath in sorted(entries):
+			if totalSize <= self.maxSize:
+				break
+
+			if _remove(entryPath):
+				totalSize -= size
+				evictedHashes.add(entryPath.stem)
+
+		entryHashes = {entryPath.stem for _, _, entryPath in entries} - evictedHashes
+		staleTime = time() - GRACE_PERIOD
+
+		for metadataPath in self.directory.glob("*.meta"):
+			try:
+				modificationTime = metadataPath.stat().st_mtime
+				contentHash = json.loads(metadataPath.read_text(encoding="utf-8"))["hash"]
+			except (OSError, ValueError, KeyError, TypeError):
+				continue
+
+			if contentHash in evictedHashes or (contentHash not in entryHashes and modificationTime < staleTime):
+				_remove(metadataPath)
+
+		for temporaryPath in self.directory.glob("*.tmp"):
+			try:
+				modificationTime = temporaryPath.stat().st_mtime
+			except OSError:
+				continue
+
+			if modificationTime < staleTime:
+				_remove(temporaryPath)
+
+	def _writeAtomically(self, path: Path, content: bytes) -> None:
+		with NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as file:
+			file.write(content)
+
+		os.replace(file.name, path)
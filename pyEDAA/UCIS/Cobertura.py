@@ -38,8 +38,13 @@ Data model of the Cobertura format.
      Coverage --> Package --> Class --> Statement
 
 """
+import re
+from enum import Enum
+from io import BytesIO
+from operator import add
+from sys import intern
 from time import time
-from typing import Dict, Set
+from typing import BinaryIO, Callable, Dict, Generator, Iterable, Optional, Set, Tuple
 
 from lxml import etree
 from pyTooling.Decorators import export
@@ -65,6 +70,56 @@ class DuplicatedPackageName(CoberturaException):
 	"""Raised when package with specified name already exists in Cobertura coverage"""
 
 
+def _getAttribute(node: etree._Element, name: str) -> str:
+	"""Returns the value of a required attribute or raises a :exc:`CoberturaException` naming the element and attribute."""
+	value = node.get(name)
+	if value is None:
+		raise CoberturaException(f"Element <{node.tag}> without attribute '{name}' in line {node.sourceline}.")
+
+	return value
+
+
+def _getRate(covered: int, valid: int) -> str:
+	"""Formats a coverage rate. Without any valid items, the rate is ``1``."""
+	try:
+		rate = covered / valid
+	except ZeroDivisionError:
+		rate = 1.0
+
+	return f"{rate:.16g}"
+
+
+@export
+class MergePolicy(Enum):
+	"""Policy combining the hit counts of a line contained in both merged coverage models."""
+
+	Max = "max"  #: Maximum of both hit counts.
+	Sum = "sum"  #: Sum of both hit counts.
+	Or = "or"    #: ``1``, if the line is covered in any model, otherwise ``0``.
+
+
+_MERGE_FUNCTIONS: Dict[MergePolicy, Callable[[int, int], int]] = {
+	MergePolicy.Max: max,
+	MergePolicy.Sum: add,
+	MergePolicy.Or:  lambda hits, otherHits: int(hits > 0 or otherHits > 0),
+}
+
+
+_CONDITION_COVERAGE_PATTERN = re.compile(r"\((\d+)/(\d+)\)")
+
+
+def _getStatistics(item) -> Tuple[int, int, int, int]:
+	return item.linesValid, item.linesCovered, item.branchesValid, item.branchesCovered
+
+
+def _addStatistics(item, before: Tuple[int, int, int, int], after: Tuple[int, int, int, int]) -> None:
+	"""Adds the difference of a child's statistics before and after merging to the statistics of its parent item."""
+	item.linesValid += after[0] - before[0]
+	item.linesCovered += after[1] - before[1]
+	item.branchesValid += after[2] - before[2]
+	item.branchesCovered += after[3] - before[3]
+
+
 @export
 class Class:
 	"""Represents a code element in the Cobertura coverage data model (Java-focused)."""
@@ -72,15 +127,21 @@ class Class:
 	name: str
 	sourceFile: str
 	lines: Dict[int, int]
+	branches: Dict[int, Tuple[int, int]]
 	linesValid: int
 	linesCovered: int
+	branchesValid: int
+	branchesCovered: int
 
 	def __init__(self, name: str, sourceFile: str):
 		self.name = name
 		self.sourceFile = sourceFile
 		self.lines = {}
+		self.branches = {}
 		self.linesValid = 0
 		self.linesCovered = 0
+		self.branchesValid = 0
+		self.branchesCovered = 0
 
 	def addStatement(self, line: int, hits: int) -> None:
 		if line in self.lines.keys():
@@ -92,31 +153,122 @@ class Class:
 		if hits:
 			self.linesCovered += 1
 
+	def addBranches(self, line: int, branches: int, covered: int) -> None:
+		"""
+		Adds the branches of a statement line.
+
+		:param line:     Line number of the branch statement. A statement must have been added for this line.
+		:param branches: Number of branches (outcomes) in that line.
+		:param covered:  Number of covered branches.
+		"""
+		if line in self.branches:
+			raise DuplicatedLineNumber(f"Duplicated line number of branches: {line}")
+
+		self.branches[line] = (branches, covered)
+		self.branchesValid += branches
+		self.branchesCovered += covered
+
+	def merge(self, other: "Class", policy: MergePolicy = MergePolicy.Max) -> None:
+		"""
+		Merges the lines and branches of another class into this class in place.
+
+		Hit counts of lines contained in both classes are combined by ``policy``. Branches are only known as counts per line,
+		thus the maximum of both branch counts and of both covered branch counts is used regardless of ``policy``.
+
+		:param other:  Class to merge into this class. It isn't modified.
+		:param policy: Policy combining the hit counts of a line contained in both classes.
+		"""
+		combine = _MERGE_FUNCTIONS[policy]
+		lines = self.lines
+
+		for line, otherHits in other.lines.items():
+			try:
+				hits = lines[line]
+			except KeyError:
+				hits = lines[line] = combine(0, otherHits)
+				self.linesValid += 1
+				if hits:
+					self.linesCovered += 1
+				continue
+
+			mergedHits = lines[line] = combine(hits, otherHits)
+			if mergedHits and not hits:
+				self.linesCovered += 1
+
+		for line, (otherBranches, otherCovered) in other.branches.items():
+			branches, covered = self.branches.get(line, (0, 0))
+			mergedBranches = max(branches, otherBranches)
+			mergedCovered = max(covered, otherCovered)
+
+			self.branches[line] = (mergedBranches, mergedCovered)
+			self.branchesValid += mergedBranches - branches
+			self.branchesCovered += mergedCovered - covered
+
+	@classmethod
+	def fromXmlNode(cls, classNode: etree._Element) -> "Class":
+		"""
+		Creates a class from a Cobertura ``<class>`` element.
+
+		Only lines directly in the class' ``<lines>`` element are read, lines of ``<methods>`` are ignored. Branch counts are
+		read from the ``condition-coverage`` attribute of branch lines. Names are interned (see :func:`sys.intern`), so the
+		name and file name of a class, its package and the same names in other read documents share one string object.
+
+		:param classNode: ``<class>`` element.
+		:returns:         New class with updated statistics.
+		:raises CoberturaException: If a required attribute is missing or malformed.
+		"""
+		coberturaClass = cls(intern(_getAttribute(classNode, "name")), intern(_getAttribute(classNode, "filename")))
+
+		linesNode = classNode.find("lines")
+		if linesNode is None:
+			return coberturaClass
+
+		for lineNode in linesNode.iterchildren("line"):
+			line = int(_getAttribute(lineNode, "number"))
+			coberturaClass.addStatement(line, int(_getAttribute(lineNode, "hits")))
+
+			conditionCoverage = lineNode.get("condition-coverage")
+			if lineNode.get("branch") == "true" and conditionCoverage is not None:
+				match = _CONDITION_COVERAGE_PATTERN.search(conditionCoverage)
+				if match is None:
+					raise CoberturaException(f"Invalid condition coverage '{conditionCoverage}' in line {lineNode.sourceline}.")
+
+				covered, branches = match.groups()
+				coberturaClass.addBranches(line, int(branches), int(covered))
+
+		return coberturaClass
+
 	def getXmlNode(self) -> etree._Element:
 		classNode = etree.Element("class")
 		classNode.attrib["name"] = self.sourceFile
 		classNode.attrib["filename"] = self.sourceFile
 		classNode.attrib["complexity"] = "0"
-		classNode.attrib["branch-rate"] = "0"
-
-		try:
-			rate = self.linesCovered / self.linesValid
-		except ZeroDivisionError:
-			rate = 1.0
-
-		classNode.attrib["line-rate"] = f"{rate:.16g}"
+		classNode.attrib["branch-rate"] = _getRate(self.branchesCovered, self.branchesValid)
+		classNode.attrib["line-rate"] = _getRate(self.linesCovered, self.linesValid)
 
 		classNode.append(etree.Element("methods"))
 		linesNode = etree.SubElement(classNode, "lines")
 
 		for line in self.lines:
-			etree.SubElement(
+			lineNode = etree.SubElement(
 				linesNode,
 				"line",
 				number=str(line),
 				hits=str(self.lines[line]),
 			)
 
+			try:
+				branches, covered = self.branches[line]
+			except KeyError:
+				continue
+
+			# Without branches (e.g. ``(0/0)`` in a read Cobertura file), the coverage is 100 % like in :func:`_getRate`.
+			coverage = f"{covered * 100 // branches if branches > 0 else 100}%"
+			lineNode.attrib["branch"] = "true"
+			lineNode.attrib["condition-coverage"] = f"{coverage} ({covered}/{branches})"
+			conditionsNode = etree.SubElement(lineNode, "conditions")
+			etree.SubElement(conditionsNode, "condition", number="0", type="jump", coverage=coverage)
+
 		return classNode
 
 
@@ -128,12 +280,16 @@ class Package:
 	classes: Dict[str, Class]
 	linesValid: int
 	linesCovered: int
+	branchesValid: int
+	branchesCovered: int
 
 	def __init__(self, name: str):
 		self.name = name
 		self.classes = {}
 		self.linesValid = 0
 		self.linesCovered = 0
+		self.branchesValid = 0
+		self.branchesCovered = 0
 
 	def addClass(self, coberturaClass: Class):
 		if coberturaClass.name in self.classes:
@@ -141,28 +297,49 @@ class Package:
 
 		self.classes[coberturaClass.name] = coberturaClass
 
+	def merge(self, other: "Package", policy: MergePolicy = MergePolicy.Max) -> None:
+		"""
+		Merges the classes of another package into this package in place.
+
+		Statistics are updated incrementally, thus they are correct after merging, if they were correct before (see
+		:meth:`refreshStatistics`).
+
+		:param other:  Package to merge into this package. It isn't modified.
+		:param policy: Policy combining the hit counts of a line contained in both packages.
+		"""
+		for name, otherClass in other.classes.items():
+			try:
+				coberturaClass = self.classes[name]
+			except KeyError:
+				coberturaClass = self.classes[name] = Class(otherClass.name, otherClass.sourceFile)
+
+			before = _getStatistics(coberturaClass)
+			coberturaClass.merge(otherClass, policy)
+			_addStatistics(self, before, _getStatistics(coberturaClass))
+
 	def refreshStatistics(self) -> None:
 		self.linesValid = 0
 		self.linesCovered = 0
+		self.branchesValid = 0
+		self.branchesCovered = 0
 
 		for coberturaClass in self.classes.values():
 			self.linesCovered += coberturaClass.linesCovered
 			self.linesValid += coberturaClass.linesValid
+			self.branchesCovered += coberturaClass.branchesCovered
+			self.branchesValid += coberturaClass.branchesValid
+
+	def _getXmlAttributes(self) -> Dict[str, str]:
+		return {
+			"name": self.name,
+			"complexity": "0",
+			"branch-rate": _getRate(self.branchesCovered, self.branchesValid),
+			"line-rate": _getRate(self.linesCovered, self.linesValid),
+		}
 
 	def getXmlNode(self) -> etree._Element:
 		classesNode = etree.Element("classes")
-		packageNode = etree.Element("package")
-		packageNode.attrib["name"] = self.name
-		packageNode.attrib["complexity"] = "0"
-		packageNode.attrib["branch-rate"] = "0"
-
-		try:
-			rate = self.linesCovered / self.linesValid
-		except ZeroDivisionError:
-			rate = 1.0
-
-		packageNode.attrib["line-rate"] = f"{rate:.16g}"
-
+		packageNode = etree.Element("package", self._getXmlAttributes())
 		packageNode.append(classesNode)
 
 		for coberturaClass in self.classes.values():
@@ -170,6 +347,28 @@ class Package:
 
 		return packageNode
 
+	def writeXml(self, xmlFile, level: int = 0) -> None:
+		"""
+		Writes the package to an incremental XML writer created by :class:`lxml.etree.xmlfile`.
+
+		Only the XML tree of the currently written class is kept in memory.
+
+		:param xmlFile: Incremental XML writer.
+		:param level:   Indentation level of the package element.
+		"""
+		indent = "\n" + "  " * level
+
+		with xmlFile.element("package", self._getXmlAttributes()):
+			xmlFile.write(f"{indent}  ")
+			with xmlFile.element("classes"):
+				for coberturaClass in self.classes.values():
+					classNode = coberturaClass.getXmlNode()
+					etree.indent(classNode, level=level + 2)
+					xmlFile.write(f"{indent}    ")
+					xmlFile.write(classNode)
+				xmlFile.write(f"{indent}  ")
+			xmlFile.write(indent)
+
 
 @export
 class Coverage:
@@ -179,12 +378,16 @@ class Coverage:
 	packages: Dict[str, Package]
 	linesValid: int
 	linesCovered: int
+	branchesValid: int
+	branchesCovered: int
 
 	def __init__(self):
 		self.sources = set()
 		self.packages = {}
 		self.linesValid = 0
 		self.linesCovered = 0
+		self.branchesValid = 0
+		self.branchesCovered = 0
 
 	def addSource(self, source: str) -> None:
 		self.sources.add(source)
@@ -195,50 +398,172 @@ class Coverage:
 
 		self.packages[package.name] = package
 
+	def merge(self, other: "Coverage", policy: MergePolicy = MergePolicy.Max) -> None:
+		"""
+		Merges the sources and packages of another coverage model into this model in place.
+
+		Statistics are updated incrementally, thus they are correct after merging, if they were correct before (see
+		:meth:`refreshStatistics`).
+
+		:param other:  Coverage model to merge into this model. It isn't modified.
+		:param policy: Policy combining the hit counts of a line contained in both models.
+		"""
+		self.sources |= other.sources
+
+		for name, otherPackage in other.packages.items():
+			try:
+				package = self.packages[name]
+			except KeyError:
+				package = self.packages[name] = Package(otherPackage.name)
+
+			before = _getStatistics(package)
+			package.merge(otherPackage, policy)
+			_addStatistics(self, before, _getStatistics(package))
+
 	def refreshStatistics(self) -> None:
 		self.linesValid = 0
 		self.linesCovered = 0
+		self.branchesValid = 0
+		self.branchesCovered = 0
 
 		for package in self.packages.values():
 			package.refreshStatistics()
 			self.linesCovered += package.linesCovered
 			self.linesValid += package.linesValid
+			self.branchesCovered += package.branchesCovered
+			self.branchesValid += package.branchesValid
+
+	@classmethod
+	def read(cls, stream: BinaryIO) -> "Coverage":
+		"""
+		Reads coverage data in Cobertura format (XML) from a binary stream.
+
+		The document is parsed incrementally with :func:`lxml.etree.iterparse`. Each ``<class>`` element is converted when
+		it's completely parsed and is released afterwards, so only the coverage model and the currently parsed class are kept
+		in memory.
+
+		:param stream: Binary file object like a file opened in ``rb`` mode or a :class:`gzip.GzipFile`.
+		:returns:      Coverage model with refreshed statistics.
+		"""
+		coverage = cls()
+		package = None
+
+		for event, node in etree.iterparse(stream, events=("start", "end"), tag=("source", "package", "class")):
+			if event == "start":
+				if node.tag == "package":
+					package = Package(intern(_getAttribute(node, "name")))
+					coverage.addPackage(package)
+				continue
+
+			if node.tag == "class":
+				if package is None:
+					raise CoberturaException(f"Class outside of a package in line {node.sourceline}.")
+				package.addClass(Class.fromXmlNode(node))
+			elif node.tag == "source":
+				coverage.addSource((node.text or "").strip())
+			else:
+				package = None
+
+			# Completed elements are not accessed anymore. Preceding siblings are released, too.
+			node.clear()
+			parent = node.getparent()
+			while node.getprevious() is not None:
+				del parent[0]
+
+		coverage.refreshStatistics()
+		return coverage
 
 	def getXml(self) -> bytes:
-		self.refreshStatistics()
+		buffer = BytesIO()
+		self.writeXml(buffer)
 
-		coverageNode = etree.Element("coverage")
-		coverageNode.attrib["version"] = "5.5"
-		coverageNode.attrib["timestamp"] = str(int(time()))
-		coverageNode.attrib["branches-valid"] = "0"
-		coverageNode.attrib["branches-covered"] = "0"
-		coverageNode.attrib["branch-rate"] = "0"
-		coverageNode.attrib["complexity"] = "0"
+		return buffer.getvalue()
 
-		sourcesNode = etree.Element("sources")
+	def writeXml(self, stream: BinaryIO) -> None:
+		"""
+		Writes the coverage data in Cobertura format (XML) to a binary stream.
 
-		for source in self.sources:
-			etree.SubElement(sourcesNode, "source").text = source
+		The document is generated incrementally with :class:`lxml.etree.xmlfile`, so the output is never materialized as a
+		whole, neither as an XML tree nor as a byte string.
 
-		coverageNode.append(sourcesNode)
-
-		packagesNode = etree.Element("packages")
+		:param stream: Binary file object like a file opened in ``wb`` mode or a :class:`gzip.GzipFile`.
+		"""
+		self.refreshStatistics()
 
+		writer = self.getXmlWriter(stream)
+		next(writer)
 		for package in self.packages.values():
-			packagesNode.append(package.getXmlNode())
-
-		coverageNode.append(packagesNode)
-
-		coverageNode.attrib["lines-valid"] = str(self.linesValid)
-		coverageNode.attrib["lines-covered"] = str(self.linesCovered)
+			writer.send(package)
 
 		try:
-			rate = self.linesCovered / self.linesValid
-		except ZeroDivisionError:
-			rate = 1.0
-
-		coverageNode.attrib["line-rate"] = f"{rate:.16g}"
-
-		return etree.tostring(
-			coverageNode, pretty_print=True, encoding="utf-8", xml_declaration=True
-		)
+			writer.send(None)
+		except StopIteration:
+			pass
+
+	def getXmlWriter(self, stream: BinaryIO) -> Generator[None, Optional[Package], None]:
+		"""
+		Returns a coroutine writing the coverage data in Cobertura format (XML) package by package.
+
+		After the coroutine is started by :func:`next`, packages are written by sending them to the coroutine. Sending
+		``None`` completes the document. Statistics must have been refreshed before (see :meth:`refreshStatistics`).
+
+		:param stream: Binary file object like a file opened in ``wb`` mode or a :class:`gzip.GzipFile`.
+		"""
+		coverageAttributes = {
+			"version": "5.5",
+			"timestamp": str(int(time())),
+			"branches-valid": str(self.branchesValid),
+			"branches-covered": str(self.branchesCovered),
+			"branch-rate": _getRate(self.branchesCovered, self.branchesValid),
+			"complexity": "0",
+			"lines-valid": str(self.linesValid),
+			"lines-covered": str(self.linesCovered),
+			"line-rate": _getRate(self.linesCovered, self.linesValid),
+		}
+
+		with etree.xmlfile(stream, encoding="utf-8") as xmlFile:
+			xmlFile.write_declaration()
+			with xmlFile.element("coverage", coverageAttributes):
+				xmlFile.write("\n  ")
+				with xmlFile.element("sources"):
+					for source in self.sources:
+						xmlFile.write("\n    ")
+						with xmlFile.element("source"):
+							xmlFile.write(source)
+					xmlFile.write("\n  ")
+
+				xmlFile.write("\n  ")
+				with xmlFile.element("packages"):
+					package = yield
+					while package is not None:
+						xmlFile.write("\n    ")
+						package.writeXml(xmlFile, level=2)
+						package = yield
+					xmlFile.write("\n  ")
+				xmlFile.write("\n")
+
+		stream.write(b"\n")
+
+
+@export  # type: ignore[type-var]
+def mergeCoverages(models: Iterable[Coverage], policy: MergePolicy = MergePolicy.Max) -> Coverage:
+	"""
+	Merges multiple coverage models into the first model.
+
+	Models are merged one after another in the calling process. Merging is cheap compared to reading a model, thus
+	passing whole models to worker processes costs more than it saves (see ``tests/benchmark/Merge.py``).
+
+	:param models: Coverage models to merge. The first model is modified.
+	:param policy: Policy combining the hit counts of a line contained in multiple models.
+	:returns:      Merged coverage model with refreshed statistics.
+	"""
+	remaining = iter(models)
+	merged = next(remaining, None)
+	if merged is None:
+		return Coverage()
+
+	merged.refreshStatistics()
+	for model in remaining:
+		merged.merge(model, policy)
+
+	return merged
@@ -0,0 +1,263 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+SQLite database accumulating statement coverage of many UCDB files, e.g. of all tests of a regression.
+
+Each ingested UCDB file only costs the upsert of its own statement bins. Hit counts of the same statement (file, line,
+statement index and instance path) are summed up over all ingested files. Tests are identified by the content hash of
+their UCDB file (see :func:`~pyEDAA.UCIS.Cache.getContentHash`), so each file can be ingested only once, regardless of
+the path it's given by.
+
+The upsert (``ON CONFLICT ... DO UPDATE``) requires SQLite 3.24 or newer.
+"""
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from pyTooling.Decorators import export
+
+from pyEDAA.UCIS.Cobertura import Coverage
+from pyEDAA.UCIS.Profiling import Profiler
+from pyEDAA.UCIS.Store import StatementStore
+from pyEDAA.UCIS.UCDB import Parser
+
+
+#: Minimal SQLite version supporting upserts.
+SQLITE_MIN_VERSION = (3, 24, 0)
+#: Number of names looked up per query. SQLite versions before 3.32 limit the number of parameters to 999.
+SQLITE_LOOKUP_CHUNK_SIZE = 500
+
+DATABASE_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS tests (
+	id       INTEGER PRIMARY KEY,
+	name     TEXT    NOT NULL,
+	hash     TEXT    NOT NULL UNIQUE,
+	ingested TEXT    NOT NULL,
+	bins     INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+	path     TEXT    PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+	id       INTEGER PRIMARY KEY,
+	name     TEXT    NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS instances (
+	id       INTEGER PRIMARY KEY,
+	path     TEXT    NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS statements (
+	file     INTEGER NOT NULL REFERENCES files(id),
+	line     INTEGER NOT NULL,
+	idx      INTEGER NOT NULL,
+	instance INTEGER NOT NULL REFERENCES instances(id),
+	hits     INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS statementKey ON statements (file, line, idx, instance);
+"""
+
+
+@export
+class DatabaseException(Exception):
+	"""Base-class for other coverage database exceptions"""
+
+
+@export
+class CoverageDatabase:
+	"""
+	Accumulates statement coverage in an SQLite database.
+
+	Statement bins are upserted in bulk within one transaction per ingested UCDB file. Rows are keyed by a unique index on
+	file, line, statement index and instance path. The database uses write-ahead logging, so reports can be read while
+	further tests are ingested.
+	"""
+
+	_path: Path
+	_connection: sqlite3.Connection
+
+	def __init__(self, path: Path):
+		"""
+		Opens a coverage database. A new database is created, if the file doesn't exist.
+
+		:param path: Path to the SQLite database file.
+		:raises DatabaseException: If the SQLite library is too old or the database can't be opened.
+		"""
+		if sqlite3.sqlite_version_info < SQLITE_MIN_VERSION:
+			minVersion = ".".join(str(part) for part in SQLITE_MIN_VERSION)
+			raise DatabaseException(f"Coverage databases require SQLite {minVersion} or newer, but SQLite {sqlite3.sqlite_version} is used.")
+
+		self._path = path
+		try:
+			self._connection = sqlite3.connect(str(path))
+			self._connection.execute("PRAGMA journal_mode=WAL")
+			self._connection.execute("PRAGMA synchronous=NORMAL")
+			self._connection.executescript(DATABASE_SCHEMA)
+			testColumns = {column for _, column, *_ in self._connection.execute("PRAGMA table_info(tests)")}
+		except sqlite3.DatabaseError as ex:
+			raise DatabaseException(f"Can't open coverage database '{path}'.") from ex
+
+		if "hash" not in testColumns:
+			self._connection.close()
+			raise DatabaseException(f"Coverage database '{path}' was created by an older version and can't be extended.")
+
+	def __enter__(self) -> "CoverageDatabase":
+		return self
+
+	def __exit__(self, *_) -> None:
+		self.close()
+
+	@property
+	def Path(self) -> Path:
+		return self._path
+
+	def close(self) -> None:
+		self._connection.close()
+
+	def _getIds(self, table: str, column: str, names: List[str]) -> List[int]:
+		"""Returns the IDs of names in a string table. Unknown names are added to the table."""
+		cursor = self._connection.cursor()
+		cursor.executemany(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", ((name,) for name in names))
+
+		ids: Dict[str, int] = {}
+		for start in range(0, len(names), SQLITE_LOOKUP_CHUNK_SIZE):
+			chunk = names[start:start + SQLITE_LOOKUP_CHUNK_SIZE]
+			parameters = ", ".join("?" * len(chunk))
+			ids.update(cursor.execute(f"SELECT {column}, id FROM {table} WHERE {column} IN ({parameters})", chunk))
+
+		return [ids[name] for name in names]
+
+	def ingest(self, name: str, contentHash: str, sources: Iterable[str], statements: StatementStore) -> None:
+		"""
+		Adds the statement coverage of a UCDB file (test) to the database.
+
+		:param name:        Name of the test, e.g. the resolved path of the UCDB file.
+		:param contentHash: Content hash of the UCDB file identifying the test (see :func:`~pyEDAA.UCIS.Cache.getContentHash`).
+		:param sources:     Source directories referenced by the UCDB file.
+		:param statements:  Statement data extracted from the UCDB file.
+		:raises DatabaseException: If a UCDB file of the same content was already ingested, as its hits would be added again.
+		"""
+		with self._connection:
+			ingestedName = self.findTest(contentHash)
+			if ingestedName is not None:
+				raise DatabaseException(f"Test '{name}' was already ingested as '{ingestedName}' into coverage database '{self._path}'.")
+
+			self._connection.executemany("INSERT OR IGNORE INTO sources (path) VALUES (?)", ((source,) for source in sources))
+
+			fileIds = self._getIds("files", "name", statements.files)
+			instanceIds = self._getIds("instances", "path", statements.instances)
+
+			self._connection.executemany(
+				"INSERT INTO statements (file, line, idx, instance, hits) VALUES (?, ?, ?, ?, ?) "
+				"ON CONFLICT (file, line, idx, instance) DO UPDATE SET hits = hits + excluded.hits",
+				(
+					(fileIds[fileId], line, index, instanceIds[instanceId], hits)
+					for fileId, line, index, instanceId, hits in zip(
+						statements.fileColumn, statements.lineColumn, statements.indexColumn, statements.instanceColumn,
+						statements.hitsColumn
+					)
+				)
+			)
+			self._connection.execute(
+				"INSERT INTO tests (name, hash, ingested, bins) VALUES (?, ?, ?, ?)",
+				(name, contentHash, datetime.now(timezone.utc).isoformat(), len(statements))
+			)
+
+	def findTest(self, contentHash: str) -> Optional[str]:
+		"""Returns the name of the test ingested from a UCDB file of this content hash or ``None``."""
+		row = self._connection.execute("SELECT name FROM tests WHERE hash = ?", (contentHash,)).fetchone()
+
+		return None if row is None else row[0]
+
+	def getTests(self) -> List[str]:
+		"""Returns the names of all ingested tests in the order of ingestion."""
+		return [name for name, in self._connection.execute("SELECT name FROM tests ORDER BY id")]
+
+	def getSources(self) -> Set[str]:
+		"""Returns the source directories of all ingested tests."""
+		return {path for path, in self._connection.execute("SELECT path FROM sources")}
+
+	def getStatements(self) -> StatementStore:
+		"""
+		Reads the accumulated statement data.
+
+		:returns: Store containing one row per distinct statement in the order of its first ingestion.
+		"""
+		store = StatementStore()
+		fileIds = {dbId: store.getFileId(name) for dbId, name in self._connection.execute("SELECT id, name FROM files ORDER BY id")}
+		instanceIds = {dbId: store.getInstanceId(path) for dbId, path in self._connection.execute("SELECT id, path FROM instances ORDER BY id")}
+
+		for file, line, index, instance, hits in self._connection.execute(
+			"SELECT file, line, idx, instance, hits FROM statements ORDER BY rowid"
+		):
+			store.append(fileIds[file], line, index, instanceIds[instance], hits)
+
+		return store
+
+
+@export
+class DatabaseParser(Parser):
+	"""Creates a Cobertura model from the statement coverage accumulated in a :class:`CoverageDatabase`."""
+
+	_database: CoverageDatabase
+
+	def __init__(
+		self,
+		database: CoverageDatabase,
+		mergeInstances: bool,
+		hitCounts: bool = False,
+		profiler: Optional[Profiler] = None
+	):
+		"""
+		Initializes a parser for a coverage database.
+
+		:param database:       Coverage database.
+		:param mergeInstances: Merge statement coverage data for all instances of the same design unit.
+		:param hitCounts:      Report the minimum hit count of the line's statements (summed over merged instances) per
+		                       line instead of ``0``/``1``.
+		:param profiler:       Optional profiler recording the processing phases.
+		"""
+		self._mergeInstances = mergeInstances
+		self._hitCounts = hitCounts
+		self._profiler = profiler
+		self._database = database
+
+		self._coverage = Coverage()
+
+		self.statementsCount = 0
+		self.statementsCovered = 0
+
+	def _extractStatements(self) -> StatementStore:
+		with self._profile("database read"):
+			self._coverage.sources |= self._database.getSources()
+
+			return self._database.getStatements()
@@ -0,0 +1,237 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Coverage differences between two runs, e.g. two nightly regressions.
+
+Both inputs are UCDB or Cobertura files. They are read into :class:`~pyEDAA.UCIS.Cobertura.Coverage` models by the
+streaming UCDB parser or the streaming Cobertura reader. No document tree is kept in memory, but both models are kept
+completely, thus memory grows with the number of lines of both runs. The models are compared file by file in sorted
+order of the file names. The lines of each file are compared in sorted order of their line numbers, which costs one
+sorted list of line numbers per file and run at a time.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from lxml import etree
+from pyTooling.Decorators import export
+
+from pyEDAA.UCIS.Cobertura import Class, Coverage
+from pyEDAA.UCIS.UCDB import Parser, openUcdbFile
+
+
+_Key = TypeVar("_Key", str, int)
+_Value = TypeVar("_Value")
+
+
+def _mergeJoin(
+	old: Iterable[Tuple[_Key, _Value]],
+	new: Iterable[Tuple[_Key, _Value]]
+) -> Iterator[Tuple[_Key, Optional[_Value], Optional[_Value]]]:
+	"""
+	Joins two sequences of key-value pairs sorted by unique keys.
+
+	:returns: Keys of both sequences in sorted order with the value of each sequence or ``None``, if the key is missing.
+	"""
+	oldIterator = iter(old)
+	newIterator = iter(new)
+	oldItem = next(oldIterator, None)
+	newItem = next(newIterator, None)
+
+	while oldItem is not None and newItem is not None:
+		if oldItem[0] == newItem[0]:
+			yield oldItem[0], oldItem[1], newItem[1]
+			oldItem = next(oldIterator, None)
+			newItem = next(newIterator, None)
+		elif oldItem[0] < newItem[0]:
+			yield oldItem[0], oldItem[1], None
+			oldItem = next(oldIterator, None)
+		else:
+			yield newItem[0], None, newItem[1]
+			newItem = next(newIterator, None)
+
+	while oldItem is not None:
+		yield oldItem[0], oldItem[1], None
+		oldItem = next(oldIterator, None)
+
+	while newItem is not None:
+		yield newItem[0], None, newItem[1]
+		newItem = next(newIterator, None)
+
+
+def _getFiles(coverage: Coverage) -> List[Tuple[str, Dict[int, int]]]:
+	"""Returns the line hits of all source files sorted by file name. Lines of multiple classes of a file are combined."""
+	files: Dict[str, List[Class]] = {}
+	for package in coverage.packages.values():
+		for coberturaClass in package.classes.values():
+			files.setdefault(coberturaClass.sourceFile, []).append(coberturaClass)
+
+	result = []
+	for file in sorted(files):
+		classes = files[file]
+		if len(classes) == 1:
+			lines = classes[0].lines
+		else:
+			lines = {}
+			for coberturaClass in classes:
+				for line, hits in coberturaClass.lines.items():
+					lines[line] = max(lines.get(line, 0), hits)
+		result.append((file, lines))
+
+	return result
+
+
+@export
+class LineChange:
+	"""Line, whose coverage changed between two runs."""
+
+	file: str
+	line: int
+	oldHits: Optional[int]
+	newHits: Optional[int]
+
+	def __init__(self, file: str, line: int, oldHits: Optional[int], newHits: Optional[int]):
+		"""
+		Initializes a line change.
+
+		:param file:    Source file.
+		:param line:    Line number.
+		:param oldHits: Hits of the line in the old run or ``None``, if the line didn't exist.
+		:param newHits: Hits of the line in the new run or ``None``, if the line doesn't exist anymore.
+		"""
+		self.file = file
+		self.line = line
+		self.oldHits = oldHits
+		self.newHits = newHits
+
+
+@export
+class FileDelta:
+	"""Line coverage of a source file in two runs."""
+
+	file: str
+	oldValid: int
+	oldCovered: int
+	newValid: int
+	newCovered: int
+
+	def __init__(self, file: str):
+		self.file = file
+		self.oldValid = 0
+		self.oldCovered = 0
+		self.newValid = 0
+		self.newCovered = 0
+
+	@property
+	def OldRate(self) -> float:
+		return self.oldCovered / self.oldValid if self.oldValid > 0 else 1.0
+
+	@property
+	def NewRate(self) -> float:
+		return self.newCovered / self.newValid if self.newValid > 0 else 1.0
+
+	@property
+	def IsChanged(self) -> bool:
+		return (self.oldValid, self.oldCovered) != (self.newValid, self.newCovered)
+
+
+@export
+class CoverageDiff:
+	"""Lines which became covered (gained) or uncovered (lost) and per-file coverage of two runs."""
+
+	gained: List[LineChange]
+	lost: List[LineChange]
+	files: List[FileDelta]
+
+	def __init__(self, old: Coverage, new: Coverage):
+		"""
+		Compares two coverage models.
+
+		A line is gained, if it's covered in the new run, but wasn't covered (or didn't exist) in the old run. A line is
+		lost, if it was covered in the old run, but isn't covered (or doesn't exist) in the new run.
+
+		:param old: Coverage model of the old run.
+		:param new: Coverage model of the new run.
+		"""
+		self.gained = []
+		self.lost = []
+		self.files = []
+
+		for file, oldLines, newLines in _mergeJoin(_getFiles(old), _getFiles(new)):
+			delta = FileDelta(file)
+			self.files.append(delta)
+
+			oldItems = ((line, oldLines[line]) for line in sorted(oldLines)) if oldLines is not None else ()
+			newItems = ((line, newLines[line]) for line in sorted(newLines)) if newLines is not None else ()
+			for line, oldHits, newHits in _mergeJoin(oldItems, newItems):
+				oldCovered = oldHits is not None and oldHits > 0
+				newCovered = newHits is not None and newHits > 0
+
+				if oldHits is not None:
+					delta.oldValid += 1
+					delta.oldCovered += oldCovered
+				if newHits is not None:
+					delta.newValid += 1
+					delta.newCovered += newCovered
+
+				if newCovered and not oldCovered:
+					self.gained.append(LineChange(file, line, oldHits, newHits))
+				elif oldCovered and not newCovered:
+					self.lost.append(LineChange(file, line, oldHits, newHits))
+
+
+@export  # type: ignore[type-var]
+def isCoberturaFile(path: Path) -> bool:
+	"""Returns true, if the (optionally compressed) XML file's root element is a Cobertura ``coverage`` element."""
+	with openUcdbFile(path) as file:
+		for _, node in etree.iterparse(file, events=("start", )):
+			return etree.QName(node).localname == "coverage"
+
+	return False
+
+
+@export  # type: ignore[type-var]
+def readCoverage(path: Path, mergeInstances: bool = False) -> Coverage:
+	"""
+	Reads a UCDB or Cobertura file into a coverage model without keeping a document tree in memory.
+
+	:param path:           Path to a UCDB or Cobertura file, optionally compressed.
+	:param mergeInstances: Merge statement coverage data for all instances of the same design unit (UCDB files only).
+	:returns:              Coverage model with refreshed statistics.
+	"""
+	if isCoberturaFile(path):
+		with openUcdbFile(path) as file:
+			return Coverage.read(file)
+
+	coverage = Parser(path, mergeInstances, streaming=True).getCoberturaModel()
+	coverage.refreshStatistics()
+
+	return coverage
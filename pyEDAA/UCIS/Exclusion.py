@@ -0,0 +1,331 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Exclusion rules read from a rule file and applied to each bin while parsing.
+
+A rule file contains one rule per line. Empty lines and text after ``#`` are ignored.
+
+.. code-block:: none
+
+   # Exclude all bins of a source file.
+   file    */tb/*.vhdl
+   # Exclude all bins within an instance (and its sub-instances).
+   instance top.dut.debug
+   # Exclude bins of single lines or line ranges of a source file.
+   lines   */alu.vhdl 10-20 42
+
+Rules are compiled once: file patterns into a single regular expression per rule, instance paths into a prefix trie
+and line ranges into sorted lists of disjoint intervals per source file. Lookups are cached per source file name and
+per instance path.
+"""
+import re
+from bisect import bisect_right
+from fnmatch import translate
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from pyTooling.Decorators import export
+
+
+@export
+class ExclusionException(Exception):
+	"""Raised if a rule file contains an invalid rule."""
+
+
+@export
+class ExclusionRule:
+	"""
+	A single exclusion rule.
+
+	Each rule counts the bins it excluded. If several rules match a bin, the bin is only counted for the rule taking
+	precedence (see :meth:`ExclusionRules.match`).
+	"""
+
+	kind: str
+	pattern: str
+	lineRanges: List[Tuple[int, int]]
+	lineNumber: int
+	count: int
+
+	def __init__(self, kind: str, pattern: str, lineRanges: Iterable[Tuple[int, int]] = (), lineNumber: int = 0):
+		"""
+		Initializes an exclusion rule.
+
+		:param kind:       Kind of rule: ``file``, ``instance`` or ``lines``.
+		:param pattern:    Glob pattern of source files (``file`` and ``lines`` rules) or instance path prefix.
+		:param lineRanges: Inclusive line ranges of ``lines`` rules.
+		:param lineNumber: Line number of the rule in its rule file.
+		"""
+		self.kind = kind
+		self.pattern = pattern
+		self.lineRanges = list(lineRanges)
+		self.lineNumber = lineNumber
+		self.count = 0
+
+	def __str__(self) -> str:
+		ranges = "".join(f" {start}" if start == end else f" {start}-{end}" for start, end in self.lineRanges)
+		return f"{self.kind} {self.pattern}{ranges}"
+
+
+def _parseRange(text: str) -> Tuple[int, int]:
+	startText, _, endText = text.partition("-")
+	start = int(startText)
+	end = int(endText) if endText != "" else start
+	if start < 1 or end < start:
+		raise ValueError(f"Invalid line range '{text}'.")
+
+	return start, end
+
+
+def _addIntervals(intervals: List[Tuple[int, int, ExclusionRule]], rule: ExclusionRule) -> None:
+	"""Adds the line ranges of a rule, which aren't covered by intervals of preceding rules yet."""
+	for start, end in rule.lineRanges:
+		pieces = [(start, end)]
+		for first, last, _ in intervals:
+			pieces = [
+				piece
+				for pieceStart, pieceEnd in pieces
+				for piece in ((pieceStart, min(pieceEnd, first - 1)), (max(pieceStart, last + 1), pieceEnd))
+				if piece[0] <= piece[1]
+			]
+		intervals.extend((pieceStart, pieceEnd, rule) for pieceStart, pieceEnd in pieces)
+
+
+@export
+class ExclusionRules:
+	"""
+	Compiled set of exclusion rules.
+
+	Per bin, the source file is looked up in a cache, the line in a sorted list of disjoint intervals of this file
+	(:func:`~bisect.bisect_right`), and the instance path in a cache or otherwise by walking the prefix trie once along
+	the components of the path. Thus, the costs per bin are linear in the length of its instance path.
+
+	Hit counts of rules aren't pickled. Worker processes return their counts (see :attr:`Counts`), which are added to
+	the rules of the parent process with :meth:`addCounts`.
+	"""
+
+	rules: List[ExclusionRule]
+	_fileRules: List[Tuple[Pattern, ExclusionRule]]
+	_lineRules: List[Tuple[Pattern, ExclusionRule]]
+	_instanceTrie: Dict[Optional[str], Any]
+	_files: Dict[str, Tuple[Optional[ExclusionRule], Optional[Tuple[List[int], List[Tuple[int, ExclusionRule]]]]]]
+	_instances: Dict[str, Optional[ExclusionRule]]
+
+	def __init__(self, rules: Iterable[ExclusionRule]):
+		"""
+		Initializes and compiles a set of exclusion rules.
+
+		:param rules: Exclusion rules in order of precedence within each kind.
+		"""
+		self.rules = list(rules)
+		self._compile()
+
+	def _compile(self) -> None:
+		self._fileRules = []
+		self._lineRules = []
+		self._instanceTrie = {}
+		self._files = {}
+		self._instances = {}
+
+		for rule in self.rules:
+			if rule.kind == "file":
+				self._fileRules.append((re.compile(translate(rule.pattern)), rule))
+			elif rule.kind == "lines":
+				self._lineRules.append((re.compile(translate(rule.pattern)), rule))
+			elif rule.kind == "instance":
+				node = self._instanceTrie
+				for component in rule.pattern.split("."):
+					node = node.setdefault(component, {})
+				# The key ``None`` marks the end of a prefix. The first rule of the same prefix takes precedence.
+				node.setdefault(None, rule)
+			else:
+				raise ExclusionException(f"Unknown kind of exclusion rule '{rule.kind}'.")
+
+	def __getstate__(self):
+		return [(rule.kind, rule.pattern, rule.lineRanges, rule.lineNumber) for rule in self.rules]
+
+	def __setstate__(self, state) -> None:
+		self.rules = [ExclusionRule(*fields) for fields in state]
+		self._compile()
+
+	@classmethod
+	def parse(cls, lines: Iterable[str], source: str = "<rules>") -> "ExclusionRules":
+		"""
+		Parses exclusion rules.
+
+		:param lines:  Lines of a rule file.
+		:param source: Name of the rule file used in error messages.
+		:returns:      Compiled exclusion rules.
+		:raises ExclusionException: If a rule is invalid.
+		"""
+		rules = []
+		for lineNumber, line in enumerate(lines, start=1):
+			fields = line.split("#", 1)[0].split()
+			if len(fields) == 0:
+				continue
+
+			kind = fields[0]
+			if kind in ("file", "instance") and len(fields) == 2:
+				rules.append(ExclusionRule(kind, fields[1], lineNumber=lineNumber))
+			elif kind == "lines" and len(fields) >= 3:
+				ranges = []
+				for field in fields[2:]:
+					try:
+						ranges.append(_parseRange(field))
+					except ValueError:
+						raise ExclusionException(f"{source}:{lineNumber}: Invalid line range '{field}'.") from None
+				rules.append(ExclusionRule(kind, fields[1], ranges, lineNumber))
+			elif kind in ("file", "instance", "lines"):
+				raise ExclusionException(f"{source}:{lineNumber}: Wrong number of arguments for rule '{kind}'.")
+			else:
+				raise ExclusionException(f"{source}:{lineNumber}: Unknown kind of exclusion rule '{kind}'.")
+
+		return cls(rules)
+
+	@classmethod
+	def read(cls, path: Path) -> "ExclusionRules":
+		"""
+		Reads exclusion rules from a rule file.
+
+		:param path: Path to the rule file.
+		:returns:    Compiled exclusion rules.
+		:raises ExclusionException: If a rule is invalid.
+		"""
+		with path.open("r", encoding="utf-8") as file:
+			return cls.parse(file, str(path))
+
+	@property
+	def Counts(self) -> List[int]:
+		"""Numbers of excluded bins per rule."""
+		return [rule.count for rule in self.rules]
+
+	@property
+	def ExcludedCount(self) -> int:
+		"""Total number of bins excluded by all rules."""
+		return sum(rule.count for rule in self.rules)
+
+	def addCounts(self, counts: Iterable[int]) -> None:
+		"""
+		Adds numbers of excluded bins per rule, e.g. returned by a worker process.
+
+		:param counts: Numbers of excluded bins in the order of :attr:`rules`.
+		"""
+		for rule, count in zip(self.rules, counts):
+			rule.count += count
+
+	def _getFile(self, file: str) -> Tuple[Optional[ExclusionRule], Optional[Tuple[List[int], List[Tuple[int, ExclusionRule]]]]]:
+		"""Returns the first matching file rule and the line intervals of a source file."""
+		try:
+			return self._files[file]
+		except KeyError:
+			pass
+
+		fileRule = None
+		for pattern, rule in self._fileRules:
+			if pattern.match(file) is not None:
+				fileRule = rule
+				break
+
+		intervals: List[Tuple[int, int, ExclusionRule]] = []
+		for pattern, rule in self._lineRules:
+			if pattern.match(file) is not None:
+				_addIntervals(intervals, rule)
+		intervals.sort(key=lambda interval: interval[0])
+
+		lines = ([start for start, _, _ in intervals], [(end, rule) for _, end, rule in intervals]) if len(intervals) > 0 else None
+		result = self._files[file] = fileRule, lines
+		return result
+
+	def _getInstance(self, instancePath: str) -> Optional[ExclusionRule]:
+		"""Returns the instance rule of the shortest matching prefix of an instance path."""
+		try:
+			return self._instances[instancePath]
+		except KeyError:
+			pass
+
+		rule = None
+		node = self._instanceTrie
+		for component in instancePath.split("."):
+			child = node.get(component)
+			if child is None:
+				break
+			node = child
+			rule = node.get(None)
+			if rule is not None:
+				break
+
+		self._instances[instancePath] = rule
+		return rule
+
+	def match(self, file: str, line: int, instancePath: str) -> Optional[ExclusionRule]:
+		"""
+		Returns the rule excluding a bin or ``None``.
+
+		File rules take precedence over line rules, which take precedence over instance rules.
+
+		:param file:         Source file of the bin.
+		:param line:         Line of the bin.
+		:param instancePath: Hierarchical path of the scope containing the bin.
+		:returns:            The first matching rule.
+		"""
+		fileRule, lines = self._getFile(file)
+		if fileRule is not None:
+			return fileRule
+
+		if lines is not None:
+			starts, ends = lines
+			index = bisect_right(starts, line) - 1
+			if index >= 0:
+				end, rule = ends[index]
+				if line <= end:
+					return rule
+
+		if len(self._instanceTrie) > 0:
+			return self._getInstance(instancePath)
+
+		return None
+
+	def exclude(self, file: str, line: int, instancePath: str) -> bool:
+		"""
+		Returns true, if a bin is excluded by a rule. The number of excluded bins of the matching rule is incremented.
+
+		:param file:         Source file of the bin.
+		:param line:         Line of the bin.
+		:param instancePath: Hierarchical path of the scope containing the bin.
+		:returns:            True, if the bin is excluded.
+		"""
+		rule = self.match(file, line, instancePath)
+		if rule is None:
+			return False
+
+		rule.count += 1
+		return True
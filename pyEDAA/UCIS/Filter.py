@@ -0,0 +1,121 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Include and exclude filters for source files and instance paths.
+
+Filters are applied while parsing a UCDB file, so bins of filtered files and instances are never extracted.
+"""
+import re
+from fnmatch import translate
+from typing import Dict, Iterable, Optional, Pattern
+
+from pyTooling.Decorators import export
+
+
+def _compile(patterns: Iterable[str]) -> Optional[Pattern]:
+	"""Compiles glob patterns into a single regular expression. If no pattern is given, ``None`` is returned."""
+	patterns = list(patterns)
+	if len(patterns) == 0:
+		return None
+
+	return re.compile("|".join(f"(?:{translate(pattern)})" for pattern in patterns))
+
+
+@export
+class PathFilter:
+	"""
+	Filters source files and instance paths by glob patterns.
+
+	Patterns are matched with :mod:`fnmatch` semantics, thus ``*`` also matches ``/`` in file names and ``.`` in instance
+	paths. All patterns of a kind are compiled into one regular expression.
+
+	A file is included, if it matches any include pattern (or no include patterns are given) and no exclude pattern. An
+	instance is included, if it or any of its parent instances matches an include pattern (or no include patterns are
+	given). If an instance matches an exclude pattern, its whole subtree is excluded.
+	"""
+
+	_includeFiles: Optional[Pattern]
+	_excludeFiles: Optional[Pattern]
+	_includeInstances: Optional[Pattern]
+	_excludeInstances: Optional[Pattern]
+	_files: Dict[str, bool]
+
+	def __init__(
+		self,
+		includeFiles: Iterable[str] = (),
+		excludeFiles: Iterable[str] = (),
+		includeInstances: Iterable[str] = (),
+		excludeInstances: Iterable[str] = ()
+	):
+		"""
+		Initializes a path filter.
+
+		:param includeFiles:     Glob patterns of source files to include.
+		:param excludeFiles:     Glob patterns of source files to exclude.
+		:param includeInstances: Glob patterns of instance paths (e.g. ``top.dut*``) to include.
+		:param excludeInstances: Glob patterns of instance paths to exclude.
+		"""
+		self._includeFiles = _compile(includeFiles)
+		self._excludeFiles = _compile(excludeFiles)
+		self._includeInstances = _compile(includeInstances)
+		self._excludeInstances = _compile(excludeInstances)
+		self._files = {}
+
+	def __getstate__(self):
+		return self._includeFiles, self._excludeFiles, self._includeInstances, self._excludeInstances
+
+	def __setstate__(self, state) -> None:
+		self._includeFiles, self._excludeFiles, self._includeInstances, self._excludeInstances = state
+		self._files = {}
+
+	@property
+	def FiltersInstances(self) -> bool:
+		return self._includeInstances is not None or self._excludeInstances is not None
+
+	def isFileIncluded(self, file: str) -> bool:
+		"""Returns true, if a source file is included. Results are cached per file name."""
+		try:
+			return self._files[file]
+		except KeyError:
+			included = self._files[file] = (
+				(self._includeFiles is None or self._includeFiles.match(file) is not None) and
+				(self._excludeFiles is None or self._excludeFiles.match(file) is None)
+			)
+			return included
+
+	def isInstanceIncluded(self, instancePath: str) -> bool:
+		"""Returns true, if an instance path matches an include pattern or no include patterns are given."""
+		return self._includeInstances is None or self._includeInstances.match(instancePath) is not None
+
+	def isInstanceExcluded(self, instancePath: str) -> bool:
+		"""Returns true, if an instance path matches an exclude pattern."""
+		return self._excludeInstances is not None and self._excludeInstances.match(instancePath) is not None
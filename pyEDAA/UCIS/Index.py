@@ -0,0 +1,458 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Byte-offset index of the scopes in a UCDB file for random access to single instances.
+
+The index records the byte range, name and type of each top-level scope and of each instance scope (and of all scopes
+enclosing an instance, like generate blocks). It's stored as a small sidecar file next to the UCDB file. To extract the
+coverage of a single instance, only the byte range of that instance is read and parsed.
+"""
+import heapq
+import json
+import mmap
+import re
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import quoteattr, unescape
+
+from pyTooling.Decorators import export
+
+from pyEDAA.UCIS.UCDB import BZIP2_MAGIC, GZIP_MAGIC, XZ_MAGIC, ZSTD_MAGIC, UcdbParserException
+
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+
+_ROOT_PATTERN = re.compile(rb"""<(?![?!])([\w.:-]+)(?:[^>"']|"[^"]*"|'[^']*')*>""")
+_SCOPE_PATTERN = re.compile(rb"<(/?)((?:[\w.-]+:)?)scope(?=[\s/>])")
+_TAG_END_PATTERN = re.compile(rb"""(?:[^>"']|"[^"]*"|'[^']*')*>""")
+_ATTRIBUTE_PATTERN = re.compile(rb"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_ENTITIES = {"&quot;": '"', "&apos;": "'"}
+
+
+@export
+class IndexException(UcdbParserException):
+	"""Raised when a scope index can't be built, read or queried"""
+
+
+@export
+class ScopeIndexEntry:
+	"""Byte range and attributes of an indexed scope."""
+
+	name: str
+	type: str
+	designUnit: Optional[str]
+	start: int
+	end: int
+	parent: Optional[int]
+	path: str
+
+	def __init__(self, name: str, type: str, designUnit: Optional[str], start: int, end: int, parent: Optional[int], path: str):
+		"""
+		Initializes an index entry.
+
+		:param name:       Name of the scope.
+		:param type:       Type of the scope, e.g. ``INSTANCE``.
+		:param designUnit: Design unit of an instance scope (``du`` attribute).
+		:param start:      Byte offset of the scope's start tag.
+		:param end:        Byte offset after the scope's end tag.
+		:param parent:     Position of the enclosing scope's entry or ``None`` for top-level scopes.
+		:param path:       Hierarchical path of the scope.
+		"""
+		self.name = name
+		self.type = type
+		self.designUnit = designUnit
+		self.start = start
+		self.end = end
+		self.parent = parent
+		self.path = path
+
+
+@export
+class Fragment:
+	"""
+	Byte ranges of a UCDB file, which form a well-formed UCDB document together with a prefix and a suffix.
+
+	Fragments are small and picklable, so they can be sent to worker processes, which read the byte ranges themselves.
+	"""
+
+	prefix: bytes
+	ranges: List[Tuple[int, int]]
+	suffix: bytes
+
+	def __init__(self, prefix: bytes, ranges: List[Tuple[int, int]], suffix: bytes):
+		"""
+		Initializes a fragment.
+
+		:param prefix: Start tags of the root element and of all enclosing scopes.
+		:param ranges: Byte ranges (start and end offset) of the UCDB file in document order.
+		:param suffix: End tags of all enclosing scopes and of the root element.
+		"""
+		self.prefix = prefix
+		self.ranges = ranges
+		self.suffix = suffix
+
+	@property
+	def Size(self) -> int:
+		return sum(end - start for start, end in self.ranges)
+
+	def read(self, ucdbFile: Path) -> BinaryIO:
+		"""Reads the fragment from a UCDB file and returns it as binary stream."""
+		document = BytesIO()
+		document.write(self.prefix)
+		with ucdbFile.open("rb") as file:
+			for start, end in self.ranges:
+				file.seek(start)
+				document.write(file.read(end - start))
+		document.write(self.suffix)
+		document.seek(0)
+
+		return document
+
+
+@export
+class ScopeIndex:
+	"""
+	Index of the top-level and instance scopes of an uncompressed UCDB file.
+
+	The index is built by scanning the raw bytes of the file for ``scope`` tags, without parsing the XML document. Compressed
+	UCDB files can't be indexed, because their content can't be accessed at arbitrary offsets.
+	"""
+
+	ucdbFile: Path
+	rootTag: str
+	entries: List[ScopeIndexEntry]
+	_paths: Dict[str, ScopeIndexEntry]
+
+	def __init__(self, ucdbFile: Path, rootTag: str, entries: List[ScopeIndexEntry]):
+		"""
+		Initializes an index.
+
+		:param ucdbFile: Path to the indexed UCDB file.
+		:param rootTag:  Start tag of the document's root element including its namespace declarations.
+		:param entries:  Index entries. Parents precede their children.
+		"""
+		self.ucdbFile = ucdbFile
+		self.rootTag = rootTag
+		self.entries = entries
+		self._paths = {}
+		for entry in entries:
+			self._paths.setdefault(entry.path, entry)
+
+	@staticmethod
+	def getIndexPath(ucdbFile: Path) -> Path:
+		"""Returns the path of the sidecar index file of a UCDB file."""
+		return ucdbFile.with_name(ucdbFile.name + INDEX_SUFFIX)
+
+	@classmethod
+	def build(cls, ucdbFile: Path) -> "ScopeIndex":
+		"""
+		Builds the index of a UCDB file by scanning it for ``scope`` tags.
+
+		:param ucdbFile: Path to an uncompressed UCDB file.
+		:returns:        Index of the UCDB file.
+		:raises IndexException: If the file is compressed or the scope tags are unbalanced.
+		"""
+		with ucdbFile.open("rb") as file:
+			magic = file.read(len(XZ_MAGIC))
+			if magic.startswith((GZIP_MAGIC, BZIP2_MAGIC, XZ_MAGIC, ZSTD_MAGIC)):
+				raise IndexException(f"Compressed UCDB file '{ucdbFile}' can't be indexed.")
+
+			with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+				root = _ROOT_PATTERN.search(data)
+				if root is None:
+					raise IndexException(f"UCDB file '{ucdbFile}' has no root element.")
+
+				rootTag = bytes(data[root.start():root.end()]).decode("utf-8")
+				entries = cls._scan(data, root.end())
+
+		return cls(ucdbFile, rootTag, entries)
+
+	@staticmethod
+	def _scan(data: mmap.mmap, start: int) -> List[ScopeIndexEntry]:
+		"""
+		Scans the scope tags of a document.
+
+		Each open scope is tracked in a stack. A scope is added to the index, if it's a top-level scope or an instance scope
+		(has a ``du`` attribute). Then all not yet indexed enclosing scopes are added, too.
+		"""
+		entries: List[ScopeIndexEntry] = []
+		stack: List[List] = []  # [entry, path, start, name, type, designUnit]
+
+		def addEntry(frame: List, parent: Optional[int]) -> int:
+			frame[0] = len(entries)
+			entries.append(ScopeIndexEntry(frame[3], frame[4], frame[5], frame[2], -1, parent, frame[1]))
+			return frame[0]
+
+		for match in _SCOPE_PATTERN.finditer(data, start):
+			if match.group(1):
+				if len(stack) == 0:
+					raise IndexException(f"Unbalanced end tag of a scope at byte {match.start()}.")
+
+				frame = stack.pop()
+				if frame[0] is not None:
+					entries[frame[0]].end = data.find(b">", match.end()) + 1
+				continue
+
+			tag = _TAG_END_PATTERN.match(data, match.end())
+			if tag is None:
+				raise IndexException(f"Unterminated start tag of a scope at byte {match.start()}.")
+
+			tagEnd = tag.end() - 1
+			attributes = {}
+			for attribute in _ATTRIBUTE_PATTERN.finditer(data[match.end():tagEnd]):
+				value = attribute.group(2) if attribute.group(2) is not None else attribute.group(3)
+				attributes[attribute.group(1).decode("utf-8")] = unescape(value.decode("utf-8"), _ENTITIES)
+
+			name = attributes.get("name", "")
+			path = f"{stack[-1][1]}.{name}" if len(stack) > 0 else name
+			frame = [None, path, match.start(), name, attributes.get("type", ""), attributes.get("du")]
+
+			if len(stack) == 0 or frame[5] is not None:
+				# Add not yet indexed enclosing scopes from the outermost one.
+				parent = None
+				for ancestor in stack:
+					parent = ancestor[0] if ancestor[0] is not None else addEntry(ancestor, parent)
+				addEntry(frame, parent)
+
+			if data[tagEnd - 1:tagEnd] == b"/":
+				if frame[0] is not None:
+					entries[frame[0]].end = tagEnd + 1
+			else:
+				stack.append(frame)
+
+		if len(stack) > 0:
+			raise IndexException(f"Unbalanced start tag of scope '{stack[-1][1]}'.")
+
+		return entries
+
+	def write(self, indexFile: Optional[Path] = None) -> None:
+		"""
+		Writes the index as JSON sidecar file.
+
+		The size and modification time of the UCDB file are recorded to detect stale indexes.
+
+		:param indexFile: Path of the index file. By default, the sidecar path of the UCDB file.
+		:raises IndexException: If the index file can't be written, e.g. in a read-only directory.
+		"""
+		status = self.ucdbFile.stat()
+		content = {
+			"version": INDEX_VERSION,
+			"size": status.st_size,
+			"mtime": status.st_mtime_ns,
+			"root": self.rootTag,
+			"entries": [[e.name, e.type, e.designUnit, e.start, e.end, e.parent] for e in self.entries],
+		}
+
+		indexFile = self.getIndexPath(self.ucdbFile) if indexFile is None else indexFile
+		try:
+			with indexFile.open("w", encoding="utf-8") as file:
+				json.dump(content, file, separators=(",", ":"))
+		except OSError as ex:
+			raise IndexException(f"Index file '{indexFile}' can't be written: {ex.strerror}") from ex
+
+	@classmethod
+	def read(cls, ucdbFile: Path, indexFile: Optional[Path] = None) -> Optional["ScopeIndex"]:
+		"""
+		Reads the sidecar index file of a UCDB file.
+
+		:param ucdbFile:  Path to the UCDB file.
+		:param indexFile: Path of the index file. By default, the sidecar path of the UCDB file.
+		:returns:         The index or ``None``, if the index file doesn't exist, is stale or malformed.
+		"""
+		indexFile = cls.getIndexPath(ucdbFile) if indexFile is None else indexFile
+		try:
+			with indexFile.open("r", encoding="utf-8") as file:
+				content = json.load(file)
+		except (OSError, ValueError):
+			return None
+
+		status = ucdbFile.stat()
+		if not isinstance(content, dict) or content.get("version") != INDEX_VERSION or \
+			content.get("size") != status.st_size or content.get("mtime") != status.st_mtime_ns:
+			return None
+
+		entries: List[ScopeIndexEntry] = []
+		try:
+			for name, type, designUnit, start, end, parent in content["entries"]:
+				path = name if parent is None else f"{entries[parent].path}.{name}"
+				entries.append(ScopeIndexEntry(name, type, designUnit, start, end, parent, path))
+
+			return cls(ucdbFile, content["root"], entries)
+		except (KeyError, IndexError, TypeError, ValueError):
+			return None
+
+	@classmethod
+	def load(cls, ucdbFile: Path, indexFile: Optional[Path] = None) -> "ScopeIndex":
+		"""
+		Reads the sidecar index file of a UCDB file. If it doesn't exist or is stale, the index is built and written. If the
+		index file can't be written (e.g. in a read-only directory), the built index is used without a sidecar file.
+
+		:param ucdbFile:  Path to the UCDB file.
+		:param indexFile: Path of the index file. By default, the sidecar path of the UCDB file.
+		:returns:         The index.
+		"""
+		index = cls.read(ucdbFile, indexFile)
+		if index is None:
+			index = cls.build(ucdbFile)
+			try:
+				index.write(indexFile)
+			except IndexException:
+				pass
+
+		return index
+
+	def getEntry(self, path: str) -> ScopeIndexEntry:
+		"""
+		Returns the index entry of a scope.
+
+		:param path: Hierarchical path of the scope, e.g. ``top.dut.u_core``.
+		:raises IndexException: If the scope isn't indexed.
+		"""
+		try:
+			return self._paths[path]
+		except KeyError:
+			raise IndexException(f"Instance '{path}' not found in index of '{self.ucdbFile}'.") from None
+
+	def getInstances(self) -> List[str]:
+		"""Returns the paths of all indexed instances in document order."""
+		return [entry.path for entry in self.entries if entry.designUnit is not None]
+
+	def _getFragment(self, position: int, excluded: Iterable[int] = ()) -> Fragment:
+		"""
+		Returns the fragment of an indexed scope.
+
+		The scope is enclosed in the document's root element and in start and end tags of all enclosing scopes, so
+		hierarchical paths within the fragment are the same as in the whole UCDB file.
+
+		:param position: Position of the scope's index entry.
+		:param excluded: Positions of index entries of direct or indirect child scopes, which are cut out of the fragment.
+		"""
+		entry = self.entries[position]
+
+		ancestors: List[ScopeIndexEntry] = []
+		parent = entry.parent
+		while parent is not None:
+			ancestors.insert(0, self.entries[parent])
+			parent = self.entries[parent].parent
+
+		root = _ROOT_PATTERN.match(self.rootTag.encode("utf-8"))
+		if root is None:
+			raise IndexException(f"Invalid root tag '{self.rootTag}' in index.")
+
+		rootName = root.group(1).decode("utf-8")
+		namespacePrefix = rootName.rpartition(":")[0]
+		scopeTag = f"{namespacePrefix}:scope" if namespacePrefix else "scope"
+
+		prefix = self.rootTag
+		for ancestor in ancestors:
+			attributes = f"name={quoteattr(ancestor.name)} type={quoteattr(ancestor.type)}"
+			if ancestor.designUnit is not None:
+				attributes += f" du={quoteattr(ancestor.designUnit)}"
+			prefix += f"<{scopeTag} {attributes}>"
+		suffix = f"</{scopeTag}>" * len(ancestors) + f"</{rootName}>"
+
+		# Child scopes are complete elements, thus the remaining byte ranges are still balanced.
+		ranges = []
+		start = entry.start
+		for child in sorted((self.entries[child] for child in excluded), key=lambda child: child.start):
+			ranges.append((start, child.start))
+			start = child.end
+		ranges.append((start, entry.end))
+
+		return Fragment(prefix.encode("utf-8"), ranges, suffix.encode("utf-8"))
+
+	def openFragment(self, path: str) -> BinaryIO:
+		"""
+		Reads the byte range of a scope and wraps it into a well-formed UCDB document.
+
+		The fragment is enclosed in the document's root element and in start and end tags of all enclosing scopes, so
+		hierarchical paths within the fragment are the same as in the whole UCDB file.
+
+		:param path: Hierarchical path of the scope, e.g. ``top.dut.u_core``.
+		:returns:    Binary stream of the fragment document, which can be passed to :class:`~pyEDAA.UCIS.UCDB.Parser`.
+		"""
+		entry = self.getEntry(path)
+
+		return self._getFragment(self.entries.index(entry)).read(self.ucdbFile)
+
+	def getShards(self, count: int) -> List[List[Fragment]]:
+		"""
+		Splits the document into shards of similar size, each consisting of independent fragments.
+
+		Initially, each top-level scope (except design units, which contain no extracted bins) is one fragment. The largest
+		fragment is split into its indexed child scopes and a remainder, which contains the scope without these children,
+		until all fragments are smaller than the total size divided by ``count`` or no fragment can be split anymore.
+		Finally, consecutive small fragments are grouped into shards up to that size.
+
+		:param count: Targeted number of shards.
+		:returns:     Shards in document order of their scopes.
+		"""
+		children: Dict[Optional[int], List[int]] = {}
+		for position, entry in enumerate(self.entries):
+			children.setdefault(entry.parent, []).append(position)
+
+		def size(position: int) -> int:
+			return self.entries[position].end - self.entries[position].start
+
+		topLevel = [position for position in children.get(None, []) if not self.entries[position].type.startswith("DU_")]
+		targetSize = sum(size(position) for position in topLevel) // max(1, count)
+
+		# Heap of splittable fragments ordered by descending size. Remainders of split scopes are final.
+		heap = [(-size(position), position) for position in topLevel]
+		heapq.heapify(heap)
+		pieces: List[Tuple[int, List[int]]] = []
+
+		while len(heap) > 0:
+			negativeSize, position = heapq.heappop(heap)
+			if -negativeSize <= targetSize or position not in children:
+				pieces.append((position, []))
+				continue
+
+			pieces.append((position, children[position]))
+			for child in children[position]:
+				heapq.heappush(heap, (-size(child), child))
+
+		pieces.sort(key=lambda piece: self.entries[piece[0]].start)
+
+		shards: List[List[Fragment]] = []
+		shardSize = targetSize
+		for position, excluded in pieces:
+			fragment = self._getFragment(position, excluded)
+			if shardSize + fragment.Size > targetSize:
+				shards.append([])
+				shardSize = 0
+			shards[-1].append(fragment)
+			shardSize += fragment.Size
+
+		return shards
@@ -0,0 +1,174 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Instrumentation of the processing phases of a conversion.
+
+A :class:`Profiler` records wall time, CPU time and peak traced memory per phase (e.g. parsing, statement extraction,
+aggregation and serialization) as well as counters like the number of processed scopes and bins.
+"""
+import json
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from time import perf_counter, process_time
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from pyTooling.Decorators import export
+
+try:
+	import resource
+except ImportError:  # pragma: no cover
+	resource = None  # type: ignore[assignment]  # Not available on Windows.
+
+
+@export
+class Phase:
+	"""Measurements of a single processing phase."""
+
+	name: str
+	wallTime: float
+	cpuTime: float
+	peakMemory: Optional[int]
+	maxRSS: Optional[int]
+
+	def __init__(self, name: str, wallTime: float, cpuTime: float, peakMemory: Optional[int], maxRSS: Optional[int]):
+		"""
+		Initializes the measurements of a phase.
+
+		:param name:       Name of the phase.
+		:param wallTime:   Elapsed wall-clock time in seconds.
+		:param cpuTime:    CPU time of the process in seconds.
+		:param peakMemory: Peak memory in bytes allocated by Python during this phase, if memory was traced.
+		:param maxRSS:     Maximum resident set size in bytes of the process at the end of this phase, if available.
+		"""
+		self.name = name
+		self.wallTime = wallTime
+		self.cpuTime = cpuTime
+		self.peakMemory = peakMemory
+		self.maxRSS = maxRSS
+
+	def toDict(self) -> Dict:
+		return {
+			"name": self.name, "wallTime": self.wallTime, "cpuTime": self.cpuTime, "peakMemory": self.peakMemory, "maxRSS": self.maxRSS
+		}
+
+
+def _getMaxRSS() -> Optional[int]:
+	"""Returns the maximum resident set size of the process in bytes."""
+	if resource is None:
+		return None
+
+	maxRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return maxRSS if sys.platform == "darwin" else maxRSS * 1024
+
+
+@export
+class Profiler:
+	"""
+	Records processing phases and counters.
+
+	By default, only times are measured. Memory can be traced with :mod:`tracemalloc`, which slows down allocation heavy
+	phases by a multiple, so times measured while tracing memory are inflated. Memory allocated by lxml outside of Python's
+	allocators isn't traced, but it's included in the maximum resident set size (RSS) of the process, which is recorded
+	after each phase.
+	"""
+
+	phases: List[Phase]
+	counters: Dict[str, int]
+	_traceMemory: bool
+
+	def __init__(self, traceMemory: bool = False):
+		"""
+		Initializes a profiler.
+
+		:param traceMemory: Trace the peak memory of each phase. This inflates the measured times.
+		"""
+		self.phases = []
+		self.counters = {}
+		self._traceMemory = traceMemory
+
+	@contextmanager
+	def phase(self, name: str) -> Iterator[None]:
+		"""
+		Context manager measuring a phase.
+
+		Memory isn't traced for phases nested in other phases.
+
+		:param name: Name of the phase.
+		"""
+		traceMemory = self._traceMemory and not tracemalloc.is_tracing()
+		if traceMemory:
+			tracemalloc.start()
+
+		wallTime = perf_counter()
+		cpuTime = process_time()
+		try:
+			yield
+		finally:
+			wallTime = perf_counter() - wallTime
+			cpuTime = process_time() - cpuTime
+			peakMemory = None
+			if traceMemory:
+				peakMemory = tracemalloc.get_traced_memory()[1]
+				tracemalloc.stop()
+
+			self.phases.append(Phase(name, wallTime, cpuTime, peakMemory, _getMaxRSS()))
+
+	def count(self, name: str, value: int = 1) -> None:
+		"""Adds a value to a counter."""
+		self.counters[name] = self.counters.get(name, 0) + value
+
+	def toDict(self) -> Dict:
+		return {"memoryTraced": self._traceMemory, "phases": [phase.toDict() for phase in self.phases], "counters": dict(self.counters)}
+
+	def writeJson(self, stream: TextIO) -> None:
+		"""Writes all measurements as JSON."""
+		json.dump(self.toDict(), stream, indent=2)
+
+	def getReport(self) -> str:
+		"""Returns all measurements as a human-readable table."""
+		def mebibytes(value: Optional[int]) -> str:
+			return "n/a" if value is None else f"{value / 1024 ** 2:.1f}"
+
+		lines = [f"  {'Phase':<20s} {'Wall [s]':>10s} {'CPU [s]':>10s} {'Peak memory [MiB]':>18s} {'Max RSS [MiB]':>14s}"]
+		for phase in self.phases:
+			lines.append(
+				f"  {phase.name:<20s} {phase.wallTime:10.3f} {phase.cpuTime:10.3f} {mebibytes(phase.peakMemory):>18s} {mebibytes(phase.maxRSS):>14s}"
+			)
+
+		lines.append(f"  {'total':<20s} {sum(p.wallTime for p in self.phases):10.3f} {sum(p.cpuTime for p in self.phases):10.3f}")
+		for name, value in self.counters.items():
+			lines.append(f"  {name}: {value}")
+		if self._traceMemory:
+			lines.append("  Note: Times are inflated, as memory was traced.")
+
+		return "\n".join(lines)
@@ -0,0 +1,276 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Bitset-based per-test coverage vectors for fast merging and test ranking.
+
+Each statement or branch bin (file, line, statement index and instance path) of all tests is assigned a dense global ID
+by a :class:`BinUniverse`. The coverage of a test is stored as a packed bitset (a Python :class:`int`), in which bit
+``i`` is set, if the bin with ID ``i`` is covered. Merging tests is a bitwise or and counting covered bins is a
+population count. Both are executed in C on whole machine words.
+
+On top of the coverage vectors, :meth:`CoverageVectors.rank` orders tests by a greedy weighted set cover: each step
+selects the test covering the most not yet covered bins per cost.
+"""
+import heapq
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from lxml import etree
+from pyTooling.Decorators import export
+
+from pyEDAA.UCIS.Store import StatementStore
+from pyEDAA.UCIS.UCDB import openUcdbFile
+
+
+#: Type of history nodes describing a test run.
+UCIS_HISTORYNODE_TEST = "1"
+
+
+def _countBits(vector: int) -> int:
+	"""Returns the number of set bits."""
+	return bin(vector).count("1")
+
+
+_popCount: Callable[[int], int] = getattr(int, "bit_count", _countBits)  # int.bit_count requires Python 3.10+
+
+
+@export
+class HistoryRecord:
+	"""Test data of a test history node (``hnode``) in a UCDB file."""
+
+	name: str
+	simTime: float
+	cpuTime: float
+
+	def __init__(self, name: str, simTime: float, cpuTime: float):
+		self.name = name
+		self.simTime = simTime
+		self.cpuTime = cpuTime
+
+
+@export  # type: ignore[type-var]
+def readTestRecords(ucdbFile: Union[Path, BinaryIO]) -> List[HistoryRecord]:
+	"""
+	Reads the test records of a UCDB file.
+
+	History nodes precede all scopes, thus parsing stops at the first scope.
+
+	:param ucdbFile: Path to or binary file object of a UCDB file, optionally compressed.
+	:returns:        Test records in document order.
+	"""
+	records = []
+
+	with openUcdbFile(ucdbFile) as file:
+		for event, node in etree.iterparse(file, events=("start", "end"), tag=("{*}hnode", "{*}scope")):
+			if event == "start":
+				if etree.QName(node).localname == "scope":
+					break
+				continue
+
+			if node.get("type") != UCIS_HISTORYNODE_TEST:
+				continue
+
+			attributes = {child.get("key"): child.text for child in node if etree.QName(child).localname == "attr"}
+			records.append(HistoryRecord(
+				node.get("logical_name"),
+				float(attributes.get("UCIS:sim_time") or 0),
+				float(attributes.get("UCIS:cpu_time") or 0)
+			))
+
+	return records
+
+
+@export
+class BinUniverse:
+	"""Assigns dense global IDs to the bins (file, line, statement index and instance path) of many tests."""
+
+	_files: Dict[str, int]
+	_instances: Dict[str, int]
+	_ids: Dict[Tuple[int, int, int, int], int]
+
+	def __init__(self):
+		self._files = {}
+		self._instances = {}
+		self._ids = {}
+
+	def __len__(self) -> int:
+		return len(self._ids)
+
+	def getVector(self, statements: StatementStore) -> int:
+		"""
+		Returns the coverage vector of a test. Unknown bins are added to the universe.
+
+		:param statements: Statement data of a test.
+		:returns:          Bitset of covered bins.
+		"""
+		fileIds = [self._files.setdefault(file, len(self._files)) for file in statements.files]
+		instanceIds = [self._instances.setdefault(instance, len(self._instances)) for instance in statements.instances]
+
+		ids = self._ids
+		coveredIds = []
+		for fileId, line, index, instanceId, hits in zip(
+			statements.fileColumn, statements.lineColumn, statements.indexColumn, statements.instanceColumn, statements.hitsColumn
+		):
+			binId = ids.setdefault((fileIds[fileId], line, index, instanceIds[instanceId]), len(ids))
+			if hits > 0:
+				coveredIds.append(binId)
+
+		bitmap = bytearray(len(ids) // 8 + 1)
+		for binId in coveredIds:
+			bitmap[binId >> 3] |= 1 << (binId & 7)
+
+		return int.from_bytes(bitmap, "little")
+
+
+@export
+class CoverageVector:
+	"""Coverage vector and cost of a test."""
+
+	name: str
+	cost: float
+	vector: int
+
+	def __init__(self, name: str, cost: float, vector: int):
+		self.name = name
+		self.cost = cost
+		self.vector = vector
+
+	@property
+	def Count(self) -> int:
+		"""Number of covered bins."""
+		return _popCount(self.vector)
+
+
+@export
+class RankedTest:
+	"""Test selected by :meth:`CoverageVectors.rank`."""
+
+	test: CoverageVector
+	newBins: int
+	coveredBins: int
+	cumulativeCost: float
+
+	def __init__(self, test: CoverageVector, newBins: int, coveredBins: int, cumulativeCost: float):
+		"""
+		Initializes a ranked test.
+
+		:param test:           Selected test.
+		:param newBins:        Number of bins not covered by any previously selected test.
+		:param coveredBins:    Number of bins covered by this and all previously selected tests.
+		:param cumulativeCost: Cost of this and all previously selected tests.
+		"""
+		self.test = test
+		self.newBins = newBins
+		self.coveredBins = coveredBins
+		self.cumulativeCost = cumulativeCost
+
+
+@export
+class CoverageVectors:
+	"""Per-test coverage vectors over a shared :class:`BinUniverse`."""
+
+	universe: BinUniverse
+	tests: List[CoverageVector]
+
+	def __init__(self):
+		self.universe = BinUniverse()
+		self.tests = []
+
+	def add(self, name: str, statements: StatementStore, cost: float = 1.0) -> CoverageVector:
+		"""
+		Adds the coverage of a test.
+
+		:param name:       Name of the test.
+		:param statements: Statement data of the test.
+		:param cost:       Cost of the test, e.g. its CPU time.
+		:returns:          Coverage vector of the test.
+		"""
+		test = CoverageVector(name, cost, self.universe.getVector(statements))
+		self.tests.append(test)
+
+		return test
+
+	def union(self, tests: Optional[Iterable[CoverageVector]] = None) -> int:
+		"""
+		Merges coverage vectors.
+
+		:param tests: Tests to merge. If ``None``, all tests are merged.
+		:returns:     Bitset of bins covered by any of the tests.
+		"""
+		vector = 0
+		for test in self.tests if tests is None else tests:
+			vector |= test.vector
+
+		return vector
+
+	def rank(self) -> List[RankedTest]:
+		"""
+		Orders tests by a greedy weighted set cover.
+
+		Each step selects the test with the most not yet covered bins per cost. Tests without cost are selected first.
+		Tests not adding any bins are omitted, thus the selected tests are a reduced test suite with the same coverage as
+		all tests.
+
+		Gains of tests only decrease while tests are selected. Therefore, gains are evaluated lazily: the gain of the best
+		candidate is recomputed and it's selected, if it's still not worse than the next candidate's outdated gain.
+
+		:returns: Selected tests in order of selection.
+		"""
+		def priority(gain: int, cost: float) -> Tuple[float, int]:
+			return (-gain / cost if cost > 0 else float("-inf")) if gain > 0 else 0.0, -gain
+
+		heap = [(*priority(test.Count, test.cost), position) for position, test in enumerate(self.tests)]
+		heapq.heapify(heap)
+
+		ranking: List[RankedTest] = []
+		covered = 0
+		coveredBins = 0
+		cumulativeCost = 0.0
+		while len(heap) > 0:
+			_, _, position = heapq.heappop(heap)
+			test = self.tests[position]
+
+			gain = _popCount(test.vector & ~covered)
+			if gain == 0:
+				continue
+
+			entry = (*priority(gain, test.cost), position)
+			if len(heap) > 0 and heap[0] < entry:
+				heapq.heappush(heap, entry)
+				continue
+
+			covered |= test.vector
+			coveredBins += gain
+			cumulativeCost += test.cost
+			ranking.append(RankedTest(test, gain, coveredBins, cumulativeCost))
+
+		return ranking
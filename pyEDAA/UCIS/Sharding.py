@@ -0,0 +1,153 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Parallel parsing of a single large UCDB file split into shards at scope boundaries.
+
+Top-level scopes and instance scopes are independent units: each bin belongs to exactly one scope. The
+:class:`~pyEDAA.UCIS.Index.ScopeIndex` of a UCDB file is used to cut the file into fragments of similar size, which are
+parsed by worker processes. The per-shard statement tables are concatenated in the parent process.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from os import cpu_count
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from pyTooling.Decorators import export
+
+from pyEDAA.UCIS.Exclusion import ExclusionRules
+from pyEDAA.UCIS.Filter import PathFilter
+from pyEDAA.UCIS.Index import Fragment, ScopeIndex
+from pyEDAA.UCIS.Profiling import Profiler
+from pyEDAA.UCIS.Store import StatementStore
+from pyEDAA.UCIS.UCDB import Parser
+
+
+#: Number of shards per worker process. More shards than workers balance uneven shard sizes.
+SHARDS_PER_JOB = 4
+
+
+def _extractStatementsFromShard(
+	shard: List[Fragment],
+	ucdbFile: Path,
+	pathFilter: Optional[PathFilter],
+	exclusions: Optional[ExclusionRules]
+) -> Tuple[Set[str], StatementStore, Optional[List[int]]]:
+	"""
+	Worker function of :class:`ShardedParser` extracting the statement data of a single shard.
+
+	Besides the statement data, the numbers of bins excluded per exclusion rule are returned.
+	"""
+	sources: Set[str] = set()
+	stores = []
+	for fragment in shard:
+		parser = Parser(fragment.read(ucdbFile), False, streaming=True, pathFilter=pathFilter, exclusions=exclusions)
+		stores.append(parser._extractStatements())
+		sources |= parser._coverage.sources
+
+	return sources, StatementStore.concatenate(stores), None if exclusions is None else exclusions.Counts
+
+
+@export
+class ShardedParser(Parser):
+	"""
+	Parses a single large UCDB file in parallel by splitting it into shards at scope boundaries.
+
+	The scope index of the file is loaded from its sidecar file or built by a byte scan (see
+	:meth:`~pyEDAA.UCIS.Index.ScopeIndex.load`). Each shard is parsed by a worker of a
+	:class:`~concurrent.futures.ProcessPoolExecutor`. As each bin is contained in exactly one shard, concatenating the
+	statement tables of all shards yields the same statement data as parsing the whole file. Only lines of a source file
+	may be reported in a different order.
+	"""
+
+	_ucdbFile: Path
+	_jobs: Optional[int]
+	_shards: Optional[int]
+
+	def __init__(
+		self,
+		ucdbFile: Path,
+		mergeInstances: bool,
+		jobs: Optional[int] = None,
+		shards: Optional[int] = None,
+		hitCounts: bool = False,
+		profiler: Optional[Profiler] = None,
+		pathFilter: Optional[PathFilter] = None,
+		exclusions: Optional[ExclusionRules] = None
+	):
+		"""
+		Initializes a sharded parser for a single uncompressed UCDB file.
+
+		:param ucdbFile:       Path to the UCDB file in UCIS format (XML).
+		:param mergeInstances: Merge statement coverage data for all instances of the same design unit.
+		:param jobs:           Number of worker processes. If ``None``, the number of CPUs is used.
+		:param shards:         Targeted number of shards. If ``None``, :data:`SHARDS_PER_JOB` shards per worker are used.
+		:param hitCounts:      Report the minimum hit count of the line's statements (summed over merged instances) per
+		                       line instead of ``0``/``1``.
+		:param profiler:       Optional profiler recording the processing phases. Phases of the workers aren't recorded
+		                       individually.
+		:param pathFilter:     Optional filter of source files and instance paths applied while parsing.
+		:param exclusions:     Optional exclusion rules applied to each bin while parsing.
+		"""
+		super().__init__(ucdbFile, mergeInstances, streaming=True, hitCounts=hitCounts, profiler=profiler, pathFilter=pathFilter, exclusions=exclusions)
+		self._mergeWhileParsing = False
+		self._jobs = jobs
+		self._shards = shards
+
+	def _extractStatements(self) -> StatementStore:
+		with self._profile("index"):
+			index = ScopeIndex.load(self._ucdbFile)
+
+		jobs = self._jobs if self._jobs is not None else (cpu_count() or 1)
+		shardCount = self._shards if self._shards is not None else jobs * SHARDS_PER_JOB
+		shards = index.getShards(shardCount)
+		if self._profiler is not None:
+			self._profiler.count("shards", len(shards))
+
+		worker = partial(_extractStatementsFromShard, ucdbFile=self._ucdbFile, pathFilter=self._pathFilter, exclusions=self._exclusions)
+
+		with self._profile("parse + extract"):
+			if jobs == 1:
+				# Rules are used in-process, thus their counts are already up-to-date.
+				results = list(map(worker, shards))
+			else:
+				with ProcessPoolExecutor(max_workers=jobs) as executor:
+					results = list(executor.map(worker, shards))
+				if self._exclusions is not None:
+					for _, _, counts in results:
+						if counts is not None:
+							self._exclusions.addCounts(counts)
+
+		with self._profile("concatenate"):
+			for sources, _, _ in results:
+				self._coverage.sources |= sources
+			return StatementStore.concatenate([statements for _, statements, _ in results])
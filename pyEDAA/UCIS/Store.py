@@ -0,0 +1,365 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Columnar storage of statement coverage data.
+
+Each bin is stored as one row spread over typed :class:`array.array` columns. File names and instance paths are stored
+once in string tables and referenced by integer IDs.
+
+Statement bins and branch bins share the same columns. The index of a branch bin has :data:`BRANCH_INDEX` set and
+combines the statement index of the branch with the number of the bin within the branch (see :func:`getBranchIndex`).
+The line of a branch bin is the line of its branch statement.
+"""
+import json
+import sys
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple
+
+from pyTooling.Decorators import export
+
+
+STORE_MAGIC = b"UCISSTMT"
+STORE_VERSION = 2
+
+BRANCH_INDEX = 0x80000000
+BRANCH_STATEMENT_LIMIT = 0x8000
+BRANCH_BIN_LIMIT = 0x10000
+
+
+@export
+class StoreException(Exception):
+	"""Base-class for other statement store exceptions"""
+
+
+@export
+class InvalidStoreFormat(StoreException):
+	"""Raised when a serialized statement store can't be read"""
+
+
+@export
+class BranchIndexOverflow(StoreException):
+	"""Raised when a branch's statement index or bin number doesn't fit into a branch bin index"""
+
+
+@export  # type: ignore[type-var]
+def getBranchIndex(statementIndex: int, binNumber: int) -> int:
+	"""
+	Returns the index of a branch bin.
+
+	:param statementIndex: Statement index of the branch statement within its line.
+	:param binNumber:      Number of the bin within the branch, starting at 0.
+	:returns:              Index with :data:`BRANCH_INDEX` set.
+	:raises BranchIndexOverflow: If the statement index or the bin number is out of range.
+	"""
+	if not 0 <= statementIndex < BRANCH_STATEMENT_LIMIT:
+		raise BranchIndexOverflow(f"Statement index {statementIndex} exceeds the limit of {BRANCH_STATEMENT_LIMIT - 1}.")
+	if not 0 <= binNumber < BRANCH_BIN_LIMIT:
+		raise BranchIndexOverflow(f"Bin number {binNumber} exceeds the limit of {BRANCH_BIN_LIMIT - 1}.")
+
+	return BRANCH_INDEX | statementIndex << 16 | binNumber
+
+
+@export
+class StatementStore:
+	"""Stores statement bins in typed columns (file ID, line, statement index, instance ID and hit count)."""
+
+	files: List[str]
+	instances: List[str]
+	fileColumn: array
+	lineColumn: array
+	indexColumn: array
+	instanceColumn: array
+	hitsColumn: array
+	_fileIds: Dict[str, int]
+	_instanceIds: Dict[str, int]
+	_mergedRows: Dict[Tuple[int, int, int], int]
+
+	def __init__(self):
+		self.files = []
+		self.instances = []
+		self.fileColumn = array("I")
+		self.lineColumn = array("I")
+		self.indexColumn = array("I")
+		self.instanceColumn = array("I")
+		self.hitsColumn = array("Q")
+		self._fileIds = {}
+		self._instanceIds = {}
+		self._mergedRows = {}
+
+	def __len__(self) -> int:
+		return len(self.hitsColumn)
+
+	def __iter__(self) -> Iterator[Tuple[str, int, int, str, int]]:
+		"""Iterates all rows as tuples of file name, line, statement index, instance path and hit count."""
+		files = self.files
+		instances = self.instances
+
+		for fileId, line, index, instanceId, hits in zip(
+			self.fileColumn, self.lineColumn, self.indexColumn, self.instanceColumn, self.hitsColumn
+		):
+			yield files[fileId], line, index, instances[instanceId], hits
+
+	def __getstate__(self):
+		return self.files, self.instances, self.fileColumn, self.lineColumn, self.indexColumn, self.instanceColumn, self.hitsColumn
+
+	def __setstate__(self, state) -> None:
+		(
+			self.files, self.instances, self.fileColumn, self.lineColumn, self.indexColumn, self.instanceColumn, self.hitsColumn
+		) = state
+		self._fileIds = {file: fileId for fileId, file in enumerate(self.files)}
+		self._instanceIds = {instance: instanceId for instanceId, instance in enumerate(self.instances)}
+		self._mergedRows = {}
+
+	def _getColumns(self) -> Tuple[array, ...]:
+		return self.fileColumn, self.lineColumn, self.indexColumn, self.instanceColumn, self.hitsColumn
+
+	def write(self, stream: BinaryIO) -> None:
+		"""
+		Serializes the store into a compact binary format.
+
+		The format consists of a magic number, a length-prefixed JSON header with the string tables and the raw bytes of all
+		columns in native byte order.
+
+		:param stream: Binary stream to write to.
+		"""
+		columns = self._getColumns()
+		header = json.dumps({
+			"version": STORE_VERSION,
+			"byteorder": sys.byteorder,
+			"itemsizes": [column.itemsize for column in columns],
+			"rows": len(self),
+			"files": self.files,
+			"instances": self.instances,
+		}).encode("utf-8")
+
+		stream.write(STORE_MAGIC)
+		stream.write(len(header).to_bytes(4, "little"))
+		stream.write(header)
+		for column in columns:
+			column.tofile(stream)
+
+	@classmethod
+	def read(cls, stream: BinaryIO) -> "StatementStore":
+		"""
+		Deserializes a store written by :meth:`write`.
+
+		:param stream: Binary stream to read from.
+		:returns:      Deserialized statement store.
+		:raises InvalidStoreFormat: If the stream doesn't contain a compatible statement store.
+		"""
+		if stream.read(len(STORE_MAGIC)) != STORE_MAGIC:
+			raise InvalidStoreFormat("Stream doesn't start with a statement store magic number.")
+
+		try:
+			header = json.loads(stream.read(int.from_bytes(stream.read(4), "little")).decode("utf-8"))
+		except ValueError as ex:
+			raise InvalidStoreFormat("Invalid statement store header.") from ex
+
+		if header.get("version") != STORE_VERSION:
+			raise InvalidStoreFormat(f"Unsupported statement store version '{header.get('version')}'.")
+
+		store = cls()
+		store.files = header["files"]
+		store.instances = header["instances"]
+		store._fileIds = {file: fileId for fileId, file in enumerate(store.files)}
+		store._instanceIds = {instance: instanceId for instanceId, instance in enumerate(store.instances)}
+
+		columns = store._getColumns()
+		if header["itemsizes"] != [column.itemsize for column in columns]:
+			raise InvalidStoreFormat("Statement store was written with different column item sizes.")
+
+		for column in columns:
+			try:
+				column.fromfile(stream, header["rows"])
+			except (EOFError, ValueError) as ex:
+				raise InvalidStoreFormat("Statement store is truncated.") from ex
+
+			if header["byteorder"] != sys.byteorder:
+				column.byteswap()
+
+		return store
+
+	def getFileId(self, file: str) -> int:
+		"""Returns the ID of a file name. Unknown file names are added to the file table."""
+		try:
+			return self._fileIds[file]
+		except KeyError:
+			fileId = self._fileIds[file] = len(self.files)
+			self.files.append(file)
+			return fileId
+
+	def getInstanceId(self, instance: str) -> int:
+		"""Returns the ID of an instance path. Unknown instance paths are added to the instance table."""
+		try:
+			return self._instanceIds[instance]
+		except KeyError:
+			instanceId = self._instanceIds[instance] = len(self.instances)
+			self.instances.append(instance)
+			return instanceId
+
+	def append(self, fileId: int, line: int, index: int, instanceId: int, hits: int) -> None:
+		self.fileColumn.append(fileId)
+		self.lineColumn.append(line)
+		self.indexColumn.append(index)
+		self.instanceColumn.append(instanceId)
+		self.hitsColumn.append(hits)
+
+	def addMerged(self, fileId: int, line: int, index: int, hits: int) -> bool:
+		"""
+		Adds a statement merged over all instances.
+
+		Only the first bin of a statement (file, line and statement index) creates a row. Bins of the same statement in other
+		instances only update the row, as long as the statement isn't covered yet.
+
+		:returns: True, if the statement is covered.
+		"""
+		key = (fileId, line, index)
+		try:
+			row = self._mergedRows[key]
+		except KeyError:
+			self._mergedRows[key] = len(self.hitsColumn)
+			self.append(fileId, line, index, self.getInstanceId(""), hits)
+			return hits > 0
+
+		if self.hitsColumn[row] == 0:
+			self.hitsColumn[row] = hits
+			return hits > 0
+
+		return True
+
+	def aggregateLines(self, mergeInstances: bool) -> List[Dict[int, Tuple[int, int, int, int, int]]]:
+		"""
+		Groups statements and branches by file and line.
+
+		If ``mergeInstances`` is set, bins are first grouped by file, line and index over all instances in one hash
+		aggregation. The hit count of such a merged bin is the sum of its hit counts in all instances.
+
+		:param mergeInstances: Merge bins of all instances.
+		:returns:              Per file ID, a dictionary mapping line numbers to the number of statements, the number of
+		                       covered statements, the hit count of that line, the number of branch bins and the number of
+		                       covered branch bins. Lines are ordered by their first occurrence. A line's hit count is the
+		                       minimum hit count of its statements, thus it's non-zero only if all statements in that line
+		                       are covered. Lines without statements (e.g. all statements are excluded) are omitted, even if
+		                       they contain branch bins.
+		"""
+		fileLines: List[Dict[int, List[int]]] = [{} for _ in self.files]
+
+		if mergeInstances:
+			bins: Dict[Tuple[int, int, int], int] = {}
+			for fileId, line, index, hits in zip(self.fileColumn, self.lineColumn, self.indexColumn, self.hitsColumn):
+				key = (fileId, line, index)
+				bins[key] = bins.get(key, 0) + hits
+
+			rows: Iterable[Tuple[int, int, int, int]] = ((*key, hits) for key, hits in bins.items())
+		else:
+			rows = zip(self.fileColumn, self.lineColumn, self.indexColumn, self.hitsColumn)
+
+		for fileId, line, index, hits in rows:
+			lines = fileLines[fileId]
+			try:
+				stats = lines[line]
+			except KeyError:
+				stats = lines[line] = [0, 0, 0, 0, 0]
+
+			if index & BRANCH_INDEX:
+				stats[3] += 1
+				if hits:
+					stats[4] += 1
+			else:
+				stats[0] += 1
+				if hits:
+					stats[1] += 1
+				if hits < stats[2] or stats[0] == 1:
+					stats[2] = hits
+
+		return [
+			{
+				line: (count, covered, hits, branches, coveredBranches)
+				for line, (count, covered, hits, branches, coveredBranches) in lines.items() if count > 0
+			}
+			for lines in fileLines
+		]
+
+	@classmethod
+	def concatenate(cls, stores: Iterable["StatementStore"]) -> "StatementStore":
+		"""
+		Concatenates the rows of multiple stores into a new store.
+
+		In contrast to :meth:`merge`, rows aren't combined. This is used for stores of disjoint parts of the same UCDB file.
+
+		:param stores: Stores to concatenate.
+		:returns:      New store containing all rows in the order of the given stores.
+		"""
+		concatenated = cls()
+
+		for store in stores:
+			fileIds = [concatenated.getFileId(file) for file in store.files]
+			instanceIds = [concatenated.getInstanceId(instance) for instance in store.instances]
+
+			concatenated.fileColumn.extend(fileIds[fileId] for fileId in store.fileColumn)
+			concatenated.lineColumn.extend(store.lineColumn)
+			concatenated.indexColumn.extend(store.indexColumn)
+			concatenated.instanceColumn.extend(instanceIds[instanceId] for instanceId in store.instanceColumn)
+			concatenated.hitsColumn.extend(store.hitsColumn)
+
+		return concatenated
+
+	@classmethod
+	def merge(cls, stores: Iterable["StatementStore"]) -> "StatementStore":
+		"""
+		Merges multiple stores into a new store.
+
+		Hit counts of rows with the same file, line, statement index and instance path are summed up. Stores are merged one
+		after another, so a generator of stores (e.g. results of worker processes) is never kept in memory as a whole.
+
+		:param stores: Stores to merge.
+		:returns:      New store containing one row per distinct statement.
+		"""
+		merged = cls()
+		rows: Dict[Tuple[int, int, int, int], int] = {}
+		hitsColumn = merged.hitsColumn
+
+		for store in stores:
+			fileIds = [merged.getFileId(file) for file in store.files]
+			instanceIds = [merged.getInstanceId(instance) for instance in store.instances]
+
+			for fileId, line, index, instanceId, hits in zip(
+				store.fileColumn, store.lineColumn, store.indexColumn, store.instanceColumn, store.hitsColumn
+			):
+				key = (fileIds[fileId], line, index, instanceIds[instanceId])
+				try:
+					hitsColumn[rows[key]] += hits
+				except KeyError:
+					rows[key] = len(hitsColumn)
+					merged.append(*key, hits)
+
+		return merged
@@ -30,16 +30,25 @@
 # ==================================================================================================================== #
 #
 """Data model of the UCDB format."""
-from collections import namedtuple, defaultdict
-from itertools import groupby
-from operator import attrgetter
+from bz2 import BZ2File
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing, contextmanager, nullcontext
+from gzip import GzipFile
+from functools import partial
+from io import BufferedReader, RawIOBase
+from lzma import LZMAFile
 from pathlib import Path
-from typing import List, Tuple, Dict, DefaultDict
+from typing import List, Tuple, Dict, Iterator, Callable, Iterable, Optional, Set, BinaryIO, Union, ContextManager, cast
 
 from lxml import etree
 from pyTooling.Decorators import export
 
+from pyEDAA.UCIS.Cache import StatementCache
 from pyEDAA.UCIS.Cobertura import Class, Coverage, Package
+from pyEDAA.UCIS.Exclusion import ExclusionRules
+from pyEDAA.UCIS.Filter import PathFilter
+from pyEDAA.UCIS.Profiling import Profiler
+from pyEDAA.UCIS.Store import StatementStore, getBranchIndex
 
 
 UCDB_EXCLUDE_PRAGMA = 0x00000020
@@ -51,10 +60,10 @@ UCDB_EXCLUDED = (
 	UCDB_EXCLUDE_FILE | UCDB_EXCLUDE_PRAGMA | UCDB_EXCLUDE_INST | UCDB_EXCLUDE_AUTO
 )
 
-StatementData = namedtuple(
-	"StatementData",
-	["file", "line", "index", "instance", "hits"],
-)
+GZIP_MAGIC = b"\x1f\x8b"
+BZIP2_MAGIC = b"BZh"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
 
 @export
@@ -67,24 +76,175 @@ class InternalErrorOccurred(UcdbParserException):
 	"""Raised when internal error occurred"""
 
 
+@export
+class UnsupportedCompression(UcdbParserException):
+	"""Raised when a compressed UCDB file can't be decompressed"""
+
+
+class _PrefixedStream(RawIOBase):
+	"""
+	Raw binary stream returning bytes, which were already read from a stream (e.g. a magic number), followed by the
+	remaining bytes of that stream. The wrapped stream isn't closed.
+	"""
+
+	_prefix: bytes
+	_stream: BinaryIO
+
+	def __init__(self, prefix: bytes, stream: BinaryIO):
+		self._prefix = prefix
+		self._stream = stream
+
+	def readable(self) -> bool:
+		return True
+
+	def readinto(self, buffer) -> int:
+		if len(self._prefix) > 0:
+			size = min(len(buffer), len(self._prefix))
+			buffer[:size] = self._prefix[:size]
+			self._prefix = self._prefix[size:]
+			return size
+
+		data = self._stream.read(len(buffer))
+		buffer[:len(data)] = data
+		return len(data)
+
+
+def _readMagic(stream: BinaryIO) -> bytes:
+	"""Reads the bytes of the longest magic number. Short reads (e.g. from pipes) are repeated until the end of file."""
+	magic = b""
+	while len(magic) < len(XZ_MAGIC):
+		data = stream.read(len(XZ_MAGIC) - len(magic))
+		if not data:
+			break
+		magic += data
+
+	return magic
+
+
+def _decompressStream(stream: BinaryIO) -> BinaryIO:
+	"""
+	Wraps a binary stream into a streaming decompressor, if the stream starts with a known magic number.
+
+	The magic number is read once. Seekable streams are rewound, otherwise the read bytes are put back in front of the
+	remaining stream.
+	"""
+	if stream.seekable():
+		position = stream.tell()
+		magic = _readMagic(stream)
+		stream.seek(position)
+	else:
+		magic = _readMagic(stream)
+		stream = cast(BinaryIO, BufferedReader(_PrefixedStream(magic, stream)))
+
+	if magic.startswith(GZIP_MAGIC):
+		return cast(BinaryIO, GzipFile(fileobj=stream, mode="rb"))
+	elif magic.startswith(XZ_MAGIC):
+		return cast(BinaryIO, LZMAFile(stream, mode="rb"))
+	elif magic.startswith(BZIP2_MAGIC):
+		return cast(BinaryIO, BZ2File(stream, mode="rb"))
+	elif magic.startswith(ZSTD_MAGIC):
+		try:
+			from zstandard import ZstdDecompressor
+		except ImportError as ex:
+			raise UnsupportedCompression("Zstandard compressed UCDB files require package 'zstandard'.") from ex
+
+		return cast(BinaryIO, ZstdDecompressor().stream_reader(stream, closefd=False))
+
+	return stream
+
+
+@export  # type: ignore[type-var]
+@contextmanager
+def openUcdbFile(ucdbFile: Union[Path, BinaryIO]) -> Iterator[BinaryIO]:
+	"""
+	Opens a UCDB file for binary reading.
+
+	Compressed files (gzip, xz, bzip2 and Zstandard) are detected by their magic number and decompressed on-the-fly.
+	Besides paths, binary file objects like :data:`sys.stdin.buffer` are accepted. These are not closed on exit.
+
+	:param ucdbFile: Path to or binary file object of a UCDB file.
+	:returns:        Context manager yielding a binary stream of the uncompressed XML document.
+	"""
+	if isinstance(ucdbFile, Path):
+		with ucdbFile.open("rb") as file:
+			with closing(_decompressStream(file)) as stream:
+				yield stream
+	else:
+		stream = _decompressStream(ucdbFile)
+		try:
+			yield stream
+		finally:
+			if stream is not ucdbFile:
+				stream.close()
+
+
 @export
 class Parser:
 	_mergeInstances: bool
+	_streaming: bool
+	_hitCounts: bool
+	_skipCoveredUnits: bool
+	_mergeWhileParsing: bool
+	_cache: Optional[StatementCache]
+	_profiler: Optional[Profiler]
+	_pathFilter: Optional[PathFilter]
+	_exclusions: Optional[ExclusionRules]
+	_ucdbFile: Union[Path, BinaryIO]
 	_tree: etree._ElementTree
-	_nsmap: Dict
 	_coverage: Coverage
+	_scopeTag: str
+	_binTag: str
+	_srcTag: str
+	_attrTag: str
+	_countTag: str
+	_branchScopes: List[Optional[List[int]]]
 	statementsCount: int
 	statementsCovered: int
 
-	def __init__(self, ucdbFile: Path, mergeInstances: bool):
+	def __init__(
+		self,
+		ucdbFile: Union[Path, BinaryIO],
+		mergeInstances: bool,
+		streaming: bool = False,
+		hitCounts: bool = False,
+		skipCoveredUnits: bool = False,
+		cache: Optional[StatementCache] = None,
+		profiler: Optional[Profiler] = None,
+		pathFilter: Optional[PathFilter] = None,
+		exclusions: Optional[ExclusionRules] = None
+	):
+		"""
+		Initializes a UCDB parser.
+
+		:param ucdbFile:       Path to or binary file object of the UCDB file in UCIS format (XML). Compressed files are
+		                       decompressed on-the-fly (see :func:`openUcdbFile`).
+		:param mergeInstances: Merge statement coverage data for all instances of the same design unit.
+		:param streaming:      Parse the UCDB file incrementally instead of loading the whole document tree into memory.
+		:param hitCounts:      Report the minimum hit count of the line's statements (summed over merged instances) per
+		                       line instead of ``0``/``1``.
+		:param skipCoveredUnits: When merging instances (without hit counts), skip the statements of further instances of a
+		                       design unit once all its statements are covered. This assumes, that all instances of a
+		                       design unit contain the same statements.
+		:param cache:          Optional cache of extracted statement data. Cached data is used instead of parsing the UCDB
+		                       file. Newly extracted data is stored in the cache. Files given as file objects aren't cached.
+		:param profiler:       Optional profiler recording the processing phases and counts of scopes and bins.
+		:param pathFilter:     Optional filter of source files and instance paths applied while parsing. Filtered data
+		                       isn't cached, thus the cache is ignored if a filter is given.
+		:param exclusions:     Optional exclusion rules applied to each bin while parsing. The cache is ignored if exclusion
+		                       rules are given.
+		"""
 		self._mergeInstances = mergeInstances
-
-		with ucdbFile.open("r") as filename:
-			self._tree = etree.parse(filename)
-
-		self._nsmap = {
-			k: v for (k, v) in self._tree.getroot().nsmap.items() if k is not None
-		}
+		self._streaming = streaming
+		self._hitCounts = hitCounts
+		self._skipCoveredUnits = skipCoveredUnits
+		self._cache = cache if isinstance(ucdbFile, Path) and pathFilter is None and exclusions is None else None
+		self._profiler = profiler
+		self._pathFilter = pathFilter
+		self._exclusions = exclusions
+		self._ucdbFile = ucdbFile
+
+		# Cached statement data must be independent of merge options, thus merging while parsing is disabled when caching.
+		self._mergeWhileParsing = mergeInstances and not hitCounts and self._cache is None
 
 		self._coverage = Coverage()
 
@@ -96,114 +256,500 @@ class Parser:
 
 		return self._coverage
 
-	def _groupByIndex(self, statements: List[StatementData]) -> List[StatementData]:
-		groupedStmts = []
-
-		sortedStmts = sorted(statements, key=attrgetter("index"))
-		for index, stmts in groupby(sortedStmts, key=attrgetter("index")):
-			hit = any((stmt.hits for stmt in stmts))
+	def _setNamespace(self, node: etree._Element) -> None:
+		namespace = etree.QName(node).namespace
+		prefix = "" if namespace is None else f"{{{namespace}}}"
 
-			groupedStmts.append(
-				StatementData(
-					file=statements[0].file,
-					line=statements[0].line,
-					index=index,
-					instance="",
-					hits=hit,
-				)
-			)
+		self._scopeTag = f"{prefix}scope"
+		self._binTag = f"{prefix}bin"
+		self._srcTag = f"{prefix}src"
+		self._attrTag = f"{prefix}attr"
+		self._countTag = f"{prefix}count"
 
-		return groupedStmts
+	def _profile(self, phase: str) -> ContextManager:
+		"""Returns a context manager measuring a phase, if a profiler is set."""
+		return nullcontext() if self._profiler is None else self._profiler.phase(phase)
 
 	def _parseStatementCoverage(self) -> None:
-		scopes = self._tree.xpath(
-			"/ux:ucdb/ux:scope[.//ux:bin[@type='STMTBIN']]", namespaces=self._nsmap
-		)
+		statements = self._extractStatements()
+
+		with self._profile("aggregate"):
+			self._aggregateStatements(statements)
+
+	def _extractStatements(self) -> StatementStore:
+		ucdbFile = self._ucdbFile
+		cache = self._cache
+
+		if cache is not None and isinstance(ucdbFile, Path):
+			with self._profile("cache load"):
+				cached = cache.load(ucdbFile)
+			if cached is not None:
+				sources, statements = cached
+				self._coverage.sources |= sources
+				return statements
+
+		statements = StatementStore()
+
+		with openUcdbFile(ucdbFile) as file:
+			if self._streaming:
+				# Parsing and extraction are interleaved, thus both are measured as one phase.
+				with self._profile("parse + extract"):
+					self._processEvents(etree.iterparse(file, events=("start", "end"), tag=("{*}scope", "{*}bin")), statements, release=True)
+			else:
+				with self._profile("parse"):
+					self._tree = etree.parse(file)
+				with self._profile("extract"):
+					self._processEvents(etree.iterwalk(self._tree, events=("start", "end"), tag=("{*}scope", "{*}bin")), statements, release=False)
+
+		if cache is not None and isinstance(ucdbFile, Path):
+			with self._profile("cache save"):
+				cache.save(ucdbFile, self._coverage.sources, statements)
+
+		return statements
+
+	def _processEvents(
+		self,
+		events: Iterator[Tuple[str, etree._Element]],
+		statements: StatementStore,
+		release: bool
+	) -> None:
+		"""
+		Extracts coverage data from a single traversal over the UCDB document.
+
+		Bins are dispatched by their ``type`` attribute when their end tag is reached, thus statement bins (``STMTBIN``) and
+		branch bins (``BRANCHBIN``) are extracted in the same traversal. Bins within top-level design unit scopes (``DU_*``)
+		are skipped. The hierarchical path of each scope is computed once, when the scope is entered, and shared by all bins
+		within that scope.
+
+		If ``release`` is set, processed elements are cleared and detached from the partially built tree (see
+		:func:`lxml.etree.iterparse`), so only the chain of currently open scopes is kept in memory.
+
+		If a path filter is set, bins of excluded source files are skipped. Scopes matching an instance exclude pattern are
+		skipped with their whole subtree. Bins are only extracted from included instances (see :class:`PathFilter`).
+
+		If exclusion rules are set, each remaining bin is checked against them after its exclusion flags (see
+		:class:`~pyEDAA.UCIS.Exclusion.ExclusionRules`).
+
+		If covered design units are skipped, the covered and uncovered statements of each design unit (``du`` attribute of
+		instance scopes) are tracked. Excluded statements count as uncovered, until they are covered in another instance.
+		Once an instance is complete and no statement of its design unit is left uncovered, the bins of all further
+		instances of this design unit are skipped. As nested instances of other design units are still processed, skipped
+		instances are still traversed; only the extraction of their bins is skipped.
+
+		:param events: Start and end events filtered for ``scope`` and ``bin`` elements.
+		"""
+		binHandlers: Dict[str, Callable[[etree._Element, str, StatementStore], Optional[Tuple[Tuple[int, int, int], Optional[bool]]]]] = {
+			"STMTBIN": self._addStatementNode,
+			"BRANCHBIN": self._addBranchNode,
+		}
+		scopeTypes: List[str] = []
+		scopePaths: List[str] = []
+		branchScopes = self._branchScopes = []
+		skipCoveredUnits = self._skipCoveredUnits and self._mergeWhileParsing
+		designUnits: List[Optional[str]] = []
+		coveredUnits: Set[str] = set()
+		coveredStatements: Dict[str, Set[Tuple[int, int, int]]] = {}
+		uncoveredStatements: Dict[str, Set[Tuple[int, int, int]]] = {}
+		scopeTag = None
+		binTag = None
+		scopeCount = 0
+		binCount = 0
+		excludedCount = 0
+		pathFilter = self._pathFilter
+		instanceFilter = pathFilter if pathFilter is not None and pathFilter.FiltersInstances else None
+		includedScopes: List[bool] = []
+		skipDepth = 0  # Number of open scopes within an excluded subtree.
+
+		for event, element in events:
+			tag = element.tag
+
+			if scopeTag is None:
+				self._setNamespace(element)
+				scopeTag = self._scopeTag
+				binTag = self._binTag
+
+			if event == "start":
+				if skipDepth == 0 and len(scopeTypes) > 0 and scopeTypes[-1] == "BRANCH" and branchScopes[-1] is None and \
+					not scopeTypes[0].startswith("DU_") and (instanceFilter is None or includedScopes[-1]):
+					# The header (``src`` and ``attr`` elements) of a branch scope precedes its first child. It's parsed now, as
+					# releasing a nested scope before the first bin would release the header, too.
+					branchScopes[-1] = self._addBranchScope(element.getparent(), statements)
+
+				if tag == scopeTag:
+					if skipDepth > 0:
+						skipDepth += 1
+						continue
+
+					typeName = element.get("type")
+					name = element.get("name")
+
+					if typeName is None or name is None:
+						raise InternalErrorOccurred("Unexpected 'None' value.")
+
+					scopePath = f"{scopePaths[-1]}.{name}" if len(scopePaths) > 0 else name
+
+					if instanceFilter is not None:
+						if instanceFilter.isInstanceExcluded(scopePath):
+							skipDepth = 1
+							continue
+						includedScopes.append((len(includedScopes) > 0 and includedScopes[-1]) or instanceFilter.isInstanceIncluded(scopePath))
+
+					scopeCount += 1
+					scopeTypes.append(typeName)
+					scopePaths.append(scopePath)
+					branchScopes.append(None)
+
+					if skipCoveredUnits:
+						designUnit = element.get("du")
+						designUnits.append(designUnit if designUnit is not None or len(designUnits) == 0 else designUnits[-1])
+				continue
 
-		if not isinstance(scopes, list):
-			raise InternalErrorOccurred(f"Unexpected type: '{scopes.__class__.__name__}'.")
+			if skipDepth > 0:
+				if tag == scopeTag:
+					skipDepth -= 1
+			elif tag == binTag:
+				binCount += 1
+				if len(scopeTypes) > 0 and not scopeTypes[0].startswith("DU_") and (instanceFilter is None or includedScopes[-1]):
+					handler = binHandlers.get(element.get("type", ""))
+					if handler is not None and not (skipCoveredUnits and designUnits[-1] in coveredUnits):
+						result = handler(element, scopePaths[-1], statements)
+						if result is None or result[1] is None:
+							excludedCount += 1
+						if result is not None and skipCoveredUnits and designUnits[-1] is not None:
+							# Excluded statements are tracked as uncovered, as they might be included in other instances.
+							key, covered = result
+							coveredKeys = coveredStatements.setdefault(designUnits[-1], set())
+							uncoveredKeys = uncoveredStatements.setdefault(designUnits[-1], set())
+							if covered:
+								coveredKeys.add(key)
+								uncoveredKeys.discard(key)
+							elif key not in coveredKeys:
+								uncoveredKeys.add(key)
+			else:
+				scopeTypes.pop()
+				scopePaths.pop()
+				branchScopes.pop()
+				if instanceFilter is not None:
+					includedScopes.pop()
+
+				if skipCoveredUnits:
+					designUnit = designUnits.pop()
+					if designUnit is not None and element.get("du") is not None and len(uncoveredStatements.get(designUnit, ())) == 0:
+						coveredUnits.add(designUnit)
+
+			if release:
+				# Completed bins and scopes are not accessed anymore. Preceding siblings (e.g. ``src`` and ``attr`` elements of
+				# the enclosing scope or top-level ``hnode`` elements) are released, too.
+				element.clear()
+				parent = element.getparent()
+				if parent is not None:
+					while element.getprevious() is not None:
+						del parent[0]
+
+		if self._profiler is not None:
+			self._profiler.count("scopes", scopeCount)
+			self._profiler.count("bins", binCount)
+			self._profiler.count("excluded bins", excludedCount)
+
+	def _addStatementNode(
+		self,
+		node: etree._Element,
+		instancePath: str,
+		statements: StatementStore
+	) -> Optional[Tuple[Tuple[int, int, int], Optional[bool]]]:
+		"""
+		Adds a statement bin.
+
+		:returns: ``None`` for bins of filtered source files. Otherwise, the key of the statement and whether it's covered
+		          or ``None``, if the bin is excluded.
+		"""
+		workdir, file, line, stmtIndex, count = self._parseStatementNode(node)
+		if self._pathFilter is not None and not self._pathFilter.isFileIncluded(file):
+			return None
+
+		# Sources are added once per distinct working directory instead of once per bin.
+		if workdir not in self._coverage.sources:
+			self._coverage.addSource(workdir)
 
-		nodes: List[etree._Element] = []
+		flags = node.get("flags")
 
-		for scopeNode in scopes:
-			if not isinstance(scopeNode, etree._Element):
-				raise InternalErrorOccurred(f"Unexpected type: '{scopeNode.__class__.__name__}'.")
+		if flags is None:
+			raise InternalErrorOccurred("Unexpected 'None' value.")
 
-			typeName = scopeNode.get("type")
+		fileId = statements.getFileId(file)
+		key = (fileId, line, stmtIndex)
 
-			if typeName is None:
-				raise InternalErrorOccurred("Unexpected 'None' value.")
+		if int(flags, 16) & UCDB_EXCLUDED:
+			return key, None
 
-			if typeName.startswith("DU_"):
-				continue
+		if self._exclusions is not None and self._exclusions.exclude(file, line, instancePath):
+			return key, None
 
-			statementBins = scopeNode.xpath(".//ux:bin[@type='STMTBIN']", namespaces=self._nsmap)
+		if self._mergeWhileParsing:
+			covered = statements.addMerged(fileId, line, stmtIndex, count)
+		else:
+			statements.append(fileId, line, stmtIndex, statements.getInstanceId(instancePath), count)
+			covered = count > 0
 
-			if not isinstance(statementBins, list):
-				raise InternalErrorOccurred(f"Unexpected type: '{statementBins.__class__.__name__}'.")
+		return key, covered
 
-			for statementBin in statementBins:
-				if not isinstance(statementBin, etree._Element):
-					raise InternalErrorOccurred(f"Unexpected type: '{statementBin.__class__.__name__}'.")
+	def _addBranchNode(
+		self,
+		node: etree._Element,
+		instancePath: str,
+		statements: StatementStore
+	) -> Optional[Tuple[Tuple[int, int, int], Optional[bool]]]:
+		"""
+		Adds a branch bin.
 
-				nodes.append(statementBin)
+		Branch bins are children of a ``BRANCH`` scope. They are attributed to the line of the branch statement, which is
+		parsed from the enclosing scope when its first child starts (see :meth:`_addBranchScope`). The bins of a branch are
+		numbered in document order.
 
-		statements: DefaultDict[str, DefaultDict[int, List]] = defaultdict(lambda: defaultdict(list))
+		:returns: ``None`` for bins of filtered source files. Otherwise, the key of the branch and whether it's covered or
+		          ``None``, if the bin is excluded.
+		"""
+		branchScope = self._branchScopes[-1]
+		if branchScope is None:
+			branchScope = self._branchScopes[-1] = self._addBranchScope(node.getparent(), statements)
 
-		for node in nodes:
-			workdir, stmtData = self._parseStatementNode(node)
-			self._coverage.addSource(workdir)
+		fileId, line, stmtIndex, binNumber = branchScope
+		branchScope[3] += 1
 
-			flags = node.get("flags")
+		if fileId < 0:
+			return None
 
-			if flags is None:
-				raise InternalErrorOccurred("Unexpected 'None' value.")
+		flags = node.get("flags")
+		if flags is None:
+			raise InternalErrorOccurred("Unexpected 'None' value.")
 
-			if int(flags, 16) & UCDB_EXCLUDED:
-				_ = statements[stmtData.file]
-				continue
+		index = getBranchIndex(stmtIndex, binNumber)
+		key = (fileId, line, index)
+
+		if int(flags, 16) & UCDB_EXCLUDED:
+			return key, None
+
+		if self._exclusions is not None and self._exclusions.exclude(statements.files[fileId], line, instancePath):
+			return key, None
+
+		for child in node:
+			if child.tag == self._countTag and child.text is not None:
+				count = int(child.text)
+				break
+		else:
+			raise InternalErrorOccurred(f"Incomplete branch bin in line {node.sourceline}.")
+
+		if self._mergeWhileParsing:
+			covered = statements.addMerged(fileId, line, index, count)
+		else:
+			statements.append(fileId, line, index, statements.getInstanceId(instancePath), count)
+			covered = count > 0
+
+		return key, covered
+
+	def _addBranchScope(self, node: Optional[etree._Element], statements: StatementStore) -> List[int]:
+		"""
+		Parses the header of a ``BRANCH`` scope.
 
-			statements[stmtData.file][stmtData.line].append(stmtData)
+		:returns: File ID, line and statement index of the branch statement and the number of bins processed so far. A
+		          file ID of -1 marks branches in filtered files.
+		"""
+		if node is None:
+			raise InternalErrorOccurred("Branch bin outside of a branch scope.")
 
-		for file, lines in statements.items():
+		workdir, file, line, stmtIndex = self._parseBranchScopeNode(node)
+		if self._pathFilter is not None and not self._pathFilter.isFileIncluded(file):
+			return [-1, line, stmtIndex, 0]
+
+		if workdir not in self._coverage.sources:
+			self._coverage.addSource(workdir)
+
+		return [statements.getFileId(file), line, stmtIndex, 0]
+
+	def _aggregateStatements(self, statements: StatementStore) -> None:
+		for file, lines in zip(statements.files, statements.aggregateLines(self._mergeInstances)):
 			package = Package(file)
 			coberturaClass = Class(file, file)
 			package.addClass(coberturaClass)
 			self._coverage.addPackage(package)
 
-			for line, lineStmts in lines.items():
-				if self._mergeInstances:
-					lineStmts = self._groupByIndex(lineStmts)
+			for line, (count, covered, hits, branches, coveredBranches) in lines.items():
+				self.statementsCount += count
+				self.statementsCovered += covered
+
+				coberturaClass.addStatement(line, hits if self._hitCounts else int(covered == count))
+				if branches > 0:
+					coberturaClass.addBranches(line, branches, coveredBranches)
 
-				self.statementsCount += len(lineStmts)
+	def _parseStatementNode(self, node: etree._Element) -> Tuple[str, str, int, int, int]:
+		srcNode = None
+		stmtIndex = None
+		count = None
 
-				covered = len(list(filter(attrgetter("hits"), lineStmts)))
-				hit = int(covered == len(lineStmts))
+		for child in node:
+			tag = child.tag
+			if tag == self._srcTag:
+				srcNode = child
+			elif tag == self._countTag:
+				count = child.text
+			elif tag == self._attrTag and child.get("key") == "#SINDEX#":
+				stmtIndex = child.text
 
-				self.statementsCovered += covered
+		if srcNode is None or stmtIndex is None or count is None:
+			raise InternalErrorOccurred(f"Incomplete statement bin in line {node.sourceline}.")
+
+		workdir, file, line = self._parseSourceNode(srcNode)
+
+		return workdir, file, line, int(stmtIndex), int(count)
+
+	def _parseBranchScopeNode(self, node: etree._Element) -> Tuple[str, str, int, int]:
+		srcNode = None
+		stmtIndex = None
 
-				coberturaClass.addStatement(line, hit)
+		for child in node:
+			tag = child.tag
+			if tag == self._srcTag:
+				srcNode = child
+			elif tag == self._attrTag and child.get("key") == "#SINDEX#":
+				stmtIndex = child.text
 
-	def _parseStatementNode(self, node) -> Tuple[str, StatementData]:
-		srcNode = node.find("./ux:src", namespaces=self._nsmap)
+		if srcNode is None or stmtIndex is None:
+			raise InternalErrorOccurred(f"Incomplete branch scope in line {node.sourceline}.")
+
+		workdir, file, line = self._parseSourceNode(srcNode)
+
+		return workdir, file, line, int(stmtIndex)
+
+	def _parseSourceNode(self, srcNode: etree._Element) -> Tuple[str, str, int]:
 		workdir = srcNode.get("workdir")
+		file = srcNode.get("file")
+		line = srcNode.get("line")
+
+		if workdir is None or file is None or line is None:
+			raise InternalErrorOccurred(f"Incomplete source reference in line {srcNode.sourceline}.")
+
+		return workdir, file, int(line)
+
+
+def _extractStatementsFromFile(
+	ucdbFile: Path,
+	streaming: bool,
+	cache: Optional[StatementCache],
+	pathFilter: Optional[PathFilter],
+	exclusions: Optional[ExclusionRules]
+) -> Tuple[Set[str], StatementStore, Optional[List[int]]]:
+	"""
+	Worker function of :func:`extractStatements` extracting the statement data of a single UCDB file.
+
+	Besides the statement data, the numbers of bins excluded per exclusion rule are returned.
+	"""
+	parser = Parser(ucdbFile, False, streaming, cache=cache, pathFilter=pathFilter, exclusions=exclusions)
+	statements = parser._extractStatements()
+
+	return parser._coverage.sources, statements, None if exclusions is None else exclusions.Counts
+
+
+@export  # type: ignore[type-var]
+def extractStatements(
+	ucdbFiles: Iterable[Path],
+	streaming: bool = False,
+	jobs: Optional[int] = None,
+	cache: Optional[StatementCache] = None,
+	pathFilter: Optional[PathFilter] = None,
+	exclusions: Optional[ExclusionRules] = None
+) -> Iterator[Tuple[Path, Set[str], StatementStore]]:
+	"""
+	Extracts the statement data of multiple UCDB files in parallel.
+
+	Each file is processed by a worker of a :class:`~concurrent.futures.ProcessPoolExecutor`. Results are yielded in the
+	order of the given files.
+
+	:param ucdbFiles: Paths to UCDB files in UCIS format (XML).
+	:param streaming: Parse the UCDB files incrementally instead of loading whole document trees into memory.
+	:param jobs:      Number of worker processes. If ``None``, the number of CPUs is used.
+	:param cache:     Optional cache of extracted statement data shared by all workers.
+	:param pathFilter: Optional filter of source files and instance paths applied while parsing.
+	:param exclusions: Optional exclusion rules applied while parsing. The numbers of bins excluded by the workers are
+	                  added to these rules.
+	:returns:         Iterator of tuples of UCDB file path, source directories and statement store.
+	"""
+	ucdbFiles = list(ucdbFiles)
+	worker = partial(_extractStatementsFromFile, streaming=streaming, cache=cache, pathFilter=pathFilter, exclusions=exclusions)
+
+	if jobs == 1 or len(ucdbFiles) == 1:
+		# Rules are used in-process, thus their counts are already up-to-date.
+		for ucdbFile in ucdbFiles:
+			sources, statements, _ = worker(ucdbFile)
+			yield ucdbFile, sources, statements
+		return
+
+	with ProcessPoolExecutor(max_workers=jobs) as executor:
+		for ucdbFile, (sources, statements, counts) in zip(ucdbFiles, executor.map(worker, ucdbFiles)):
+			if exclusions is not None and counts is not None:
+				exclusions.addCounts(counts)
+			yield ucdbFile, sources, statements
 
-		instancePath = ".".join(
-			(scope.get("name") for scope in node.iterancestors("{*}scope"))
-		)
 
-		stmtIndex = int(
-			node.find("./ux:attr[@key='#SINDEX#']", namespaces=self._nsmap).text
-		)
+@export
+class MultiFileParser(Parser):
+	"""
+	Parses multiple UCDB files in parallel and merges their statement coverage into a single Cobertura model.
+
+	Each file is processed by a worker of a :class:`~concurrent.futures.ProcessPoolExecutor`. Hit counts of the same
+	statement (file, line, statement index and instance path) are summed up over all files.
+	"""
+
+	_ucdbFiles: List[Path]
+	_jobs: Optional[int]
+
+	def __init__(
+		self,
+		ucdbFiles: Iterable[Path],
+		mergeInstances: bool,
+		streaming: bool = False,
+		jobs: Optional[int] = None,
+		hitCounts: bool = False,
+		cache: Optional[StatementCache] = None,
+		profiler: Optional[Profiler] = None,
+		pathFilter: Optional[PathFilter] = None,
+		exclusions: Optional[ExclusionRules] = None
+	):
+		"""
+		Initializes a parser for multiple UCDB files.
+
+		:param ucdbFiles:      Paths to UCDB files in UCIS format (XML).
+		:param mergeInstances: Merge statement coverage data for all instances of the same design unit.
+		:param streaming:      Parse the UCDB files incrementally instead of loading whole document trees into memory.
+		:param jobs:           Number of worker processes. If ``None``, the number of CPUs is used.
+		:param hitCounts:      Report the minimum hit count of the line's statements (summed over merged instances) per
+		                       line instead of ``0``/``1``.
+		:param cache:          Optional cache of extracted statement data shared by all workers.
+		:param profiler:       Optional profiler recording the processing phases. Phases of the workers aren't recorded
+		                       individually.
+		:param pathFilter:     Optional filter of source files and instance paths applied while parsing.
+		:param exclusions:     Optional exclusion rules applied to each bin while parsing.
+		"""
+		self._mergeInstances = mergeInstances
+		self._streaming = streaming
+		self._hitCounts = hitCounts
+		self._cache = cache
+		self._profiler = profiler
+		self._pathFilter = pathFilter
+		self._exclusions = exclusions
+		self._ucdbFiles = list(ucdbFiles)
+		self._jobs = jobs
 
-		count = int(node.find("./ux:count", namespaces=self._nsmap).text)
+		self._coverage = Coverage()
+
+		self.statementsCount = 0
+		self.statementsCovered = 0
 
-		stmtData = StatementData(
-			file=srcNode.get("file"),
-			line=int(srcNode.get("line")),
-			index=stmtIndex,
-			instance=instancePath,
-			hits=count,
-		)
+	def _extractStatements(self) -> StatementStore:
+		def stores() -> Iterator[StatementStore]:
+			for _, sources, statements in extractStatements(self._ucdbFiles, self._streaming, self._jobs, self._cache, self._pathFilter, self._exclusions):
+				self._coverage.sources |= sources
+				yield statements
 
-		return workdir, stmtData
+		# Each store is merged as soon as it's received and released afterwards.
+		with self._profile("parse + extract + merge"):
+			return StatementStore.merge(stores())
@@ -0,0 +1,228 @@
+# ==================================================================================================================== #
+#               _____ ____    _        _     _   _  ____ ___ ____                                                      #
+#   _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                     #
+#  | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                     #
+#  | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                    #
+#  | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                     #
+#  |_|    |___/                                                                                                        #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Artur Porebski (Aldec Inc.)                                                                                        #
+#   Michal Pacula  (Aldec Inc.)                                                                                        #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#          http://www.apache.org/licenses/LICENSE-2.0                                                                  #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Pluggable writers serializing a :class:`~pyEDAA.UCIS.Cobertura.Coverage` model to several output formats.
+
+All writers are driven by :func:`writeCoverage` in a single traversal over the packages of the model, so multiple formats
+are written from one parsed UCDB file. Further formats are added by deriving from :class:`CoverageWriter` and registering
+the class in :data:`WRITERS`.
+"""
+import json
+from os.path import exists, isabs, join
+from typing import BinaryIO, Dict, Iterable, List, Type
+
+from pyTooling.Decorators import export
+
+from pyEDAA.UCIS.Cobertura import Class, Coverage, Package
+
+
+@export
+class CoverageWriter:
+	"""
+	Base-class of all writers.
+
+	A writer is called with :meth:`begin` once, then with :meth:`writePackage` for each package in order and finally with
+	:meth:`end`. Statistics of the model are refreshed before :meth:`begin` is called.
+	"""
+
+	_stream: BinaryIO
+
+	def __init__(self, stream: BinaryIO):
+		"""
+		Initializes a writer.
+
+		:param stream: Binary file object like a file opened in ``wb`` mode or a :class:`gzip.GzipFile`.
+		"""
+		self._stream = stream
+
+	def begin(self, coverage: Coverage) -> None:
+		"""Writes the start of the document."""
+
+	def writePackage(self, package: Package) -> None:
+		"""Writes a package with all its classes."""
+		raise NotImplementedError()
+
+	def end(self, coverage: Coverage) -> None:
+		"""Completes the document."""
+
+
+@export
+class CoberturaWriter(CoverageWriter):
+	"""Writes coverage data in Cobertura format (XML) (see :meth:`~pyEDAA.UCIS.Cobertura.Coverage.writeXml`)."""
+
+	def begin(self, coverage: Coverage) -> None:
+		self._writer = coverage.getXmlWriter(self._stream)
+		next(self._writer)
+
+	def writePackage(self, package: Package) -> None:
+		self._writer.send(package)
+
+	def end(self, coverage: Coverage) -> None:
+		try:
+			self._writer.send(None)
+		except StopIteration:
+			pass
+
+
+@export
+class LcovWriter(CoverageWriter):
+	"""
+	Writes coverage data in LCOV tracefile format, e.g. for ``genhtml``.
+
+	Each class (source file) is written as one record. Branches are only known as counts per line, thus the first
+	``covered`` branches of a line are reported as taken once. Branches in lines without hits are reported as not
+	evaluated (``-``).
+
+	Relative source file names are resolved against the sources (working directories) of the model, like Cobertura
+	consumers resolve them against the ``<sources>`` element. Thus, ``genhtml`` finds the files independent of its
+	working directory.
+	"""
+
+	_sources: List[str]
+
+	def begin(self, coverage: Coverage) -> None:
+		self._sources = sorted(coverage.sources)
+
+	def writePackage(self, package: Package) -> None:
+		for coberturaClass in package.classes.values():
+			self._stream.write(self._getRecord(coberturaClass, self._getPath(coberturaClass.sourceFile)).encode("utf-8"))
+
+	def _getPath(self, sourceFile: str) -> str:
+		"""
+		Resolves a source file name. The first source containing the file is used. If no source contains it (e.g. on
+		another machine), the first source is used.
+		"""
+		if isabs(sourceFile) or len(self._sources) == 0:
+			return sourceFile
+
+		paths = [join(source, sourceFile) for source in self._sources]
+		for path in paths:
+			if exists(path):
+				return path
+
+		return paths[0]
+
+	@staticmethod
+	def _getRecord(coberturaClass: Class, path: str) -> str:
+		record = [f"TN:\nSF:{path}\n"]
+
+		for line, (branches, covered) in coberturaClass.branches.items():
+			evaluated = coberturaClass.lines.get(line, 0) > 0
+			for branch in range(branches):
+				taken = ("1" if branch < covered else "0") if evaluated else "-"
+				record.append(f"BRDA:{line},0,{branch},{taken}\n")
+		if len(coberturaClass.branches) > 0:
+			record.append(f"BRF:{coberturaClass.branchesValid}\nBRH:{coberturaClass.branchesCovered}\n")
+
+		for line, hits in coberturaClass.lines.items():
+			record.append(f"DA:{line},{int(hits)}\n")
+		record.append(f"LF:{coberturaClass.linesValid}\nLH:{coberturaClass.linesCovered}\nend_of_record\n")
+
+		return "".join(record)
+
+
+@export
+class JsonWriter(CoverageWriter):
+	"""
+	Writes coverage data as JSON document.
+
+	The document contains the sources, the overall statistics and a list of packages, each with a list of classes. Lines
+	are mapped to hit counts, branch lines to a pair of branch count and covered branch count. The document is written
+	incrementally, one package at a time.
+	"""
+
+	_separator: str
+
+	def begin(self, coverage: Coverage) -> None:
+		# The header object is left open, so the packages can be appended incrementally.
+		header = json.dumps({"sources": sorted(coverage.sources), **self._getStatistics(coverage)})
+		self._stream.write(f"{header[:-1]}, \"packages\": [".encode("utf-8"))
+		self._separator = "\n"
+
+	def writePackage(self, package: Package) -> None:
+		content = json.dumps({
+			"name": package.name,
+			**self._getStatistics(package),
+			"classes": [
+				{
+					"name": coberturaClass.name,
+					"filename": coberturaClass.sourceFile,
+					**self._getStatistics(coberturaClass),
+					"lines": {str(line): int(hits) for line, hits in coberturaClass.lines.items()},
+					"branches": {str(line): list(branches) for line, branches in coberturaClass.branches.items()},
+				} for coberturaClass in package.classes.values()
+			]
+		})
+		self._stream.write(f"{self._separator}{content}".encode("utf-8"))
+		self._separator = ",\n"
+
+	def end(self, coverage: Coverage) -> None:
+		self._stream.write(b"\n]}\n")
+
+	@staticmethod
+	def _getStatistics(item) -> Dict[str, int]:
+		return {
+			"linesValid": item.linesValid,
+			"linesCovered": item.linesCovered,
+			"branchesValid": item.branchesValid,
+			"branchesCovered": item.branchesCovered,
+		}
+
+
+#: Writer classes by format name.
+WRITERS: Dict[str, Type[CoverageWriter]] = {
+	"cobertura": CoberturaWriter,
+	"lcov":      LcovWriter,
+	"json":      JsonWriter,
+}
+
+
+@export  # type: ignore[type-var]
+def writeCoverage(coverage: Coverage, writers: Iterable[CoverageWriter]) -> None:
+	"""
+	Writes a coverage model with multiple writers in a single traversal.
+
+	:param coverage: Coverage model to write.
+	:param writers:  Writers, each writing to its own stream.
+	"""
+	writers = list(writers)
+	coverage.refreshStatistics()
+
+	for writer in writers:
+		writer.begin(coverage)
+
+	for package in coverage.packages.values():
+		for writer in writers:
+			writer.writePackage(package)
+
+	for writer in writers:
+		writer.end(coverage)
@@ -0,0 +1,194 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Generator of synthetic UCDB files in Aldec's UCIS XML format.
+
+The generated files mimic the structure of UCDB files written by ``acdb2xml``: design unit scopes followed by an
+instance hierarchy, whose instance scopes contain the statement bins.
+
+.. rubric:: Usage
+
+.. code-block::
+
+   python -m tests.benchmark.Generator --bins 1000000 --output ucdb.xml
+"""
+from argparse import ArgumentParser
+from pathlib  import Path
+from random   import Random
+from typing   import TextIO
+
+
+HEADER = """\
+<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<ux:ucdb version="Riviera-PRO 2022.04" xmlns:ux="www.aldec.com">
+<ux:attr key="path_separator" type="str">/</ux:attr>
+<ux:attr key="hier_mode" type="int">1</ux:attr>
+"""
+FOOTER = """\
+</ux:ucdb>
+"""
+WORKDIR = "/builds/synthetic/project"
+
+
+class UcdbGenerator:
+	"""
+	Writes a synthetic UCDB file.
+
+	``instances`` instances of ``designUnits`` design units are arranged in chains of nested instances, each
+	``depth`` levels deep. Each instance contains ``binsPerScope`` statement bins spread over the design unit's source
+	file. Statements are covered with probability ``coverRatio`` and excluded with probability ``excludeRatio``.
+	"""
+
+	instances: int
+	designUnits: int
+	depth: int
+	binsPerScope: int
+	files: int
+	excludeRatio: float
+	coverRatio: float
+	seed: int
+
+	def __init__(
+		self,
+		bins: int = 10000,
+		binsPerScope: int = 100,
+		designUnits: int = 20,
+		depth: int = 4,
+		files: int = 10,
+		excludeRatio: float = 0.05,
+		coverRatio: float = 0.8,
+		seed: int = 0
+	):
+		"""
+		Initializes a generator.
+
+		:param bins:         Total number of statement bins. It's rounded up to a multiple of ``binsPerScope``.
+		:param binsPerScope: Number of statement bins per instance scope.
+		:param designUnits:  Number of design units.
+		:param depth:        Nesting depth of the instance hierarchy.
+		:param files:        Number of source files. Design units are distributed over these files.
+		:param excludeRatio: Ratio of excluded statement bins.
+		:param coverRatio:   Ratio of covered statement bins.
+		:param seed:         Seed of the random number generator.
+		"""
+		self.instances = max(1, -(-bins // binsPerScope))
+		self.binsPerScope = binsPerScope
+		self.designUnits = max(1, min(designUnits, self.instances))
+		self.depth = max(1, depth)
+		self.files = max(1, min(files, self.designUnits))
+		self.excludeRatio = excludeRatio
+		self.coverRatio = coverRatio
+		self.seed = seed
+
+	@property
+	def Bins(self) -> int:
+		return self.instances * self.binsPerScope
+
+	def _getFile(self, designUnit: int) -> str:
+		return f"src/file{designUnit % self.files}.sv"
+
+	def _getFirstLine(self, designUnit: int) -> int:
+		# Design units sharing a source file occupy consecutive line ranges.
+		return 1 + (designUnit // self.files) * (self.binsPerScope + 10)
+
+	def _writeBins(self, stream: TextIO, designUnit: int, random: Random) -> None:
+		file = self._getFile(designUnit)
+		firstLine = self._getFirstLine(designUnit) + 1
+
+		for bin in range(self.binsPerScope):
+			# Every fourth line contains two statements.
+			line = firstLine + bin - bin // 4
+			index = 2 if bin % 4 == 3 else 1
+			flags = "00000020" if random.random() < self.excludeRatio else "00000001"
+			count = random.randint(1, 100) if random.random() < self.coverRatio else 0
+
+			stream.write(
+				f'<ux:bin name="" type="STMTBIN" flags="{flags}">\n'
+				f'<ux:attr key="#GOAL#" type="int">1</ux:attr>\n'
+				f'<ux:attr key="#SINDEX#" type="int">{index}</ux:attr>\n'
+				f'<ux:count type="int">{count}</ux:count>\n'
+				f'<ux:src file="{file}" workdir="{WORKDIR}" line="{line}" token="1"/>\n'
+				f'</ux:bin>\n'
+			)
+
+	def write(self, stream: TextIO) -> None:
+		"""Writes the synthetic UCDB file to a text stream."""
+		random = Random(self.seed)
+
+		stream.write(HEADER)
+		for designUnit in range(self.designUnits):
+			stream.write(
+				f'<ux:scope name="work.U{designUnit}" type="DU_MODULE" weight="1" lang="VLOG" flags="00000001">\n'
+				f'<ux:src file="{self._getFile(designUnit)}" workdir="{WORKDIR}" line="{self._getFirstLine(designUnit)}" token="1"/>\n'
+				f'</ux:scope>\n'
+			)
+
+		for instance in range(self.instances):
+			designUnit = instance % self.designUnits
+			stream.write(
+				f'<ux:scope name="i{instance}" type="INSTANCE" weight="1" lang="VLOG" flags="00000001" du="work.U{designUnit}">\n'
+				f'<ux:src file="{self._getFile(designUnit)}" workdir="{WORKDIR}" line="{self._getFirstLine(designUnit)}" token="1"/>\n'
+			)
+			self._writeBins(stream, designUnit, random)
+
+			# Close the chain of nested instances after each 'depth' levels.
+			if instance % self.depth == self.depth - 1 or instance == self.instances - 1:
+				stream.write("</ux:scope>\n" * (instance % self.depth + 1))
+
+		stream.write(FOOTER)
+
+	def writeFile(self, path: Path) -> None:
+		"""Writes the synthetic UCDB file."""
+		with path.open("w", encoding="utf-8") as file:
+			self.write(file)
+
+
+def main() -> None:
+	argumentParser = ArgumentParser(description="Generate a synthetic UCDB file in UCIS format (XML).")
+	argumentParser.add_argument("--output",         type=Path,  required=True,  help="UCDB file to write.")
+	argumentParser.add_argument("--bins",           type=int,   default=10000,  help="Total number of statement bins.")
+	argumentParser.add_argument("--bins-per-scope", type=int,   default=100,    help="Statement bins per instance.")
+	argumentParser.add_argument("--design-units",   type=int,   default=20,     help="Number of design units.")
+	argumentParser.add_argument("--depth",          type=int,   default=4,      help="Depth of the instance hierarchy.")
+	argumentParser.add_argument("--files",          type=int,   default=10,     help="Number of source files.")
+	argumentParser.add_argument("--exclude-ratio",  type=float, default=0.05,   help="Ratio of excluded statement bins.")
+	argumentParser.add_argument("--cover-ratio",    type=float, default=0.8,    help="Ratio of covered statement bins.")
+	argumentParser.add_argument("--seed",           type=int,   default=0,      help="Seed of the random number generator.")
+	args = argumentParser.parse_args()
+
+	generator = UcdbGenerator(
+		args.bins, args.bins_per_scope, args.design_units, args.depth, args.files, args.exclude_ratio, args.cover_ratio, args.seed
+	)
+	generator.writeFile(args.output)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,109 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Benchmarks of merging Cobertura coverage models.
+
+The in-process merge of :func:`~pyEDAA.UCIS.Cobertura.mergeCoverages` is compared with a tree reduction, which merges
+pairs of models in worker processes. Models are created from synthetic UCDB files of the sizes configured by
+``UCIS_BENCHMARK_BINS`` (see :mod:`tests.benchmark.Scaling`) and the number of models by ``UCIS_BENCHMARK_MODELS``.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io                 import BytesIO
+from typing             import Dict, List, Tuple
+
+import pytest
+
+from pyEDAA.UCIS.Cobertura import Coverage, MergePolicy, mergeCoverages
+from pyEDAA.UCIS.UCDB import Parser
+from tests.benchmark.Generator import UcdbGenerator
+from tests.benchmark.Scaling import BINS
+
+
+MODELS = int(os.environ.get("UCIS_BENCHMARK_MODELS", "16"))
+
+
+@pytest.fixture(scope="session")
+def coberturaFiles(tmp_path_factory) -> Dict[int, bytes]:
+	directory = tmp_path_factory.mktemp("cobertura")
+	files = {}
+	for bins in BINS:
+		ucdbFile = directory / f"ucdb_{bins}.xml"
+		UcdbGenerator(bins, designUnits=max(1, bins // 1000), files=max(1, bins // 4000)).writeFile(ucdbFile)
+
+		stream = BytesIO()
+		Parser(ucdbFile, False, True).getCoberturaModel().writeXml(stream)
+		files[bins] = stream.getvalue()
+
+	return files
+
+
+def _readModels(coberturaFile: bytes) -> List[Coverage]:
+	return [Coverage.read(BytesIO(coberturaFile)) for _ in range(MODELS)]
+
+
+def _mergePair(models: Tuple[Coverage, Coverage]) -> Coverage:
+	model, other = models
+	model.merge(other, MergePolicy.Sum)
+
+	return model
+
+
+def _mergeInProcesses(models: List[Coverage]) -> Coverage:
+	for model in models:
+		model.refreshStatistics()
+
+	with ProcessPoolExecutor() as executor:
+		while len(models) > 1:
+			merged = list(executor.map(_mergePair, zip(models[0::2], models[1::2])))
+			if len(models) % 2 == 1:
+				merged.append(models[-1])
+			models = merged
+
+	return models[0]
+
+
+@pytest.mark.parametrize("bins", BINS)
+def test_MergeInProcess(benchmark, coberturaFiles, bins):
+	benchmark.extra_info["bins"] = bins
+	benchmark.extra_info["models"] = MODELS
+	merged = benchmark.pedantic(lambda models: mergeCoverages(models, MergePolicy.Sum), setup=lambda: ((_readModels(coberturaFiles[bins]), ), {}), rounds=3)
+
+	assert merged.linesValid > 0
+
+
+@pytest.mark.parametrize("bins", BINS)
+def test_MergeInProcesses(benchmark, coberturaFiles, bins):
+	benchmark.extra_info["bins"] = bins
+	benchmark.extra_info["models"] = MODELS
+	merged = benchmark.pedantic(_mergeInProcesses, setup=lambda: ((_readModels(coberturaFiles[bins]), ), {}), rounds=3)
+
+	assert merged.linesValid > 0
@@ -0,0 +1,141 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Scaling benchmarks of parsing, statement extraction, aggregation and Cobertura serialization.
+
+Synthetic UCDB files are created by :class:`~tests.benchmark.Generator.UcdbGenerator`. The sizes (number of statement
+bins) are configured by the environment variable ``UCIS_BENCHMARK_BINS`` as a comma separated list, e.g.:
+
+.. code-block::
+
+   UCIS_BENCHMARK_BINS=10000,100000,1000000,10000000 pytest tests/benchmark --benchmark-json=benchmark.json
+
+Peak memory usage (RSS) of a complete conversion is measured in a subprocess and reported as ``peakRSS`` in the
+benchmark's extra information.
+"""
+import os
+import subprocess
+import sys
+from io      import BytesIO
+from pathlib import Path
+from typing  import Dict, Tuple
+
+import pytest
+from lxml    import etree
+
+from pyEDAA.UCIS.Store import StatementStore
+from pyEDAA.UCIS.UCDB import Parser
+from tests.benchmark.Generator import UcdbGenerator
+
+
+BINS = [int(bins) for bins in os.environ.get("UCIS_BENCHMARK_BINS", "10000,100000").split(",")]
+MODES = {"dom": False, "streaming": True}
+
+PEAK_RSS_SCRIPT = """\
+import resource, sys
+from pathlib import Path
+from pyEDAA.UCIS.UCDB import Parser
+
+parser = Parser(Path(sys.argv[1]), sys.argv[2] == "merged", streaming=sys.argv[3] == "streaming")
+with open(sys.argv[4], "wb") as file:
+	parser.getCoberturaModel().writeXml(file)
+
+maxRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(maxRSS if sys.platform == "darwin" else maxRSS * 1024)
+"""
+
+
+@pytest.fixture(scope="session")
+def ucdbFiles(tmp_path_factory) -> Dict[int, Path]:
+	directory = tmp_path_factory.mktemp("ucdb")
+	files = {}
+	for bins in BINS:
+		files[bins] = directory / f"ucdb_{bins}.xml"
+		# Scale the design size with the number of bins: 10 instances per design unit, 4 design units per file.
+		UcdbGenerator(bins, designUnits=max(1, bins // 1000), files=max(1, bins // 4000)).writeFile(files[bins])
+
+	return files
+
+
+def _extract(ucdbFile: Path, streaming: bool, mergeInstances: bool = False) -> Tuple[Parser, StatementStore]:
+	parser = Parser(ucdbFile, mergeInstances, streaming)
+	return parser, parser._extractStatements()
+
+
+@pytest.mark.parametrize("bins", BINS)
+def test_Parse(benchmark, ucdbFiles, bins):
+	benchmark.extra_info["bins"] = bins
+	benchmark.pedantic(etree.parse, args=(str(ucdbFiles[bins]), ), rounds=3)
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("bins", BINS)
+def test_Extract(benchmark, ucdbFiles, bins, mode):
+	benchmark.extra_info["bins"] = bins
+	parser, statements = benchmark.pedantic(_extract, args=(ucdbFiles[bins], MODES[mode]), rounds=3)
+
+	assert len(statements) <= bins
+
+
+@pytest.mark.parametrize("mergeInstances", (False, True))
+@pytest.mark.parametrize("bins", BINS)
+def test_Aggregate(benchmark, ucdbFiles, bins, mergeInstances):
+	_, statements = _extract(ucdbFiles[bins], True)
+
+	def setup():
+		return (Parser(ucdbFiles[bins], mergeInstances), ), {}
+
+	def aggregate(parser: Parser):
+		parser._aggregateStatements(statements)
+
+	benchmark.extra_info["bins"] = bins
+	benchmark.pedantic(aggregate, setup=setup, rounds=3)
+
+
+@pytest.mark.parametrize("bins", BINS)
+def test_Serialize(benchmark, ucdbFiles, bins):
+	model = Parser(ucdbFiles[bins], False, True).getCoberturaModel()
+
+	benchmark.extra_info["bins"] = bins
+	benchmark.pedantic(lambda: model.writeXml(BytesIO()), rounds=3)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Peak RSS is measured with module 'resource'.")
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("bins", BINS)
+def test_PeakRSS(benchmark, ucdbFiles, tmp_path, bins, mode):
+	command = [sys.executable, "-c", PEAK_RSS_SCRIPT, str(ucdbFiles[bins]), "instances", mode, str(tmp_path / "cobertura.xml")]
+
+	def convert() -> int:
+		return int(subprocess.run(command, check=True, stdout=subprocess.PIPE, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}).stdout)
+
+	benchmark.extra_info["bins"] = bins
+	benchmark.extra_info["peakRSS"] = benchmark.pedantic(convert, rounds=1)
@@ -0,0 +1,78 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""
+Startup benchmarks of the ``pyedaa-ucis`` entry point.
+
+Each round starts a new Python interpreter. The import time of :mod:`pyEDAA.UCIS.CLI` is measured with ``-X importtime``
+and reported as ``importTime`` (in microseconds) in the benchmark's extra information:
+
+.. code-block::
+
+   pytest tests/benchmark/Startup.py --benchmark-json=startup.json
+"""
+import os
+import re
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+
+COMMANDS = {"version": ["version"], "help": ["help"], "export-help": ["help", "export"]}
+
+MAIN_SCRIPT = "import sys; from pyEDAA.UCIS.CLI import main; sys.argv[0] = 'pyedaa-ucis'; main()"
+
+
+def _run(arguments: List[str]) -> subprocess.CompletedProcess:
+	return subprocess.run(
+		[sys.executable, *arguments],
+		check=True,
+		stdout=subprocess.PIPE,
+		stderr=subprocess.PIPE,
+		env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+		universal_newlines=True
+	)
+
+
+def _getImportTime() -> int:
+	"""Returns the cumulative import time of the CLI module in microseconds."""
+	stderr = _run(["-X", "importtime", "-c", "import pyEDAA.UCIS.CLI"]).stderr
+	match = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| pyEDAA\.UCIS\.CLI$", stderr, re.MULTILINE)
+
+	return int(match.group(1))
+
+
+@pytest.mark.parametrize("command", COMMANDS)
+def test_Startup(benchmark, command):
+	benchmark.extra_info["importTime"] = _getImportTime()
+	benchmark.pedantic(_run, args=(["-c", MAIN_SCRIPT, *COMMANDS[command]], ), rounds=10, warmup_rounds=1)
+
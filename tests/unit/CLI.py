@@ -29,8 +29,15 @@
 # ==================================================================================================================== #
 #
 """Testcase for CLI tests."""
+import gzip
+import json
+import subprocess
 import sys
-from io            import StringIO
+from io            import BytesIO, StringIO
+from pathlib       import Path
+from shutil        import copyfile
+from tempfile      import TemporaryDirectory
+from types         import SimpleNamespace
 from unittest      import TestCase
 from unittest.mock import patch
 
@@ -137,6 +144,14 @@ class Version(TestCase):
 		self.assertIn("Version:", stdout)
 		self.assertEqual("", stderr)
 
+	def test_LazyImports(self):
+		script = "import sys; from pyEDAA.UCIS.CLI import main; sys.argv = ['pyedaa-ucis', 'version']; main(); print(sorted(sys.modules))"
+		output = subprocess.run([sys.executable, "-c", script], check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+		modules = output.splitlines()[-1]
+		for module in ("'lxml'", "'sqlite3'", "'pyEDAA.UCIS.UCDB'", "'pyEDAA.UCIS.Cobertura'"):
+			self.assertNotIn(module, modules)
+
 
 class Export(TestCase):
 	_program: Program
@@ -174,3 +189,307 @@ class Export(TestCase):
 		self.assertIn("UCDB Service Program", stdout)
 		self.assertIn("ERROR", stdout)
 		self.assertEqual("", stderr)
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_ExportCommandWithGlob(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			coberturaPath = Path(tempDirectory) / "cobertura.xml"
+			sys.argv = [PROGRAM, "export", "--ucdb", "tests/data/ucdb00*.xml", "--cobertura", str(coberturaPath), "--jobs", "2"]
+
+			self._program.Run()
+
+			self.assertTrue(coberturaPath.exists())
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("ucdb000_multiple_instances.xml", stdout)
+		self.assertIn("ucdb002_partially_excluded.xml", stdout)
+		self.assertIn("[DONE]", stdout)
+		self.assertEqual("", stderr)
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_ExportCommandFromStdin(self, stdoutStream: StringIO, stderrStream: StringIO):
+		stdin = SimpleNamespace(buffer=BytesIO(gzip.compress(Path("tests/data/ucdb.xml").read_bytes())))
+
+		with TemporaryDirectory() as tempDirectory, patch("sys.stdin", stdin):
+			coberturaPath = Path(tempDirectory) / "cobertura.xml"
+			sys.argv = [PROGRAM, "export", "--ucdb", "-", "--cobertura", str(coberturaPath), "--streaming"]
+
+			self._program.Run()
+
+			self.assertTrue(coberturaPath.exists())
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("<stdin>", stdout)
+		self.assertIn("[DONE]", stdout)
+		self.assertEqual("", stderr)
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_ExportCommandWithProfile(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			coberturaPath = Path(tempDirectory) / "cobertura.xml"
+			profilePath = Path(tempDirectory) / "profile.json"
+			sys.argv = [PROGRAM, "export", "--ucdb", "tests/data/ucdb.xml", "--cobertura", str(coberturaPath), "--profile", "--profile-json", str(profilePath)]
+
+			self._program.Run()
+
+			profile = json.loads(profilePath.read_text())
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("Profile:", stdout)
+		self.assertEqual(["parse", "extract", "aggregate", "serialize"], [phase["name"] for phase in profile["phases"]])
+		self.assertIn("bins", profile["counters"])
+		self.assertFalse(profile["memoryTraced"])
+		self.assertIsNone(profile["phases"][0]["peakMemory"])
+		self.assertEqual("", stderr)
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_ExportCommandWithMemoryProfile(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			coberturaPath = Path(tempDirectory) / "cobertura.xml"
+			sys.argv = [PROGRAM, "export", "--ucdb", "tests/data/ucdb.xml", "--cobertura", str(coberturaPath), "--profile-memory"]
+
+			self._program.Run()
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("Profile:", stdout)
+		self.assertIn("Times are inflated", stdout)
+		self.assertEqual("", stderr)
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_ExportCommandSharded(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			copyfile("tests/data/ucdb000_multiple_instances.xml", ucdbPath)
+			coberturaPath = Path(tempDirectory) / "cobertura.xml"
+			sys.argv = [PROGRAM, "export", "--ucdb", str(ucdbPath), "--cobertura", str(coberturaPath), "--sharded", "--jobs", "2"]
+
+			self._program.Run()
+
+			self.assertTrue(coberturaPath.exists())
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("[DONE]", stdout)
+		self.assertEqual("", stderr)
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_ExportCommandSkipCoveredUnitsRejected(self, stdoutStream: StringIO, stderrStream: StringIO):
+		for options, message in (
+			(["--ucdb", "tests/data/ucdb.xml", "--sharded"], "can't be combined with '--sharded'"),
+			(["--ucdb", "tests/data/ucdb.xml", "tests/data/ucdb000_multiple_instances.xml"], "can't be applied to multiple UCDB files"),
+		):
+			with self.subTest(options=options):
+				sys.argv = [PROGRAM, "export", *options, "--cobertura", "cobertura.xml", "--merge-instances", "--skip-covered-units"]
+
+				with self.assertRaises(SystemExit) as ex:
+					self._program.Run()
+
+				self.assertEqual(3, ex.exception.code)
+				self.assertIn(message, stdoutStream.getvalue())
+				self.assertFalse(Path("cobertura.xml").exists())
+
+		self.assertEqual("", stderrStream.getvalue())
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_ExportCommandMultipleFormats(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			lcovPath = Path(tempDirectory) / "coverage.info"
+			jsonPath = Path(tempDirectory) / "coverage.json"
+			sys.argv = [PROGRAM, "export", "--ucdb", "tests/data/ucdb.xml", "--lcov", str(lcovPath), "--json", str(jsonPath)]
+
+			self._program.Run()
+
+			self.assertIn("end_of_record", lcovPath.read_text())
+			self.assertIn("packages", json.loads(jsonPath.read_text()))
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("OUT <- LCOV:", stdout)
+		self.assertIn("[DONE]", stdout)
+		self.assertEqual("", stderr)
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_ExportCommandWithExclusions(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			rulePath = Path(tempDirectory) / "waivers.txt"
+			rulePath.write_text("instance top.dut.m2\nfile *_tb.sv\n")
+			coberturaPath = Path(tempDirectory) / "cobertura.xml"
+			sys.argv = [PROGRAM, "export", "--ucdb", "tests/data/ucdb000_multiple_instances.xml", "--cobertura", str(coberturaPath), "--exclusions", str(rulePath)]
+
+			self._program.Run()
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("Exclusions:", stdout)
+		self.assertIn("10  line 1: instance top.dut.m2", stdout)
+		self.assertIn("0  line 2: file *_tb.sv", stdout)
+		self.assertEqual("", stderr)
+
+
+class Ingest(TestCase):
+	_program: Program
+
+	def setUp(self) -> None:
+		self._program = Program()
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_IngestAndExport(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			databasePath = Path(tempDirectory) / "coverage.db"
+			coberturaPath = Path(tempDirectory) / "cobertura.xml"
+
+			sys.argv = [PROGRAM, "ingest", "--ucdb", "tests/data/ucdb00*.xml", "--database", str(databasePath), "--jobs", "1"]
+			self._program.Run()
+
+			# The same file given by another path.
+			sys.argv = [PROGRAM, "ingest", "--ucdb", str(Path("tests/data/ucdb000_multiple_instances.xml").resolve()), "--database", str(databasePath)]
+			self._program.Run()
+
+			sys.argv = [PROGRAM, "export", "--database", str(databasePath), "--cobertura", str(coberturaPath)]
+			self._program.Run()
+
+			self.assertTrue(coberturaPath.exists())
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("Tests in database: 3", stdout)
+		self.assertIn(f"SKIP -> Same content was already ingested as '{Path('tests/data/ucdb000_multiple_instances.xml').resolve()}'", stdout)
+		self.assertIn("Ingested files: 0", stdout)
+		self.assertIn("[DONE] Export", stdout)
+		self.assertEqual("", stderr)
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_IngestRegeneratedFile(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			databasePath = Path(tempDirectory) / "coverage.db"
+			ucdbPath = Path(tempDirectory) / "run.xml"
+
+			copyfile("tests/data/ucdb000_multiple_instances.xml", ucdbPath)
+			sys.argv = [PROGRAM, "ingest", "--ucdb", str(ucdbPath), str(ucdbPath), "--database", str(databasePath)]
+			self._program.Run()
+
+			# A regenerated run reusing the path.
+			copyfile("tests/data/ucdb002_partially_excluded.xml", ucdbPath)
+			sys.argv = [PROGRAM, "ingest", "--ucdb", str(ucdbPath), "--database", str(databasePath)]
+			self._program.Run()
+
+		stdout = stdoutStream.getvalue()
+		self.assertIn(f"SKIP -> Same content as '{ucdbPath}': {ucdbPath}", stdout)
+		self.assertEqual(2, stdout.count("Ingested files: 1"))
+		self.assertIn("Tests in database: 2", stdout)
+		self.assertEqual("", stderrStream.getvalue())
+
+
+class Query(TestCase):
+	_program: Program
+
+	def setUp(self) -> None:
+		self._program = Program()
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_QueryInstance(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			ucdbPath.write_bytes(Path("tests/data/ucdb002_partially_excluded.xml").read_bytes())
+
+			sys.argv = [PROGRAM, "index", "--ucdb", str(ucdbPath)]
+			self._program.Run()
+
+			self.assertTrue(Path(tempDirectory, "ucdb.xml.idx").exists())
+
+			sys.argv = [PROGRAM, "query", "--ucdb", str(ucdbPath), "--list", "--instance", "top"]
+			self._program.Run()
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("[DONE] Indexing complete.", stdout)
+		self.assertIn("Instance: top", stdout)
+		self.assertIn("Statement coverage:", stdout)
+		self.assertEqual("", stderr)
+
+
+class Merge(TestCase):
+	_program: Program
+
+	def setUp(self) -> None:
+		self._program = Program()
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_MergeCobertura(self, stdoutStream: StringIO, stderrStream: StringIO):
+		with TemporaryDirectory() as tempDirectory:
+			inputPaths = []
+			for fileName in ("ucdb000_multiple_instances.xml", "ucdb002_partially_excluded.xml"):
+				inputPath = Path(tempDirectory) / f"{fileName}.cobertura.xml"
+				sys.argv = [PROGRAM, "export", "--ucdb", f"tests/data/{fileName}", "--cobertura", str(inputPath), "--gzip"]
+				self._program.Run()
+				inputPaths.append(str(inputPath))
+
+			coberturaPath = Path(tempDirectory) / "merged.xml"
+			sys.argv = [PROGRAM, "merge", "--input", *inputPaths, "--cobertura", str(coberturaPath), "--policy", "sum"]
+
+			self._program.Run()
+
+			self.assertTrue(coberturaPath.exists())
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("Merged files: 2", stdout)
+		self.assertIn("[DONE] Merge complete.", stdout)
+		self.assertEqual("", stderr)
+
+
+class Rank(TestCase):
+	_program: Program
+
+	def setUp(self) -> None:
+		self._program = Program()
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_RankTests(self, stdoutStream: StringIO, stderrStream: StringIO):
+		sys.argv = [PROGRAM, "rank", "--ucdb", "tests/data/*.xml", "--jobs", "1"]
+
+		self._program.Run()
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("Selected tests: 3 of 4", stdout)
+		self.assertIn("[DONE] Ranking complete.", stdout)
+		self.assertEqual("", stderr)
+
+
+class Diff(TestCase):
+	_program: Program
+
+	def setUp(self) -> None:
+		self._program = Program()
+
+	@patch('sys.stderr', new_callable=StringIO)
+	@patch('sys.stdout', new_callable=StringIO)
+	def test_DiffUcdbFiles(self, stdoutStream: StringIO, stderrStream: StringIO):
+		sys.argv = [PROGRAM, "diff", "--old", "tests/data/ucdb002_partially_excluded.xml", "--new", "tests/data/ucdb000_multiple_instances.xml"]
+
+		self._program.Run()
+
+		stdout = stdoutStream.getvalue()
+		stderr = stderrStream.getvalue()
+		self.assertIn("  + dut.sv:6", stdout)
+		self.assertIn("  - dut006b.sv:8", stdout)
+		self.assertIn("[DONE] Comparison complete.", stdout)
+		self.assertEqual("", stderr)
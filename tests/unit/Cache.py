@@ -0,0 +1,146 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for the persistent statement cache."""
+import os
+from pathlib      import Path
+from shutil       import copyfile
+from tempfile     import TemporaryDirectory
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Cache import StatementCache
+from pyEDAA.UCIS.UCDB  import Parser
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+class Cache(TestCase):
+	_ucdbPath = Path("tests/data/ucdb000_multiple_instances.xml")
+
+	def test_LoadAfterSave(self):
+		with TemporaryDirectory() as tempDirectory:
+			cache = StatementCache(Path(tempDirectory))
+
+			self.assertIsNone(cache.load(self._ucdbPath))
+
+			for mergeInstances, statementsCount in ((False, 15), (True, 9), (False, 15)):
+				parser = Parser(self._ucdbPath, mergeInstances, cache=cache)
+				model = parser.getCoberturaModel()
+				model.refreshStatistics()
+
+				self.assertEqual(statementsCount, parser.statementsCount)
+				self.assertEqual(7, model.linesValid)
+				self.assertEqual(6, model.linesCovered)
+				self.assertEqual(1, len(model.sources))
+
+			sources, statements = cache.load(self._ucdbPath)
+			# 15 statement bins and 10 branch bins
+			self.assertEqual(15 + 10, len(statements))
+
+	def test_ModifiedFile(self):
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			copyfile(self._ucdbPath, ucdbPath)
+			cache = StatementCache(Path(tempDirectory) / "cache")
+
+			Parser(ucdbPath, False, cache=cache).getCoberturaModel()
+			self.assertIsNotNone(cache.load(ucdbPath))
+
+			copyfile(Path("tests/data/ucdb002_partially_excluded.xml"), ucdbPath)
+			os.utime(ucdbPath, ns=(0, 0))
+			self.assertIsNone(cache.load(ucdbPath))
+
+			parser = Parser(ucdbPath, False, cache=cache)
+			parser.getCoberturaModel()
+			self.assertEqual(5, parser.statementsCount)
+
+	def test_Eviction(self):
+		with TemporaryDirectory() as tempDirectory:
+			cache = StatementCache(Path(tempDirectory), maxSize=0)
+
+			Parser(self._ucdbPath, False, cache=cache).getCoberturaModel()
+
+			self.assertEqual([], list(Path(tempDirectory).glob("*.stmts")))
+			self.assertIsNone(cache.load(self._ucdbPath))
+
+	def test_EvictionRemovesMetadata(self):
+		with TemporaryDirectory() as tempDirectory:
+			cacheDirectory = Path(tempDirectory) / "cache"
+			cache = StatementCache(cacheDirectory, maxSize=0)
+
+			Parser(self._ucdbPath, False, cache=cache).getCoberturaModel()
+
+			self.assertEqual([], list(cacheDirectory.glob("*.stmts")))
+			self.assertEqual([], list(cacheDirectory.glob("*.meta")))
+
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			copyfile(Path("tests/data/ucdb002_partially_excluded.xml"), ucdbPath)
+			cache.maxSize = 1024 ** 2
+			Parser(self._ucdbPath, False, cache=cache).getCoberturaModel()
+			Parser(ucdbPath, False, cache=cache).getCoberturaModel()
+			self.assertEqual(2, len(list(cacheDirectory.glob("*.meta"))))
+
+			# Keep only the most recently used entry.
+			cache.maxSize = cache._getEntryPath(cache.getContentHash(ucdbPath)).stat().st_size
+			os.utime(cache._getEntryPath(cache.getContentHash(self._ucdbPath)), ns=(0, 0))
+			cache.evict()
+
+			self.assertEqual(1, len(list(cacheDirectory.glob("*.stmts"))))
+			self.assertEqual(1, len(list(cacheDirectory.glob("*.meta"))))
+			self.assertIsNotNone(cache.load(ucdbPath))
+
+	def test_EvictionGracePeriod(self):
+		with TemporaryDirectory() as tempDirectory:
+			cacheDirectory = Path(tempDirectory) / "cache"
+			cache = StatementCache(cacheDirectory)
+
+			# Metadata written by a worker, which hasn't saved its entry yet.
+			cache.getContentHash(self._ucdbPath)
+			recentTemporaryPath = cacheDirectory / "recent.tmp"
+			recentTemporaryPath.write_bytes(b"")
+			staleTemporaryPath = cacheDirectory / "stale.tmp"
+			staleTemporaryPath.write_bytes(b"")
+			os.utime(staleTemporaryPath, ns=(0, 0))
+
+			cache.evict()
+
+			self.assertEqual(1, len(list(cacheDirectory.glob("*.meta"))))
+			self.assertEqual([recentTemporaryPath], list(cacheDirectory.glob("*.tmp")))
+
+			# Metadata without an entry is removed after the grace period.
+			for metadataPath in cacheDirectory.glob("*.meta"):
+				os.utime(metadataPath, ns=(0, 0))
+			cache.evict()
+
+			self.assertEqual([], list(cacheDirectory.glob("*.meta")))
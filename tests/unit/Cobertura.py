@@ -0,0 +1,249 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for the Cobertura data model."""
+from gzip         import GzipFile
+from io           import BytesIO
+from unittest     import TestCase
+
+from lxml         import etree
+
+from pyEDAA.UCIS.Cobertura import Class, Coverage, Package, MergePolicy, CoberturaException, mergeCoverages
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+def _createCoverage() -> Coverage:
+	coverage = Coverage()
+	coverage.addSource("/project")
+
+	for packageIndex in range(3):
+		package = Package(f"file{packageIndex}.sv")
+		coberturaClass = Class(package.name, package.name)
+		for line in range(1, 11):
+			coberturaClass.addStatement(line, line % (packageIndex + 2) != 0)
+		package.addClass(coberturaClass)
+		coverage.addPackage(package)
+
+	return coverage
+
+
+def _createModel(packageName: str, lines) -> Coverage:
+	coverage = Coverage()
+	coverage.addSource(f"/{packageName}")
+
+	package = Package(packageName)
+	coberturaClass = Class(packageName, packageName)
+	for line, hits in lines.items():
+		coberturaClass.addStatement(line, hits)
+	package.addClass(coberturaClass)
+	coverage.addPackage(package)
+	coverage.refreshStatistics()
+
+	return coverage
+
+
+class Writer(TestCase):
+	def test_WriteXmlMatchesTree(self):
+		coverage = _createCoverage()
+
+		stream = BytesIO()
+		coverage.writeXml(stream)
+		coverageNode = etree.fromstring(stream.getvalue(), etree.XMLParser(remove_blank_text=True))
+
+		self.assertEqual("coverage", coverageNode.tag)
+		self.assertEqual("30", coverageNode.get("lines-valid"))
+		self.assertEqual(str(coverage.linesCovered), coverageNode.get("lines-covered"))
+		self.assertEqual(["/project"], [source.text for source in coverageNode.iterfind("sources/source")])
+
+		for package in coverage.packages.values():
+			packageNode = coverageNode.find(f"packages/package[@name='{package.name}']")
+			expectedNode = package.getXmlNode()
+
+			self.assertEqual(etree.tostring(expectedNode), etree.tostring(packageNode))
+
+	def test_WriteGzip(self):
+		coverage = _createCoverage()
+
+		stream = BytesIO()
+		with GzipFile(fileobj=stream, mode="wb") as file:
+			coverage.writeXml(file)
+
+		with GzipFile(fileobj=BytesIO(stream.getvalue()), mode="rb") as file:
+			content = file.read()
+
+		self.assertEqual(coverage.getXml().split(b"\n", 2)[2], content.split(b"\n", 2)[2])
+
+	def test_Branches(self):
+		coberturaClass = Class("file.sv", "file.sv")
+		coberturaClass.addStatement(10, 1)
+		coberturaClass.addStatement(11, 1)
+		coberturaClass.addBranches(10, 3, 2)
+
+		classNode = coberturaClass.getXmlNode()
+
+		self.assertEqual("0.6666666666666666", classNode.get("branch-rate"))
+		lineNode = classNode.find("lines/line[@number='10']")
+		self.assertEqual("true", lineNode.get("branch"))
+		self.assertEqual("66% (2/3)", lineNode.get("condition-coverage"))
+		self.assertEqual("66%", lineNode.find("conditions/condition").get("coverage"))
+		self.assertIsNone(classNode.find("lines/line[@number='11']").get("branch"))
+
+
+class Reader(TestCase):
+	def test_RoundTrip(self):
+		coverage = _createModel("a.sv", {1: 0, 2: 3, 3: 1})
+		coverage.addPackage(_createModel("b.sv", {5: 0}).packages["b.sv"])
+		coverage.packages["a.sv"].classes["a.sv"].addBranches(2, 4, 1)
+
+		stream = BytesIO()
+		with GzipFile(fileobj=stream, mode="wb") as file:
+			coverage.writeXml(file)
+
+		with GzipFile(fileobj=BytesIO(stream.getvalue()), mode="rb") as file:
+			model = Coverage.read(file)
+
+		self.assertEqual({"/a.sv"}, model.sources)
+		self.assertEqual(["a.sv", "b.sv"], list(model.packages))
+		self.assertEqual({1: 0, 2: 3, 3: 1}, model.packages["a.sv"].classes["a.sv"].lines)
+		self.assertEqual({2: (4, 1)}, model.packages["a.sv"].classes["a.sv"].branches)
+		self.assertEqual((4, 2, 4, 1), (model.linesValid, model.linesCovered, model.branchesValid, model.branchesCovered))
+
+	def test_IgnoresMethodLines(self):
+		content = b"""<?xml version="1.0" ?>
+<coverage line-rate="0.5"><sources><source> /src </source></sources><packages>
+<package name="pkg"><classes><class name="a.py" filename="a.py"><methods><method name="f"><lines>
+<line number="1" hits="1"/></lines></method></methods><lines><line number="1" hits="1"/><line number="2" hits="0"/></lines>
+</class></classes></package></packages></coverage>"""
+
+		model = Coverage.read(BytesIO(content))
+
+		self.assertEqual({"/src"}, model.sources)
+		self.assertEqual({1: 1, 2: 0}, model.packages["pkg"].classes["a.py"].lines)
+		self.assertEqual((2, 1), (model.linesValid, model.linesCovered))
+
+	def test_ZeroBranches(self):
+		content = b"""<?xml version="1.0" ?>
+<coverage><packages><package name="a.sv"><classes><class name="a.sv" filename="a.sv"><lines>
+<line number="1" hits="1" branch="true" condition-coverage="100% (0/0)"/></lines></class></classes></package></packages></coverage>"""
+
+		model = Coverage.read(BytesIO(content))
+		content = model.getXml()
+
+		self.assertIn(b'condition-coverage="100% (0/0)"', content)
+
+	def test_MalformedClass(self):
+		for element, attribute, classContent in (
+			("class", "name",     b'<class filename="a.sv"><lines><line number="1" hits="1"/></lines></class>'),
+			("class", "filename", b'<class name="a.sv"><lines><line number="1" hits="1"/></lines></class>'),
+			("line",  "number",   b'<class name="a.sv" filename="a.sv"><lines><line hits="1"/></lines></class>'),
+			("line",  "hits",     b'<class name="a.sv" filename="a.sv"><lines><line number="1"/></lines></class>'),
+		):
+			with self.subTest(element=element, attribute=attribute):
+				content = b'<coverage><packages><package name="a.sv"><classes>' + classContent + b'</classes></package></packages></coverage>'
+
+				with self.assertRaisesRegex(CoberturaException, f"<{element}> without attribute '{attribute}'"):
+					Coverage.read(BytesIO(content))
+
+		content = b'<coverage><packages><package name="a.sv"><classes><class name="a.sv" filename="a.sv"><lines><line number="1" hits="1" branch="true" condition-coverage="50%"/></lines></class></classes></package></packages></coverage>'
+		with self.assertRaisesRegex(CoberturaException, "Invalid condition coverage"):
+			Coverage.read(BytesIO(content))
+
+	def test_PackageWithoutName(self):
+		content = b'<coverage><packages><package><classes><class name="a.sv" filename="a.sv"/></classes></package></packages></coverage>'
+
+		with self.assertRaisesRegex(CoberturaException, "<package> without attribute 'name' in line 1"):
+			Coverage.read(BytesIO(content))
+
+	def test_InternedNames(self):
+		content = b"""<?xml version="1.0" ?>
+<coverage><packages><package name="a.sv"><classes><class name="a.sv" filename="a.sv"><lines><line number="1" hits="1"/>
+</lines></class></classes></package></packages></coverage>"""
+
+		model = Coverage.read(BytesIO(content))
+		otherModel = Coverage.read(BytesIO(content))
+
+		coberturaClass = model.packages["a.sv"].classes["a.sv"]
+		self.assertIs(model.packages["a.sv"].name, coberturaClass.name)
+		self.assertIs(coberturaClass.name, coberturaClass.sourceFile)
+		self.assertIs(coberturaClass.sourceFile, otherModel.packages["a.sv"].classes["a.sv"].sourceFile)
+
+
+class Merge(TestCase):
+	def test_Policies(self):
+		for policy, expected in (
+			(MergePolicy.Max, {1: 0, 2: 3, 3: 5, 4: 2}),
+			(MergePolicy.Sum, {1: 0, 2: 3, 3: 7, 4: 2}),
+			(MergePolicy.Or,  {1: 0, 2: 1, 3: 1, 4: 1}),
+		):
+			with self.subTest(policy=policy):
+				coverage = _createModel("a.sv", {1: 0, 2: 0, 3: 5})
+				other = _createModel("a.sv", {1: 0, 2: 3, 3: 2, 4: 2})
+
+				coverage.merge(other, policy)
+
+				self.assertEqual(expected, coverage.packages["a.sv"].classes["a.sv"].lines)
+				self.assertEqual((4, 3), (coverage.linesValid, coverage.linesCovered))
+				self.assertEqual({1: 0, 2: 3, 3: 2, 4: 2}, other.packages["a.sv"].classes["a.sv"].lines)
+
+	def test_Statistics(self):
+		coverage = _createModel("a.sv", {1: 0, 2: 1})
+		coverage.packages["a.sv"].classes["a.sv"].addBranches(2, 2, 1)
+		coverage.refreshStatistics()
+		other = _createModel("a.sv", {1: 1, 2: 1})
+		other.packages["a.sv"].classes["a.sv"].addBranches(2, 2, 2)
+		other.addPackage(_createModel("b.sv", {5: 0}).packages["b.sv"])
+		other.refreshStatistics()
+
+		coverage.merge(other)
+		statistics = (coverage.linesValid, coverage.linesCovered, coverage.branchesValid, coverage.branchesCovered)
+		coverage.refreshStatistics()
+
+		self.assertEqual((3, 2, 2, 2), statistics)
+		self.assertEqual(statistics, (coverage.linesValid, coverage.linesCovered, coverage.branchesValid, coverage.branchesCovered))
+		self.assertEqual({"/a.sv"}, coverage.sources)
+		self.assertEqual(["a.sv", "b.sv"], list(coverage.packages))
+
+	def test_MergeCoverages(self):
+		models = [_createModel(f"file{index % 3}.sv", {line: index for line in range(index + 1)}) for index in range(5)]
+
+		merged = mergeCoverages(models, MergePolicy.Sum)
+
+		self.assertIs(models[0], merged)
+		self.assertEqual(["file0.sv", "file1.sv", "file2.sv"], sorted(merged.packages))
+		self.assertEqual({0: 3, 1: 3, 2: 3, 3: 3}, merged.packages["file0.sv"].classes["file0.sv"].lines)
+		self.assertEqual((12, 12), (merged.linesValid, merged.linesCovered))
+		self.assertEqual({f"/file{index}.sv" for index in range(3)}, merged.sources)
+
+		self.assertEqual({}, mergeCoverages([]).packages)
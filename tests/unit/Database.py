@@ -0,0 +1,137 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for the SQLite coverage database."""
+import sqlite3
+from pathlib      import Path
+from tempfile     import TemporaryDirectory
+from unittest     import TestCase
+from unittest.mock import patch
+
+from lxml         import etree
+
+from pyEDAA.UCIS.Cache    import getContentHash
+from pyEDAA.UCIS.Database import CoverageDatabase, DatabaseException, DatabaseParser
+from pyEDAA.UCIS.Store    import StatementStore
+from pyEDAA.UCIS.UCDB     import MultiFileParser, extractStatements
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+class Database(TestCase):
+	_ucdbPaths = [
+		Path("tests/data/ucdb000_multiple_instances.xml"),
+		Path("tests/data/ucdb002_partially_excluded.xml"),
+	]
+
+	def test_IngestAndExport(self):
+		with TemporaryDirectory() as tempDirectory:
+			databasePath = Path(tempDirectory) / "coverage.db"
+
+			# A second test with the same coverage as the first one. Its file differs in a trailing comment.
+			secondTestPath = Path(tempDirectory) / "test2.xml"
+			secondTestPath.write_bytes(self._ucdbPaths[0].read_bytes() + b"<!-- test 2 -->\n")
+			ucdbPaths = self._ucdbPaths + [secondTestPath]
+
+			# Ingest each file with a new connection, like separate CLI calls per test.
+			for ucdbPath, sources, statements in extractStatements(ucdbPaths, jobs=1):
+				with CoverageDatabase(databasePath) as database:
+					database.ingest(str(ucdbPath), getContentHash(ucdbPath), sources, statements)
+
+			with CoverageDatabase(databasePath) as database:
+				self.assertEqual([str(ucdbPath) for ucdbPath in ucdbPaths], database.getTests())
+
+				for mergeInstances in (False, True):
+					with self.subTest(mergeInstances=mergeInstances):
+						expected = MultiFileParser(ucdbPaths, mergeInstances, jobs=1, hitCounts=True)
+						expectedModel = expected.getCoberturaModel()
+
+						parser = DatabaseParser(database, mergeInstances, hitCounts=True)
+						model = parser.getCoberturaModel()
+
+						self.assertEqual(expected.statementsCount, parser.statementsCount)
+						self.assertEqual(expected.statementsCovered, parser.statementsCovered)
+						self.assertEqual(expectedModel.sources, model.sources)
+						self.assertEqual(self._getPackages(expectedModel.getXml()), self._getPackages(model.getXml()))
+
+	def test_DuplicateTest(self):
+		with TemporaryDirectory() as tempDirectory:
+			databasePath = Path(tempDirectory) / "coverage.db"
+			(ucdbPath, sources, statements), = extractStatements(self._ucdbPaths[:1], jobs=1)
+			contentHash = getContentHash(ucdbPath)
+
+			with CoverageDatabase(databasePath) as database:
+				self.assertIsNone(database.findTest(contentHash))
+				database.ingest(str(ucdbPath), contentHash, sources, statements)
+				hits = sum(database.getStatements().hitsColumn)
+
+				self.assertEqual(str(ucdbPath), database.findTest(contentHash))
+				with self.assertRaises(DatabaseException):
+					database.ingest("copy.xml", contentHash, sources, statements)
+
+				self.assertEqual([str(ucdbPath)], database.getTests())
+				self.assertEqual(hits, sum(database.getStatements().hitsColumn))
+
+	def test_SqliteVersion(self):
+		with TemporaryDirectory() as tempDirectory:
+			with patch.object(sqlite3, "sqlite_version_info", (3, 23, 1)):
+				with self.assertRaises(DatabaseException):
+					CoverageDatabase(Path(tempDirectory) / "coverage.db")
+
+	def test_ManyInstances(self):
+		# More instance paths than looked up by a single query.
+		statements = StatementStore()
+		fileId = statements.getFileId("a.sv")
+		for i in range(1234):
+			statements.append(fileId, 1, 0, statements.getInstanceId(f"top.u{i}"), i)
+
+		with TemporaryDirectory() as tempDirectory:
+			with CoverageDatabase(Path(tempDirectory) / "coverage.db") as database:
+				database.ingest("test", "0" * 40, [], statements)
+
+				self.assertEqual(list(statements), list(database.getStatements()))
+
+	def test_OlderSchema(self):
+		with TemporaryDirectory() as tempDirectory:
+			databasePath = Path(tempDirectory) / "coverage.db"
+			with sqlite3.connect(str(databasePath)) as connection:
+				connection.execute("CREATE TABLE tests (id INTEGER PRIMARY KEY, name TEXT NOT NULL, ingested TEXT NOT NULL, bins INTEGER NOT NULL)")
+			connection.close()
+
+			with self.assertRaises(DatabaseException):
+				CoverageDatabase(databasePath)
+
+	@staticmethod
+	def _getPackages(xml: bytes) -> bytes:
+		return etree.tostring(etree.fromstring(xml).find("packages"))
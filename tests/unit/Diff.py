@@ -0,0 +1,97 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for coverage differences between two runs."""
+from gzip         import GzipFile
+from pathlib      import Path
+from tempfile     import TemporaryDirectory
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Cobertura import Class, Coverage, Package
+from pyEDAA.UCIS.Diff      import CoverageDiff, isCoberturaFile, readCoverage
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+def _createModel(files) -> Coverage:
+	coverage = Coverage()
+	for fileName, lines in files.items():
+		package = Package(fileName)
+		coberturaClass = Class(fileName, fileName)
+		for line, hits in lines.items():
+			coberturaClass.addStatement(line, hits)
+		package.addClass(coberturaClass)
+		coverage.addPackage(package)
+
+	return coverage
+
+
+class Diff(TestCase):
+	def test_GainedAndLost(self):
+		old = _createModel({"a.sv": {1: 1, 2: 0, 3: 1, 4: 0}, "b.sv": {7: 1}})
+		new = _createModel({"a.sv": {1: 1, 2: 1, 3: 0, 5: 1}, "c.sv": {9: 0}})
+
+		diff = CoverageDiff(old, new)
+
+		self.assertEqual([("a.sv", 2, 0, 1), ("a.sv", 5, None, 1)], [(c.file, c.line, c.oldHits, c.newHits) for c in diff.gained])
+		self.assertEqual([("a.sv", 3, 1, 0), ("b.sv", 7, 1, None)], [(c.file, c.line, c.oldHits, c.newHits) for c in diff.lost])
+		self.assertEqual(
+			[("a.sv", 4, 2, 4, 3), ("b.sv", 1, 1, 0, 0), ("c.sv", 0, 0, 1, 0)],
+			[(d.file, d.oldValid, d.oldCovered, d.newValid, d.newCovered) for d in diff.files]
+		)
+
+	def test_Unchanged(self):
+		model = _createModel({"a.sv": {1: 1, 2: 0}})
+
+		diff = CoverageDiff(model, model)
+
+		self.assertEqual(([], []), (diff.gained, diff.lost))
+		self.assertFalse(diff.files[0].IsChanged)
+
+	def test_UcdbAgainstCobertura(self):
+		ucdbPath = Path("tests/data/ucdb.xml")
+
+		with TemporaryDirectory() as tempDirectory:
+			coberturaPath = Path(tempDirectory) / "cobertura.xml.gz"
+			with GzipFile(coberturaPath, "wb") as file:
+				readCoverage(ucdbPath).writeXml(file)
+
+			self.assertTrue(isCoberturaFile(coberturaPath))
+			self.assertFalse(isCoberturaFile(ucdbPath))
+
+			diff = CoverageDiff(readCoverage(ucdbPath), readCoverage(coberturaPath))
+
+		self.assertEqual(([], []), (diff.gained, diff.lost))
+		self.assertGreater(len(diff.files), 0)
+		self.assertFalse(any(delta.IsChanged for delta in diff.files))
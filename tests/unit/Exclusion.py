@@ -0,0 +1,150 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+# ==================================================================================================================== #
+#
+"""Testcase for exclusion rules."""
+import pickle
+from pathlib      import Path
+from shutil       import copyfile
+from tempfile     import TemporaryDirectory
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Exclusion import ExclusionException, ExclusionRules
+from pyEDAA.UCIS.Sharding  import ShardedParser
+from pyEDAA.UCIS.UCDB      import MultiFileParser, Parser
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+class Rules(TestCase):
+	_rules = [
+		"# Waivers",
+		"",
+		"file     */tb/*.sv",
+		"instance top.dut.debug  # debug logic",
+		"lines    */alu.sv 10-20 42",
+		"lines    *.sv 15-30",
+		"instance top.tb",
+	]
+
+	def test_Parse(self):
+		rules = ExclusionRules.parse(self._rules)
+
+		self.assertEqual(["file", "instance", "lines", "lines", "instance"], [rule.kind for rule in rules.rules])
+		self.assertEqual([3, 4, 5, 6, 7], [rule.lineNumber for rule in rules.rules])
+		self.assertEqual([(10, 20), (42, 42)], rules.rules[2].lineRanges)
+		self.assertEqual("lines */alu.sv 10-20 42", str(rules.rules[2]))
+
+	def test_InvalidRules(self):
+		for line in ("exclude top", "file", "instance a b", "lines a.sv", "lines a.sv 20-10", "lines a.sv x"):
+			with self.subTest(line=line):
+				with self.assertRaises(ExclusionException):
+					ExclusionRules.parse([line])
+
+	def test_Match(self):
+		rules = ExclusionRules.parse(self._rules)
+		fileRule, debugRule, aluRule, svRule, tbRule = rules.rules
+
+		self.assertIs(fileRule, rules.match("src/tb/top_tb.sv", 12, "top.dut.debug"))
+		self.assertIs(aluRule, rules.match("rtl/alu.sv", 12, "x"))
+		self.assertIs(aluRule, rules.match("rtl/alu.sv", 20, "x"))
+		self.assertIs(svRule, rules.match("rtl/alu.sv", 21, "x"))
+		self.assertIs(aluRule, rules.match("rtl/alu.sv", 42, "x"))
+		self.assertIs(svRule, rules.match("rtl/fifo.sv", 15, "x"))
+		self.assertIsNone(rules.match("rtl/alu.sv", 31, "x"))
+		self.assertIs(debugRule, rules.match("rtl/fifo.sv", 5, "top.dut.debug.u_trace"))
+		self.assertIsNone(rules.match("rtl/fifo.sv", 5, "top.dut.debugger"))
+		self.assertIs(tbRule, rules.match("rtl/fifo.sv", 5, "top.tb.u_bfm"))
+		self.assertIsNone(rules.match("rtl/fifo.sv", 5, "top_tb"))
+
+	def test_Counts(self):
+		rules = ExclusionRules.parse(self._rules)
+
+		self.assertTrue(rules.exclude("rtl/alu.sv", 12, "x"))
+		self.assertTrue(rules.exclude("rtl/alu.sv", 12, "x"))
+		self.assertFalse(rules.exclude("rtl/alu.sv", 50, "x"))
+		self.assertEqual([0, 0, 2, 0, 0], rules.Counts)
+
+		rules.addCounts([1, 2, 3, 4, 5])
+		self.assertEqual([1, 2, 5, 4, 5], rules.Counts)
+		self.assertEqual(17, rules.ExcludedCount)
+
+	def test_Pickle(self):
+		rules = ExclusionRules.parse(self._rules)
+		rules.exclude("rtl/alu.sv", 12, "x")
+		rules = pickle.loads(pickle.dumps(rules))
+
+		self.assertEqual([0, 0, 0, 0, 0], rules.Counts)
+		self.assertEqual("lines", rules.match("rtl/alu.sv", 12, "x").kind)
+
+
+class Parsing(TestCase):
+	_ucdbPath = Path("tests/data/ucdb000_multiple_instances.xml")
+
+	def test_Rules(self):
+		for rule, statementsCount, linesValid, branchesValid, excludedCount in (
+			("instance top.dut.m2", 9, 7, 6, 10),
+			("instance top.dut.m", 15, 7, 10, 0),
+			("lines dut.sv 26", 13, 6, 2, 10),
+			("file dut.sv", 0, 0, 0, 25),
+		):
+			for streaming in (False, True):
+				with self.subTest(rule=rule, streaming=streaming):
+					exclusions = ExclusionRules.parse([rule])
+					parser = Parser(self._ucdbPath, False, streaming, exclusions=exclusions)
+					model = parser.getCoberturaModel()
+					model.refreshStatistics()
+
+					self.assertEqual(statementsCount, parser.statementsCount)
+					self.assertEqual(linesValid, model.linesValid)
+					self.assertEqual(branchesValid, model.branchesValid)
+					self.assertEqual([excludedCount], exclusions.Counts)
+
+	def test_WorkerCounts(self):
+		exclusions = ExclusionRules.parse(["instance top.dut.m2"])
+		parser = MultiFileParser([self._ucdbPath, self._ucdbPath], False, jobs=2, exclusions=exclusions)
+		parser.getCoberturaModel()
+
+		self.assertEqual([20], exclusions.Counts)
+
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			copyfile(self._ucdbPath, ucdbPath)
+
+			exclusions = ExclusionRules.parse(["instance top.dut.m2"])
+			parser = ShardedParser(ucdbPath, False, jobs=2, exclusions=exclusions)
+			parser.getCoberturaModel()
+
+		self.assertEqual(9, parser.statementsCount)
+		self.assertEqual([10], exclusions.Counts)
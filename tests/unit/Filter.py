@@ -0,0 +1,89 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for parse-time path filters."""
+import pickle
+from pathlib      import Path
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Filter import PathFilter
+from pyEDAA.UCIS.UCDB   import Parser
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+class Matching(TestCase):
+	def test_Files(self):
+		pathFilter = PathFilter(includeFiles=["rtl/*", "ip/own/*"], excludeFiles=["*_tb.sv"])
+
+		self.assertTrue(pathFilter.isFileIncluded("rtl/core/alu.sv"))
+		self.assertTrue(pathFilter.isFileIncluded("ip/own/fifo.sv"))
+		self.assertFalse(pathFilter.isFileIncluded("rtl/alu_tb.sv"))
+		self.assertFalse(pathFilter.isFileIncluded("ip/vendor/pll.v"))
+
+	def test_Instances(self):
+		pathFilter = PathFilter(includeInstances=["top.dut*"], excludeInstances=["top.dut.vendor_*"])
+
+		self.assertTrue(pathFilter.FiltersInstances)
+		self.assertTrue(pathFilter.isInstanceIncluded("top.dut.core"))
+		self.assertFalse(pathFilter.isInstanceIncluded("top.tb"))
+		self.assertTrue(pathFilter.isInstanceExcluded("top.dut.vendor_pll"))
+		self.assertFalse(PathFilter(includeFiles=["*.sv"]).FiltersInstances)
+
+	def test_Pickle(self):
+		pathFilter = pickle.loads(pickle.dumps(PathFilter(excludeFiles=["*.vhdl"])))
+
+		self.assertFalse(pathFilter.isFileIncluded("a.vhdl"))
+		self.assertTrue(pathFilter.isFileIncluded("a.sv"))
+
+
+class Parsing(TestCase):
+	_ucdbPath = Path("tests/data/ucdb000_multiple_instances.xml")
+
+	def test_Filters(self):
+		for pathFilter, statementsCount, linesValid, branchesValid in (
+			(PathFilter(excludeInstances=["top.dut.m2"]), 9, 7, 6),
+			(PathFilter(includeInstances=["top.dut.m1"]), 6, 4, 4),
+			(PathFilter(includeInstances=["*.m?"], excludeInstances=["*.m1"]), 6, 4, 4),
+			(PathFilter(excludeFiles=["dut.sv"]), 0, 0, 0),
+		):
+			for streaming in (False, True):
+				with self.subTest(pathFilter=pathFilter.__getstate__(), streaming=streaming):
+					parser = Parser(self._ucdbPath, False, streaming, pathFilter=pathFilter)
+					model = parser.getCoberturaModel()
+					model.refreshStatistics()
+
+					self.assertEqual(statementsCount, parser.statementsCount)
+					self.assertEqual(linesValid, model.linesValid)
+					self.assertEqual(branchesValid, model.branchesValid)
@@ -0,0 +1,159 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for the byte-offset scope index."""
+import gzip
+import os
+from pathlib      import Path
+from shutil       import copyfile
+from tempfile     import TemporaryDirectory
+from unittest     import TestCase, skipIf
+
+from pyEDAA.UCIS.Index import ScopeIndex, IndexException
+from pyEDAA.UCIS.UCDB  import Parser
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+class Index(TestCase):
+	_ucdbPath = Path("tests/data/ucdb000_multiple_instances.xml")
+
+	def test_Instances(self):
+		index = ScopeIndex.build(self._ucdbPath)
+
+		self.assertEqual(
+			["top", "top.dut", "top.dut.m1", "top.dut.m2", "\\package UnitScopePackage_1\\", "$unit.work"],
+			index.getInstances()
+		)
+		self.assertEqual("work.M", index.getEntry("top.dut.m2").designUnit)
+		self.assertEqual(index.getEntry("top.dut"), index.entries[index.getEntry("top.dut.m1").parent])
+
+		with self.assertRaises(IndexException):
+			index.getEntry("top.dut.m3")
+
+	def test_Fragment(self):
+		index = ScopeIndex.build(self._ucdbPath)
+
+		for instance, statementsCount, branchesValid in (("top", 12, 8), ("top.dut.m1", 6, 4), ("$unit.work", 3, 2)):
+			with self.subTest(instance=instance):
+				parser = Parser(index.openFragment(instance), False)
+				model = parser.getCoberturaModel()
+				model.refreshStatistics()
+
+				self.assertEqual(statementsCount, parser.statementsCount)
+				self.assertEqual(branchesValid, model.branchesValid)
+
+	def test_GreaterThanInAttribute(self):
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			content = self._ucdbPath.read_text()
+			content = content.replace('<ux:ucdb version="', '<ux:ucdb comment="a>b" version="')
+			content = content.replace('<ux:scope name="m1" ', '<ux:scope name="m>1" src=\'a>b\' ')
+			ucdbPath.write_text(content)
+
+			index = ScopeIndex.build(ucdbPath)
+
+			self.assertEqual(
+				["top", "top.dut", "top.dut.m>1", "top.dut.m2", "\\package UnitScopePackage_1\\", "$unit.work"],
+				index.getInstances()
+			)
+			self.assertEqual("work.M", index.getEntry("top.dut.m>1").designUnit)
+
+			parser = Parser(index.openFragment("top.dut.m>1"), False)
+			parser.getCoberturaModel()
+			self.assertEqual(6, parser.statementsCount)
+
+	def test_Sidecar(self):
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			copyfile(self._ucdbPath, ucdbPath)
+
+			self.assertIsNone(ScopeIndex.read(ucdbPath))
+			index = ScopeIndex.load(ucdbPath)
+			self.assertTrue(ScopeIndex.getIndexPath(ucdbPath).exists())
+
+			sidecarIndex = ScopeIndex.read(ucdbPath)
+			self.assertEqual(index.getInstances(), sidecarIndex.getInstances())
+			self.assertEqual(
+				[(e.start, e.end, e.parent) for e in index.entries],
+				[(e.start, e.end, e.parent) for e in sidecarIndex.entries]
+			)
+
+			os.utime(ucdbPath, ns=(0, 0))
+			self.assertIsNone(ScopeIndex.read(ucdbPath))
+
+	def test_MalformedSidecar(self):
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			copyfile(self._ucdbPath, ucdbPath)
+
+			for content in ('{"version": 1}', '[]', '{"version": 1, "size": 0, "mtime": 0, "root": "ucdb"}'):
+				with self.subTest(content=content):
+					ScopeIndex.getIndexPath(ucdbPath).write_text(content)
+
+					self.assertIsNone(ScopeIndex.read(ucdbPath))
+					self.assertEqual(6, len(ScopeIndex.load(ucdbPath).getInstances()))
+
+	def test_UnwritableSidecar(self):
+		with TemporaryDirectory() as tempDirectory:
+			indexPath = Path(tempDirectory) / "missing" / "ucdb.xml.idx"
+
+			index = ScopeIndex.load(self._ucdbPath, indexPath)
+
+			self.assertEqual(6, len(index.getInstances()))
+			self.assertFalse(indexPath.exists())
+			with self.assertRaises(IndexException):
+				index.write(indexPath)
+
+	@skipIf(os.name != "posix" or os.geteuid() == 0, "Permissions aren't enforced.")
+	def test_ReadOnlyDirectory(self):
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml"
+			copyfile(self._ucdbPath, ucdbPath)
+			os.chmod(tempDirectory, 0o555)
+			try:
+				index = ScopeIndex.load(ucdbPath)
+
+				self.assertEqual(6, len(index.getInstances()))
+				self.assertFalse(ScopeIndex.getIndexPath(ucdbPath).exists())
+			finally:
+				os.chmod(tempDirectory, 0o755)
+
+	def test_Compressed(self):
+		with TemporaryDirectory() as tempDirectory:
+			ucdbPath = Path(tempDirectory) / "ucdb.xml.gz"
+			ucdbPath.write_bytes(gzip.compress(self._ucdbPath.read_bytes()))
+
+			with self.assertRaises(IndexException):
+				ScopeIndex.build(ucdbPath)
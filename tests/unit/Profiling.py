@@ -0,0 +1,94 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for phase profiling."""
+import json
+from io           import StringIO
+from pathlib      import Path
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Profiling import Profiler
+from pyEDAA.UCIS.UCDB      import Parser
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+class Profiling(TestCase):
+	_ucdbPath = Path("tests/data/ucdb002_partially_excluded.xml")
+
+	def test_Phases(self):
+		for streaming, phases in ((False, ["parse", "extract", "aggregate"]), (True, ["parse + extract", "aggregate"])):
+			with self.subTest(streaming=streaming):
+				profiler = Profiler(traceMemory=True)
+				Parser(self._ucdbPath, False, streaming, profiler=profiler).getCoberturaModel()
+
+				self.assertEqual(phases, [phase.name for phase in profiler.phases])
+				self.assertEqual({"scopes": 12, "bins": 28, "excluded bins": 5}, profiler.counters)
+				for phase in profiler.phases:
+					self.assertGreaterEqual(phase.wallTime, 0)
+					self.assertIsNotNone(phase.peakMemory)
+
+	def test_Report(self):
+		profiler = Profiler(traceMemory=False)
+		with profiler.phase("serialize"):
+			pass
+		profiler.count("bins", 3)
+		profiler.count("bins", 4)
+
+		report = profiler.getReport()
+		self.assertIn("serialize", report)
+		self.assertIn("bins: 7", report)
+		self.assertNotIn("inflated", report)
+
+		stream = StringIO()
+		profiler.writeJson(stream)
+		profile = json.loads(stream.getvalue())
+		self.assertEqual("serialize", profile["phases"][0]["name"])
+		self.assertIsNone(profile["phases"][0]["peakMemory"])
+		self.assertEqual({"bins": 7}, profile["counters"])
+		self.assertFalse(profile["memoryTraced"])
+
+	def test_TimingOnlyByDefault(self):
+		profiler = Profiler()
+		with profiler.phase("parse"):
+			pass
+
+		self.assertIsNone(profiler.phases[0].peakMemory)
+
+		profiler = Profiler(traceMemory=True)
+		with profiler.phase("parse"):
+			pass
+
+		self.assertIsNotNone(profiler.phases[0].peakMemory)
+		self.assertIn("Times are inflated", profiler.getReport())
@@ -0,0 +1,97 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for bitset-based coverage vectors and test ranking."""
+from pathlib      import Path
+from typing       import Iterable
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Ranking import BinUniverse, CoverageVectors, readTestRecords
+from pyEDAA.UCIS.Store   import StatementStore
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+def _createStore(lines: Iterable[int], covered: Iterable[int]) -> StatementStore:
+	store = StatementStore()
+	fileId = store.getFileId("a.sv")
+	instanceId = store.getInstanceId("top")
+	covered = set(covered)
+	for line in lines:
+		store.append(fileId, line, 1, instanceId, int(line in covered))
+
+	return store
+
+
+class Ranking(TestCase):
+	def test_TestRecords(self):
+		records = readTestRecords(Path("tests/data/ucdb.xml"))
+
+		self.assertEqual(["out4", "out3", "out1", "out2"], [record.name for record in records])
+		self.assertEqual(335.0, records[0].simTime)
+		self.assertEqual(0.00091, records[0].cpuTime)
+
+	def test_Universe(self):
+		universe = BinUniverse()
+
+		first = universe.getVector(_createStore(range(1, 5), (1, 2)))
+		second = universe.getVector(_createStore(range(3, 7), (3, 6)))
+
+		self.assertEqual(6, len(universe))
+		self.assertEqual(0b0011, first)
+		self.assertEqual(0b100100, second)
+
+	def test_Union(self):
+		vectors = CoverageVectors()
+		first = vectors.add("first", _createStore(range(1, 5), (1, 2)))
+		vectors.add("second", _createStore(range(1, 5), (2, 3)))
+
+		self.assertEqual(0b0111, vectors.union())
+		self.assertEqual(0b0011, vectors.union([first]))
+		self.assertEqual(2, first.Count)
+
+	def test_RankByCost(self):
+		vectors = CoverageVectors()
+		vectors.add("all", _createStore(range(1, 7), range(1, 7)), cost=10.0)
+		vectors.add("low", _createStore(range(1, 7), range(1, 4)), cost=1.0)
+		vectors.add("high", _createStore(range(1, 7), range(4, 7)), cost=2.0)
+		vectors.add("redundant", _createStore(range(1, 7), (1, )), cost=0.6)
+		vectors.add("free", _createStore(range(1, 7), (2, )), cost=0.0)
+
+		ranking = vectors.rank()
+
+		self.assertEqual(["free", "low", "high"], [rankedTest.test.name for rankedTest in ranking])
+		self.assertEqual([1, 2, 3], [rankedTest.newBins for rankedTest in ranking])
+		self.assertEqual([1, 3, 6], [rankedTest.coveredBins for rankedTest in ranking])
+		self.assertEqual(3.0, ranking[-1].cumulativeCost)
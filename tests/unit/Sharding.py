@@ -0,0 +1,81 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for parallel parsing of a single UCDB file split into shards."""
+from pathlib      import Path
+from shutil       import copyfile
+from tempfile     import TemporaryDirectory
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Cobertura import Coverage
+from pyEDAA.UCIS.Index     import ScopeIndex
+from pyEDAA.UCIS.Sharding  import ShardedParser
+from pyEDAA.UCIS.UCDB      import Parser
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+def _getLines(model: Coverage):
+	model.refreshStatistics()
+	return (
+		{(package.name, name): (dict(coberturaClass.lines), dict(coberturaClass.branches)) for package in model.packages.values() for name, coberturaClass in package.classes.items()},
+		model.linesValid, model.linesCovered, model.branchesValid, model.branchesCovered, model.sources
+	)
+
+
+class Sharding(TestCase):
+	_ucdbPath = Path("tests/data/ucdb000_multiple_instances.xml")
+
+	def test_Shards(self):
+		index = ScopeIndex.build(self._ucdbPath)
+
+		shards = index.getShards(4)
+		ranges = sorted((start, end) for shard in shards for fragment in shard for start, end in fragment.ranges)
+
+		self.assertGreater(len(shards), 1)
+		for (_, end), (start, _) in zip(ranges, ranges[1:]):
+			self.assertLessEqual(end, start)
+
+	def test_SameAsParser(self):
+		with TemporaryDirectory() as tempDirectory:
+			for fileName in ("ucdb.xml", "ucdb000_multiple_instances.xml", "ucdb002_partially_excluded.xml"):
+				ucdbPath = Path(tempDirectory) / fileName
+				copyfile(Path("tests/data") / fileName, ucdbPath)
+
+				for mergeInstances, jobs in ((False, 1), (True, 1), (False, 2)):
+					with self.subTest(file=fileName, mergeInstances=mergeInstances, jobs=jobs):
+						expected = Parser(ucdbPath, mergeInstances).getCoberturaModel()
+						sharded = ShardedParser(ucdbPath, mergeInstances, jobs=jobs, shards=4).getCoberturaModel()
+
+						self.assertEqual(_getLines(expected), _getLines(sharded))
@@ -0,0 +1,176 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for UCDB file conversions."""
+"""Testcase for the columnar statement store."""
+import pickle
+from io           import BytesIO
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Store import StatementStore, InvalidStoreFormat, BranchIndexOverflow, getBranchIndex, BRANCH_INDEX
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+def _createStore(rows) -> StatementStore:
+	store = StatementStore()
+	for file, line, index, instance, hits in rows:
+		store.append(store.getFileId(file), line, index, store.getInstanceId(instance), hits)
+
+	return store
+
+
+ROWS = [
+	("a.sv", 10, 1, "top.u1", 1),
+	("a.sv", 10, 2, "top.u1", 0),
+	("a.sv", 10, 1, "top.u2", 0),
+	("a.sv", 10, 2, "top.u2", 3),
+	("a.sv", 11, 1, "top.u1", 0),
+	("b.sv", 5, 1, "top", 2),
+]
+
+
+class Aggregation(TestCase):
+	def test_Rows(self):
+		store = _createStore(ROWS)
+
+		self.assertEqual(len(ROWS), len(store))
+		self.assertEqual(["a.sv", "b.sv"], store.files)
+		self.assertEqual(["top.u1", "top.u2", "top"], store.instances)
+		self.assertEqual(ROWS, list(store))
+
+	def test_AggregateLines(self):
+		store = _createStore(ROWS)
+
+		self.assertEqual([{10: (4, 2, 0, 0, 0), 11: (1, 0, 0, 0, 0)}, {5: (1, 1, 2, 0, 0)}], store.aggregateLines(False))
+
+	def test_AggregateLinesMergeInstances(self):
+		store = _createStore(ROWS)
+
+		self.assertEqual([{10: (2, 2, 1, 0, 0), 11: (1, 0, 0, 0, 0)}, {5: (1, 1, 2, 0, 0)}], store.aggregateLines(True))
+
+	def test_FileWithoutStatements(self):
+		store = _createStore(ROWS)
+		store.getFileId("c.sv")
+
+		self.assertEqual([{10: (4, 2, 0, 0, 0), 11: (1, 0, 0, 0, 0)}, {5: (1, 1, 2, 0, 0)}, {}], store.aggregateLines(False))
+
+	def test_AggregateBranches(self):
+		store = _createStore(ROWS + [
+			("a.sv", 10, getBranchIndex(1, 0), "top.u1", 3),
+			("a.sv", 10, getBranchIndex(1, 1), "top.u1", 0),
+			("a.sv", 10, getBranchIndex(1, 0), "top.u2", 0),
+			("a.sv", 10, getBranchIndex(1, 1), "top.u2", 1),
+			("b.sv", 7, getBranchIndex(1, 0), "top", 0),
+		])
+
+		self.assertEqual(
+			[{10: (4, 2, 0, 4, 2), 11: (1, 0, 0, 0, 0)}, {5: (1, 1, 2, 0, 0)}],
+			store.aggregateLines(False)
+		)
+		self.assertEqual(
+			[{10: (2, 2, 1, 2, 2), 11: (1, 0, 0, 0, 0)}, {5: (1, 1, 2, 0, 0)}],
+			store.aggregateLines(True)
+		)
+
+	def test_BranchIndexLimits(self):
+		self.assertEqual(BRANCH_INDEX | 0x7fff << 16 | 0xffff, getBranchIndex(0x7fff, 0xffff))
+		self.assertNotEqual(getBranchIndex(1, 0), getBranchIndex(1, 0xffff))
+
+		with self.assertRaises(BranchIndexOverflow):
+			getBranchIndex(0x8000, 0)
+		with self.assertRaises(BranchIndexOverflow):
+			getBranchIndex(1, 0x10000)
+		with self.assertRaises(BranchIndexOverflow):
+			getBranchIndex(-1, 0)
+
+
+class Merge(TestCase):
+	def test_AddMerged(self):
+		store = StatementStore()
+		fileId = store.getFileId("a.sv")
+
+		self.assertFalse(store.addMerged(fileId, 10, 1, 0))
+		self.assertTrue(store.addMerged(fileId, 10, 1, 4))
+		self.assertTrue(store.addMerged(fileId, 10, 1, 0))
+		self.assertFalse(store.addMerged(fileId, 10, 2, 0))
+
+		self.assertEqual([("a.sv", 10, 1, "", 4), ("a.sv", 10, 2, "", 0)], list(store))
+
+	def test_Merge(self):
+		first = _createStore(ROWS)
+		second = _createStore(reversed(ROWS))
+
+		merged = StatementStore.merge([first, second])
+
+		self.assertEqual(len(ROWS), len(merged))
+		self.assertEqual([(file, line, index, instance, 2 * hits) for file, line, index, instance, hits in ROWS], list(merged))
+
+	def test_Concatenate(self):
+		first = _createStore(ROWS[:2])
+		second = _createStore(ROWS)
+
+		concatenated = StatementStore.concatenate([first, second])
+
+		self.assertEqual(ROWS[:2] + ROWS, list(concatenated))
+		self.assertEqual(["a.sv", "b.sv"], concatenated.files)
+
+	def test_Pickle(self):
+		store = pickle.loads(pickle.dumps(_createStore(ROWS)))
+
+		self.assertEqual(ROWS, list(store))
+		self.assertEqual(1, store.getFileId("b.sv"))
+		self.assertEqual(2, store.getInstanceId("top"))
+
+
+class Serialization(TestCase):
+	def test_WriteRead(self):
+		stream = BytesIO()
+		_createStore(ROWS).write(stream)
+		stream.seek(0)
+
+		store = StatementStore.read(stream)
+
+		self.assertEqual(ROWS, list(store))
+		self.assertEqual(1, store.getFileId("b.sv"))
+
+	def test_Truncated(self):
+		stream = BytesIO()
+		_createStore(ROWS).write(stream)
+
+		with self.assertRaises(InvalidStoreFormat):
+			StatementStore.read(BytesIO(stream.getvalue()[:-1]))
+
+		with self.assertRaises(InvalidStoreFormat):
+			StatementStore.read(BytesIO(b"<?xml"))
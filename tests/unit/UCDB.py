@@ -29,10 +29,27 @@
 # ==================================================================================================================== #
 #
 """Testcase for UCDB file conversions."""
+import bz2
+import gzip
+import lzma
+import re
+from io           import BytesIO, RawIOBase
 from pathlib      import Path
-from unittest     import TestCase
+from tempfile     import TemporaryDirectory
+from typing       import List, Tuple
+from unittest     import TestCase, skipUnless
+from unittest.mock import patch
 
-from pyEDAA.UCIS.UCDB import Parser
+from lxml         import etree
+
+from pyEDAA.UCIS.Cobertura import Coverage
+from pyEDAA.UCIS.Store import BRANCH_INDEX
+from pyEDAA.UCIS.UCDB import UCDB_EXCLUDED, Parser, MultiFileParser
+
+try:
+	import zstandard
+except ImportError:  # pragma: no cover
+	zstandard = None
 
 
 if __name__ == "__main__": # pragma: no cover
@@ -92,6 +109,78 @@ class CoverageValues(TestCase):
 		self.assertEqual(7, model.linesValid)
 		self.assertEqual(6, model.linesCovered)
 
+	def test_hitCounts(self):
+		ucdbPath = Path("tests/data/ucdb000_multiple_instances.xml")
+
+		parser = Parser(ucdbPath, True, hitCounts=True)
+		model = parser.getCoberturaModel()
+		lines = model.packages["dut.sv"].classes["dut.sv"].lines
+
+		self.assertEqual(9, parser.statementsCount)
+		self.assertEqual(8, parser.statementsCovered)
+		self.assertEqual(2, lines[25])
+		self.assertEqual(0, lines[7])
+
+	def test_skipCoveredUnits(self):
+		for ucdbPath in sorted(Path("tests/data").glob("ucdb*.xml")):
+			with self.subTest(ucdbFile=ucdbPath.name):
+				(parser, model) = self._parseUCDB(ucdbPath, True)
+
+				skippingParser = Parser(ucdbPath, True, streaming=True, skipCoveredUnits=True)
+				skippingModel = skippingParser.getCoberturaModel()
+				skippingModel.refreshStatistics()
+
+				self.assertEqual(parser.statementsCount, skippingParser.statementsCount)
+				self.assertEqual(parser.statementsCovered, skippingParser.statementsCovered)
+				self.assertEqual(model.linesValid, skippingModel.linesValid)
+				self.assertEqual(model.linesCovered, skippingModel.linesCovered)
+
+	def test_skipCoveredUnitsWithExcludedBins(self):
+		def bin(line: int, count: int, excluded: bool) -> str:
+			return (
+				f'<ux:bin name="" type="STMTBIN" flags="{"00000020" if excluded else "00000001"}">'
+				f'<ux:attr key="#SINDEX#" type="int">1</ux:attr><ux:count type="int">{count}</ux:count>'
+				f'<ux:src file="m.sv" workdir="/work" line="{line}" token="1"/></ux:bin>\n'
+			)
+
+		def instance(name: str, bins: str) -> str:
+			return f'<ux:scope name="{name}" type="INSTANCE" weight="1" lang="VLOG" flags="00000001" du="work.M">\n{bins}</ux:scope>\n'
+
+		# The statement in line 3 is excluded in the first instance only.
+		content = (
+			'<?xml version="1.0" encoding="UTF-8"?>\n<ux:ucdb xmlns:ux="www.aldec.com">\n'
+			'<ux:scope name="top" type="INSTANCE" weight="1" lang="VLOG" flags="00000001" du="work.top">\n' +
+			instance("m1", bin(2, 1, False) + bin(3, 0, True)) +
+			instance("m2", bin(2, 1, False) + bin(3, 1, False)) +
+			instance("m3", bin(2, 0, False) + bin(3, 0, False)) +
+			'</ux:scope>\n</ux:ucdb>\n'
+		).encode()
+
+		for streaming in (False, True):
+			with self.subTest(streaming=streaming):
+				parser = Parser(BytesIO(content), True, streaming)
+				model = parser.getCoberturaModel()
+				skippingParser = Parser(BytesIO(content), True, streaming, skipCoveredUnits=True)
+				skippingModel = skippingParser.getCoberturaModel()
+
+				self.assertEqual((2, 2), (parser.statementsCount, parser.statementsCovered))
+				self.assertEqual((2, 2), (skippingParser.statementsCount, skippingParser.statementsCovered))
+				self.assertEqual(model.packages["m.sv"].classes["m.sv"].lines, skippingModel.packages["m.sv"].classes["m.sv"].lines)
+
+	def test_branches(self):
+		for fileName, mergeInstances, branchesValid, branchesCovered in (
+			("ucdb.xml", False, 91, 91),
+			("ucdb000_multiple_instances.xml", False, 10, 9),
+			("ucdb000_multiple_instances.xml", True, 6, 5),
+			("ucdb001_all_excluded.xml", False, 0, 0),
+			("ucdb002_partially_excluded.xml", False, 4, 3),
+		):
+			with self.subTest(fileName=fileName, mergeInstances=mergeInstances):
+				(parser, model) = self._parseUCDB(Path("tests/data") / fileName, mergeInstances)
+
+				self.assertEqual(branchesValid, model.branchesValid)
+				self.assertEqual(branchesCovered, model.branchesCovered)
+
 	def test_allExcluded(self):
 		ucdbPath = Path("tests/data/ucdb001_all_excluded.xml")
 
@@ -137,3 +226,286 @@ class CoverageValues(TestCase):
 		self.assertEqual(4, parser.statementsCovered)
 		self.assertEqual(5, model.linesValid)
 		self.assertEqual(4, model.linesCovered)
+
+
+class Streaming(TestCase):
+	def _assertSameModel(self, ucdbPath, mergeInstances):
+		parser = Parser(ucdbPath, mergeInstances)
+		model = parser.getCoberturaModel()
+
+		streamingParser = Parser(ucdbPath, mergeInstances, streaming=True)
+		streamingModel = streamingParser.getCoberturaModel()
+
+		self.assertEqual(parser.statementsCount, streamingParser.statementsCount)
+		self.assertEqual(parser.statementsCovered, streamingParser.statementsCovered)
+		self.assertEqual(model.sources, streamingModel.sources)
+		self.assertEqual(model.packages.keys(), streamingModel.packages.keys())
+
+		for packageName, package in model.packages.items():
+			streamingPackage = streamingModel.packages[packageName]
+			for className, coberturaClass in package.classes.items():
+				self.assertEqual(coberturaClass.lines, streamingPackage.classes[className].lines)
+				self.assertEqual(coberturaClass.branches, streamingPackage.classes[className].branches)
+
+	def test_SameModel(self):
+		for ucdbPath in sorted(Path("tests/data").glob("ucdb*.xml")):
+			for mergeInstances in (False, True):
+				with self.subTest(ucdbFile=ucdbPath.name, mergeInstances=mergeInstances):
+					self._assertSameModel(ucdbPath, mergeInstances)
+
+	def test_NestedScopeInBranch(self):
+		content = Path("tests/data/ucdb000_multiple_instances.xml").read_text()
+		# Insert a nested scope between the header of each branch scope and its first branch bin.
+		content = re.sub(
+			r'(type="BRANCH"[^>]*>\n(?:<ux:(?:src|attr)[^\n]*\n)*)',
+			r'\1<ux:scope name="nested" type="BLOCK" weight="1" lang="VLOG" flags="00000000">\n</ux:scope>\n',
+			content
+		)
+		self.assertIn('name="nested"', content)
+
+		model = Parser(BytesIO(content.encode()), False).getCoberturaModel()
+		streamingModel = Parser(BytesIO(content.encode()), False, streaming=True).getCoberturaModel()
+		model.refreshStatistics()
+		streamingModel.refreshStatistics()
+
+		self.assertEqual(10, model.branchesValid)
+		self.assertEqual(model.branchesValid, streamingModel.branchesValid)
+		self.assertEqual(model.packages["dut.sv"].classes["dut.sv"].branches, streamingModel.packages["dut.sv"].classes["dut.sv"].branches)
+
+
+def _statementBin(fileName: str, line: int, count: int, excluded: bool = False) -> str:
+	return (
+		f'<ux:bin name="" type="STMTBIN" flags="{"00000020" if excluded else "00000001"}">'
+		f'<ux:attr key="#SINDEX#" type="int">1</ux:attr><ux:count type="int">{count}</ux:count>'
+		f'<ux:src file="{fileName}" workdir="/work" line="{line}" token="1"/></ux:bin>\n'
+	)
+
+
+def _scope(name: str, typeName: str, content: str) -> str:
+	return f'<ux:scope name="{name}" type="{typeName}" weight="1" lang="VLOG" flags="00000001">\n{content}</ux:scope>\n'
+
+
+def _ucdb(content: str) -> bytes:
+	return f'<?xml version="1.0" encoding="UTF-8"?>\n<ux:ucdb xmlns:ux="www.aldec.com">\n{content}</ux:ucdb>\n'.encode()
+
+
+def _extractMultiPass(content: bytes) -> List[Tuple[str, int, int, str, int]]:
+	"""Extracts statement bins like the former parser: XPath queries per top-level scope and lookups per bin."""
+	tree = etree.parse(BytesIO(content))
+	nsmap = {prefix: uri for prefix, uri in tree.getroot().nsmap.items() if prefix is not None}
+
+	rows = []
+	for scopeNode in tree.xpath("/ux:ucdb/ux:scope[.//ux:bin[@type='STMTBIN']]", namespaces=nsmap):
+		if scopeNode.get("type").startswith("DU_"):
+			continue
+
+		for node in scopeNode.xpath(".//ux:bin[@type='STMTBIN']", namespaces=nsmap):
+			if int(node.get("flags"), 16) & UCDB_EXCLUDED:
+				continue
+
+			srcNode = node.find("./ux:src", namespaces=nsmap)
+			instancePath = ".".join(reversed([scope.get("name") for scope in node.iterancestors("{*}scope")]))
+			index = int(node.find("./ux:attr[@key='#SINDEX#']", namespaces=nsmap).text)
+			count = int(node.find("./ux:count", namespaces=nsmap).text)
+			rows.append((srcNode.get("file"), int(srcNode.get("line")), index, instancePath, count))
+
+	return sorted(rows)
+
+
+class SinglePass(TestCase):
+	def _assertSameRows(self, content: bytes):
+		expected = _extractMultiPass(content)
+		self.assertNotEqual([], expected)
+
+		for streaming in (False, True):
+			with self.subTest(streaming=streaming):
+				statements = Parser(BytesIO(content), False, streaming)._extractStatements()
+				# Branch bins are stored as well, but weren't extracted by the former parser.
+				self.assertEqual(expected, sorted(row for row in statements if not row[2] & BRANCH_INDEX))
+
+	def test_DataFiles(self):
+		for ucdbPath in sorted(Path("tests/data").glob("ucdb*.xml")):
+			if ucdbPath.name == "ucdb001_all_excluded.xml":
+				continue
+
+			with self.subTest(ucdbFile=ucdbPath.name):
+				self._assertSameRows(ucdbPath.read_bytes())
+
+	def test_NestedScopes(self):
+		content = _ucdb(
+			_scope("top", "INSTANCE",
+				_statementBin("top.sv", 1, 1) +
+				_scope("blk", "BLOCK",
+					_statementBin("top.sv", 2, 0) +
+					_scope("inner", "BLOCK", _statementBin("top.sv", 3, 2)) +
+					_statementBin("top.sv", 4, 3)
+				) +
+				_scope("dut", "INSTANCE",
+					_scope("m1", "INSTANCE", _statementBin("m.sv", 5, 1)) +
+					_scope("m2", "INSTANCE", _statementBin("m.sv", 5, 0) + _statementBin("m.sv", 6, 1, excluded=True))
+				) +
+				_statementBin("top.sv", 7, 4)
+			) +
+			_scope("work.M", "DU_MODULE", _statementBin("m.sv", 5, 9)) +
+			_scope("$unit", "PACKAGE", _statementBin("pkg.sv", 8, 1))
+		)
+
+		self._assertSameRows(content)
+
+
+class InstancePaths(TestCase):
+	def _getPaths(self, content: bytes, streaming: bool) -> List[Tuple[int, str]]:
+		return sorted((line, instance) for _, line, _, instance, _ in Parser(BytesIO(content), False, streaming)._extractStatements())
+
+	def test_DeepHierarchy(self):
+		depth = 50
+		content = _statementBin("deep.sv", depth, 1)
+		for level in reversed(range(depth)):
+			# Each level has a bin before and after its child scope.
+			content = _scope(f"u{level}", "INSTANCE", _statementBin("deep.sv", level, 1) + content + _statementBin("deep.sv", 100 + level, 1))
+
+		expected = sorted(
+			[(level, ".".join(f"u{index}" for index in range(level + 1))) for level in range(depth)] +
+			[(100 + level, ".".join(f"u{index}" for index in range(level + 1))) for level in range(depth)] +
+			[(depth, ".".join(f"u{index}" for index in range(depth)))]
+		)
+
+		for streaming in (False, True):
+			with self.subTest(streaming=streaming):
+				self.assertEqual(expected, self._getPaths(_ucdb(content), streaming))
+
+	def test_SiblingHierarchies(self):
+		content = _ucdb(
+			_scope("top", "INSTANCE",
+				_scope("a", "INSTANCE",
+					_scope("x", "INSTANCE", _statementBin("s.sv", 1, 1)) +
+					_scope("y", "INSTANCE", _statementBin("s.sv", 2, 1))
+				) +
+				_scope("b", "INSTANCE",
+					_scope("x", "INSTANCE", _statementBin("s.sv", 3, 1)) +
+					_statementBin("s.sv", 4, 1)
+				) +
+				_statementBin("s.sv", 5, 1)
+			) +
+			_scope("other", "INSTANCE", _scope("x", "INSTANCE", _statementBin("s.sv", 6, 1)))
+		)
+
+		for streaming in (False, True):
+			with self.subTest(streaming=streaming):
+				self.assertEqual(
+					[(1, "top.a.x"), (2, "top.a.y"), (3, "top.b.x"), (4, "top.b"), (5, "top"), (6, "other.x")],
+					self._getPaths(content, streaming)
+				)
+
+
+class Interning(TestCase):
+	def test_SharedNames(self):
+		model = Parser(Path("tests/data/ucdb002_partially_excluded.xml"), False).getCoberturaModel()
+
+		for packageName, package in model.packages.items():
+			coberturaClass = package.classes[packageName]
+			self.assertIs(package.name, coberturaClass.name)
+			self.assertIs(package.name, coberturaClass.sourceFile)
+
+	def test_SourcesAddedOnce(self):
+		for streaming in (False, True):
+			with self.subTest(streaming=streaming):
+				with patch.object(Coverage, "addSource", autospec=True, side_effect=lambda coverage, source: coverage.sources.add(source)) as addSource:
+					model = Parser(Path("tests/data/ucdb.xml"), False, streaming).getCoberturaModel()
+
+				self.assertEqual(len(model.sources), addSource.call_count)
+
+
+class MultiFile(TestCase):
+	def test_SameFileTwice(self):
+		ucdbPath = Path("tests/data/ucdb000_multiple_instances.xml")
+
+		for jobs in (1, 2):
+			with self.subTest(jobs=jobs):
+				parser = MultiFileParser([ucdbPath, ucdbPath], False, jobs=jobs)
+				model = parser.getCoberturaModel()
+				model.refreshStatistics()
+
+				self.assertEqual(15, parser.statementsCount)
+				self.assertEqual(14, parser.statementsCovered)
+				self.assertEqual(7, model.linesValid)
+				self.assertEqual(6, model.linesCovered)
+
+	def test_DisjointDesigns(self):
+		ucdbPaths = [
+			Path("tests/data/ucdb000_multiple_instances.xml"),
+			Path("tests/data/ucdb002_partially_excluded.xml"),
+		]
+
+		parser = MultiFileParser(ucdbPaths, True, streaming=True, jobs=2)
+		model = parser.getCoberturaModel()
+		model.refreshStatistics()
+
+		self.assertEqual(9 + 5, parser.statementsCount)
+		self.assertEqual(8 + 4, parser.statementsCovered)
+		self.assertEqual(7 + 5, model.linesValid)
+		self.assertEqual(6 + 4, model.linesCovered)
+
+
+class _PipeStream(RawIOBase):
+	"""Non-seekable stream without ``peek()`` returning at most 3 bytes per read, like a slowly filled pipe."""
+
+	def __init__(self, content: bytes):
+		self._content = BytesIO(content)
+
+	def readable(self) -> bool:
+		return True
+
+	def readinto(self, buffer) -> int:
+		data = self._content.read(min(len(buffer), 3))
+		buffer[:len(data)] = data
+		return len(data)
+
+
+class Compression(TestCase):
+	_ucdbPath = Path("tests/data/ucdb000_multiple_instances.xml")
+
+	def _assertCounts(self, ucdbFile):
+		for streaming in (False, True):
+			if isinstance(ucdbFile, BytesIO):
+				ucdbFile.seek(0)
+
+			parser = Parser(ucdbFile, False, streaming)
+			model = parser.getCoberturaModel()
+			model.refreshStatistics()
+
+			self.assertEqual(15, parser.statementsCount)
+			self.assertEqual(14, parser.statementsCovered)
+			self.assertEqual(7, model.linesValid)
+			self.assertEqual(6, model.linesCovered)
+
+	def _assertCompressed(self, compress):
+		content = compress(self._ucdbPath.read_bytes())
+
+		self._assertCounts(BytesIO(content))
+		for streaming in (False, True):
+			parser = Parser(_PipeStream(content), False, streaming)
+			parser.getCoberturaModel()
+			self.assertEqual(15, parser.statementsCount)
+
+		with TemporaryDirectory() as tempDirectory:
+			compressedPath = Path(tempDirectory) / "ucdb.xml.compressed"
+			compressedPath.write_bytes(content)
+
+			self._assertCounts(compressedPath)
+
+	def test_Uncompressed(self):
+		self._assertCompressed(lambda content: content)
+
+	def test_Gzip(self):
+		self._assertCompressed(gzip.compress)
+
+	def test_Xz(self):
+		self._assertCompressed(lzma.compress)
+
+	def test_Bzip2(self):
+		self._assertCompressed(bz2.compress)
+
+	@skipUnless(zstandard is not None, "Package 'zstandard' is not installed.")
+	def test_Zstandard(self):
+		self._assertCompressed(zstandard.ZstdCompressor().compress)
@@ -0,0 +1,118 @@
+# ==================================================================================================================== #
+#              _____ ____    _        _     _   _  ____ ___ ____                                                       #
+#  _ __  _   _| ____|  _ \  / \      / \   | | | |/ ___|_ _/ ___|                                                      #
+# | '_ \| | | |  _| | | | |/ _ \    / _ \  | | | | |    | |\___ \                                                      #
+# | |_) | |_| | |___| |_| / ___ \  / ___ \ | |_| | |___ | | ___) |                                                     #
+# | .__/ \__, |_____|____/_/   \_\/_/   \_(_)___/ \____|___|____/                                                      #
+# |_|    |___/                                                                                                         #
+# ==================================================================================================================== #
+# Authors:                                                                                                             #
+#   Patrick Lehmann                                                                                                    #
+#                                                                                                                      #
+# License:                                                                                                             #
+# ==================================================================================================================== #
+# Copyright 2021-2022 Electronic Design Automation Abstraction (EDA²)                                                  #
+#                                                                                                                      #
+# Licensed under the Apache License, Version 2.0 (the "License");                                                      #
+# you may not use this file except in compliance with the License.                                                     #
+# You may obtain a copy of the License at                                                                              #
+#                                                                                                                      #
+#   http://www.apache.org/licenses/LICENSE-2.0                                                                         #
+#                                                                                                                      #
+# Unless required by applicable law or agreed to in writing, software                                                  #
+# distributed under the License is distributed on an "AS IS" BASIS,                                                    #
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.                                             #
+# See the License for the specific language governing permissions and                                                  #
+# limitations under the License.                                                                                       #
+#                                                                                                                      #
+# SPDX-License-Identifier: Apache-2.0                                                                                  #
+# ==================================================================================================================== #
+#
+"""Testcase for the output format writers."""
+import json
+from io           import BytesIO
+from pathlib      import Path
+from tempfile     import TemporaryDirectory
+from unittest     import TestCase
+
+from pyEDAA.UCIS.Cobertura import Class, Coverage, Package
+from pyEDAA.UCIS.Writers   import CoberturaWriter, JsonWriter, LcovWriter, writeCoverage
+
+
+if __name__ == "__main__": # pragma: no cover
+	print("ERROR: you called a testcase declaration file as an executable module.")
+	print("Use: 'python -m unitest <testcase module>'")
+	exit(1)
+
+
+def _createCoverage() -> Coverage:
+	coverage = Coverage()
+	coverage.addSource("/project")
+
+	for fileName, lines in (("a.sv", {10: 2, 11: 0, 12: 1}), ("b.sv", {5: 0})):
+		package = Package(fileName)
+		coberturaClass = Class(fileName, fileName)
+		for line, hits in lines.items():
+			coberturaClass.addStatement(line, hits)
+		package.addClass(coberturaClass)
+		coverage.addPackage(package)
+
+	coverage.packages["a.sv"].classes["a.sv"].addBranches(10, 3, 2)
+	coverage.packages["b.sv"].classes["b.sv"].addBranches(5, 2, 0)
+
+	return coverage
+
+
+class Writers(TestCase):
+	def test_Cobertura(self):
+		coverage = _createCoverage()
+
+		stream = BytesIO()
+		writeCoverage(coverage, [CoberturaWriter(stream)])
+
+		# Skip the declaration and the coverage element with its timestamp.
+		self.assertEqual(coverage.getXml().split(b"\n", 2)[2], stream.getvalue().split(b"\n", 2)[2])
+
+	def test_Lcov(self):
+		stream = BytesIO()
+		writeCoverage(_createCoverage(), [LcovWriter(stream)])
+
+		self.assertEqual(
+			"TN:\nSF:/project/a.sv\nBRDA:10,0,0,1\nBRDA:10,0,1,1\nBRDA:10,0,2,0\nBRF:3\nBRH:2\nDA:10,2\nDA:11,0\nDA:12,1\nLF:3\nLH:2\nend_of_record\n"
+			"TN:\nSF:/project/b.sv\nBRDA:5,0,0,-\nBRDA:5,0,1,-\nBRF:2\nBRH:0\nDA:5,0\nLF:1\nLH:0\nend_of_record\n",
+			stream.getvalue().decode("utf-8")
+		)
+
+	def test_LcovSourcePaths(self):
+		with TemporaryDirectory() as tempDirectory:
+			(Path(tempDirectory) / "b.sv").write_text("")
+			coverage = _createCoverage()
+			coverage.addSource(tempDirectory)
+			coverage.packages["a.sv"].classes["a.sv"].sourceFile = "/abs/a.sv"
+
+			stream = BytesIO()
+			writeCoverage(coverage, [LcovWriter(stream)])
+
+		paths = [line[3:] for line in stream.getvalue().decode("utf-8").splitlines() if line.startswith("SF:")]
+		self.assertEqual(["/abs/a.sv", str(Path(tempDirectory) / "b.sv")], paths)
+
+	def test_Json(self):
+		stream = BytesIO()
+		writeCoverage(_createCoverage(), [JsonWriter(stream)])
+
+		document = json.loads(stream.getvalue())
+
+		self.assertEqual(["/project"], document["sources"])
+		self.assertEqual((4, 2, 5, 2), (document["linesValid"], document["linesCovered"], document["branchesValid"], document["branchesCovered"]))
+		self.assertEqual(["a.sv", "b.sv"], [package["name"] for package in document["packages"]])
+		coberturaClass = document["packages"][0]["classes"][0]
+		self.assertEqual({"10": 2, "11": 0, "12": 1}, coberturaClass["lines"])
+		self.assertEqual({"10": [3, 2]}, coberturaClass["branches"])
+
+	def test_MultipleWriters(self):
+		streams = [BytesIO(), BytesIO(), BytesIO()]
+		writeCoverage(_createCoverage(), [CoberturaWriter(streams[0]), LcovWriter(streams[1]), JsonWriter(streams[2])])
+
+		self.assertIn(b"<packages>", streams[0].getvalue())
+		self.assertEqual(2, streams[1].getvalue().count(b"end_of_record"))
+		self.assertEqual(2, len(json.loads(streams[2].getvalue())["packages"]))